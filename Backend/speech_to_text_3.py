@@ -2,13 +2,30 @@ import torch
 from faster_whisper import WhisperModel
 import sounddevice as sd
 import numpy as np
+import io
 import wave
-import tempfile
 import os
+import sys
 import time
-from typing import List, Optional, Dict
-from queue import Queue
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Tuple, Union
 import threading
+from bisect import bisect_right
+
+# Shared helpers live at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from model_registry import get_registry
+from audio_buffers import AudioRingBuffer
+from streaming_asr import StreamingTranscriber
+from vad import SpeechSegment, StreamingVAD, create_vad, split_speech
+from Video_Conferencing_server.config import Config
+
+# Anything transcribe_audio accepts: a file path, a waveform or an encoded/raw PCM buffer
+AudioInput = Union[str, np.ndarray, bytes, bytearray, memoryview]
+
+# Batched mode places each speech segment in its own slot of this many seconds (Whisper's window)
+BATCH_SLOT_SECONDS = 30
 
 class BestVoiceToText:
     def __init__(self, model_size: str = "large-v3", device: str = "auto", compute_type: str = "float32"):
@@ -26,18 +43,25 @@ class BestVoiceToText:
         if device == "auto":
             device = "cuda" if torch.cuda.is_available() else "cpu"
         
-        self.model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type,
-            download_root="./whisper_models"  # Custom download location
+        # Loaded once per process; later instances reuse the same weights
+        self.model = get_registry().get(
+            ("whisper", model_size, device, compute_type),
+            lambda: WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                download_root="./whisper_models"  # Custom download location
+            )
         )
         
         self.device = device
         self.sample_rate = 16000  # Whisper's required sample rate
         self.channels = 1
         self.is_recording = False
-        self.audio_queue = Queue()
+        # Microphone ring buffer of the current real-time session
+        self.ring_buffer: Optional[AudioRingBuffer] = None
+        # Throughput of the last batch_transcribe call
+        self.batch_stats: Optional[Dict] = None
         
         print(f"✅ Whisper {model_size} loaded on {device.upper()}!")
         print("🌍 Supports 99+ languages including: English, Hindi, Spanish, French, Chinese, Japanese, etc.")
@@ -53,69 +77,112 @@ class BestVoiceToText:
             "features": ["Speech Recognition", "Translation", "Language Detection"]
         }
     
-    def record_audio(self, duration: float = 5.0, output_path: Optional[str] = None) -> str:
+    def record_audio(self, duration: float = 5.0, output_path: Optional[str] = None) -> Optional[np.ndarray]:
         """
         Record high-quality audio from microphone
         
         Args:
             duration: Recording duration in seconds
-            output_path: Optional path to save audio file
+            output_path: Optional path to also save the recording as a WAV file
             
         Returns:
-            Path to the recorded audio file
+            Mono float32 waveform at 16 kHz (None if recording failed)
         """
-        if output_path is None:
-            output_path = tempfile.mktemp(suffix='.wav')
-        
         print(f"🎤 Recording {duration} seconds... Speak clearly!")
         
         try:
-            # Record audio
+            # Record straight into the float32 layout Whisper consumes
             audio_data = sd.rec(
                 int(duration * self.sample_rate),
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.int16
+                dtype=np.float32
             )
             sd.wait()
+            audio_data = audio_data.reshape(-1)
             
-            # Save to WAV file
-            with wave.open(output_path, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(audio_data.tobytes())
-            
-            print(f"💾 Audio saved: {output_path}")
-            return output_path
+            if output_path is not None:
+                self.save_audio(audio_data, output_path)
+                print(f"💾 Audio saved: {output_path}")
+            return audio_data
             
         except Exception as e:
             print(f"❌ Recording error: {e}")
-            return ""
+            return None
     
-    def transcribe_audio(self, audio_path: str, language: Optional[str] = None, 
-                        task: str = "transcribe", beam_size: int = 5) -> Dict:
+    def load_audio(self, audio: AudioInput, sample_rate: Optional[int] = None) -> np.ndarray:
         """
-        Transcribe audio file to text using Whisper (BEST accuracy)
+        Convert in-memory audio to the mono float32 16 kHz waveform Whisper expects
         
         Args:
-            audio_path: Path to audio file
+            audio: float32/int16 NumPy array, or bytes/bytearray/memoryview holding either an
+                encoded file (WAV, MP3, ... decoded in memory) or raw PCM samples. Raw buffers
+                are int16 unless a memoryview says otherwise (format "f" = float32)
+            sample_rate: Rate of array/raw PCM input (defaults to 16 kHz)
+            
+        Returns:
+            1-D float32 array at self.sample_rate
+        """
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            view = memoryview(audio)
+            header = bytes(view[:4])
+            if header in (b"RIFF", b"fLaC", b"OggS", b"ID3\x03", b"ID3\x04"):
+                # Encoded container: let faster-whisper's decoder read it from memory
+                from faster_whisper.audio import decode_audio
+                return decode_audio(io.BytesIO(view), sampling_rate=self.sample_rate)
+            dtype = np.float32 if view.format == "f" else np.int16
+            audio = np.frombuffer(view.cast("B"), dtype=dtype)
+        
+        audio = np.asarray(audio)
+        if audio.ndim > 1:
+            # (frames, channels) from sounddevice: mix down to mono
+            audio = audio.mean(axis=1)
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768.0
+        elif audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        
+        if sample_rate and sample_rate != self.sample_rate and audio.size:
+            # Linear resampling is enough for speech recognition input
+            target_length = int(round(audio.size * self.sample_rate / sample_rate))
+            positions = np.linspace(0, audio.size - 1, target_length)
+            audio = np.interp(positions, np.arange(audio.size), audio).astype(np.float32)
+        return audio
+    
+    def transcribe_audio(self, audio: AudioInput, language: Optional[str] = None, 
+                        task: str = "transcribe", beam_size: int = 5,
+                        sample_rate: Optional[int] = None) -> Dict:
+        """
+        Transcribe audio to text using Whisper (BEST accuracy)
+        
+        Args:
+            audio: Path to an audio file, or in-memory audio (see load_audio); in-memory
+                input goes to the model without touching the disk
             language: Force specific language (None for auto-detection)
             task: "transcribe" or "translate" (to English)
             beam_size: Higher = more accurate but slower
+            sample_rate: Rate of array/raw PCM input (defaults to 16 kHz)
             
         Returns:
             Dictionary with transcription results
         """
-        if not os.path.exists(audio_path):
-            return {"error": "Audio file not found"}
+        if isinstance(audio, str):
+            if not os.path.exists(audio):
+                return {"error": "Audio file not found"}
+        else:
+            try:
+                audio = self.load_audio(audio, sample_rate)
+            except Exception as e:
+                return {"error": f"Unsupported audio input: {e}"}
+            if audio.size == 0:
+                return {"error": "Empty audio"}
         
         try:
             print("🧠 Processing audio with Whisper Large v3...")
             
             # Transcribe with Whisper
             segments, info = self.model.transcribe(
-                audio_path,
+                audio,
                 language=language,
                 task=task,
                 beam_size=beam_size,
@@ -138,13 +205,35 @@ class BestVoiceToText:
         except Exception as e:
             return {"error": f"Transcription error: {e}"}
     
-    def real_time_transcription(self, chunk_duration: float = 3.0):
+    def real_time_transcription(self, chunk_duration: float = 3.0, buffer_seconds: float = 30.0,
+                                vad: Optional[str] = "auto", hangover_ms: int = 400,
+                                max_segment_seconds: float = 15.0):
         """
         Real-time speech-to-text transcription
+        
+        The sounddevice callback copies each block into a preallocated ring
+        buffer (never blocking). With a VAD, the loop scores everything captured
+        and transcribes only complete utterances, cut at pauses; silence never
+        reaches the model. Without one, fixed-size chunks are read into one
+        reused array.
+        
+        Args:
+            chunk_duration: Seconds of audio per transcription when vad is None
+            buffer_seconds: Ring capacity; audio the transcriber falls further behind than this is dropped
+            vad: "auto", "silero", "energy", or None for fixed chunks
+            hangover_ms: Silence that ends an utterance
+            max_segment_seconds: Longest utterance before it is cut at its quietest point
         """
-        def audio_callback(indata, frames, time_info, status):
-            if self.is_recording:
-                self.audio_queue.put(indata.copy())
+        ring = AudioRingBuffer(max(buffer_seconds, 2 * chunk_duration), self.sample_rate)
+        self.ring_buffer = ring
+        chunk_samples = int(self.sample_rate * chunk_duration)
+        chunk = np.empty(chunk_samples, dtype=np.float32)
+        endpointer = None
+        if vad:
+            detector = create_vad(vad, self.sample_rate, energy_threshold=Config.SILENCE_THRESHOLD)
+            endpointer = StreamingVAD(detector, self.sample_rate,
+                                      hangover_ms=hangover_ms, max_segment_seconds=max_segment_seconds)
+            chunk = np.empty(ring.capacity, dtype=np.float32)
         
         print("🎯 REAL-TIME SPEECH-TO-TEXT ACTIVATED")
         print("=" * 60)
@@ -156,50 +245,166 @@ class BestVoiceToText:
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype=np.float32,
-                callback=audio_callback,
+                callback=ring.callback,
                 blocksize=int(self.sample_rate * 0.1)
             ):
                 self.is_recording = True
-                audio_buffer = np.array([], dtype=np.float32)
                 
                 while self.is_recording:
-                    try:
-                        # Get audio data
-                        audio_chunk = self.audio_queue.get(timeout=1)
-                        audio_buffer = np.concatenate([audio_buffer, audio_chunk.flatten()])
-                        
-                        # Process when we have enough audio
-                        if len(audio_buffer) >= self.sample_rate * chunk_duration:
-                            # Save to temporary file
-                            temp_file = tempfile.mktemp(suffix='.wav')
-                            self._save_audio_buffer(audio_buffer, temp_file)
-                            
-                            # Transcribe
-                            result = self.transcribe_audio(temp_file)
-                            
-                            if "text" in result and result["text"].strip():
-                                print(f"\n🗣️  [{result['language'].upper()}] {result['text']}")
-                                print("-" * 80)
-                            
-                            # Clean up and reset buffer
-                            try:
-                                os.remove(temp_file)
-                            except:
-                                pass
-                            audio_buffer = np.array([], dtype=np.float32)
-                            
-                    except Queue.Empty:
+                    if endpointer is not None:
+                        if not ring.available():
+                            time.sleep(0.02)
+                            continue
+                        # Only utterances the VAD closed are transcribed
+                        for segment in endpointer.feed(ring.read(ring.available(), out=chunk)):
+                            self._print_live_result(self.transcribe_audio(segment.audio))
+                        continue
+                    
+                    # Process when we have enough audio
+                    if ring.available() < chunk_samples:
+                        time.sleep(0.05)
                         continue
+                    
+                    # Transcribe the samples directly, no WAV round-trip
+                    self._print_live_result(self.transcribe_audio(ring.read(chunk_samples, out=chunk)))
                         
         except KeyboardInterrupt:
             print("\n⏹️  Stopping real-time transcription...")
         finally:
             self.is_recording = False
+            if endpointer is not None:
+                for segment in endpointer.flush():
+                    self._print_live_result(self.transcribe_audio(segment.audio))
+                vad_stats = endpointer.stats()
+                print(f"🔇 VAD ({vad_stats['backend']}): {vad_stats['speech_seconds']:.1f}s of speech in "
+                      f"{vad_stats['total_seconds']:.1f}s, {vad_stats['silence_ratio']:.0%} silence skipped")
+            stats = ring.stats()
+            if stats["overflows"] or stats["input_overflows"]:
+                print(f"⚠️  Audio overflow: {stats['dropped_seconds']:.1f}s dropped by the buffer, "
+                      f"{stats['input_overflows']} device overflows")
+    
+    def transcribe_stream(self, chunks: Iterable[np.ndarray], language: Optional[str] = None,
+                          step_seconds: float = 0.5, max_window_seconds: float = 15.0,
+                          beam_size: int = 1) -> Iterator[Dict]:
+        """
+        Streaming transcription of an audio chunk source
+        
+        Yields {"type": "partial" | "final", "text", "committed", "tentative", ...}
+        events. Committed text only grows between finals; tentative text is the
+        current guess for the rest and may change on the next event.
+        
+        Args:
+            chunks: Iterable of mono float32 16 kHz sample arrays
+            language: Language code (None for auto-detection)
+            step_seconds: How often the sliding window is re-decoded
+            max_window_seconds: Longest window before committed text is finalized
+            beam_size: Beam size per decode (1 keeps latency lowest)
+        """
+        transcriber = StreamingTranscriber(
+            self.model,
+            sample_rate=self.sample_rate,
+            language=language,
+            step_seconds=step_seconds,
+            max_window_seconds=max_window_seconds,
+            beam_size=beam_size
+        )
+        yield from transcriber.iter_events(chunks)
+    
+    def stream_microphone(self, language: Optional[str] = None, step_seconds: float = 0.5,
+                          max_window_seconds: float = 15.0, beam_size: int = 1,
+                          buffer_seconds: float = 30.0) -> Iterator[Dict]:
+        """
+        Streaming transcription of the microphone, as a generator of events
+        
+        Stops on Ctrl+C or when is_recording is cleared; the remaining
+        tentative text is then emitted as a final event. With the tiny/base/small
+        models on CPU the first partial arrives within about a second of speech.
+        
+        Args:
+            language: Language code (None for auto-detection)
+            step_seconds: How often the sliding window is re-decoded
+            max_window_seconds: Longest window before committed text is finalized
+            beam_size: Beam size per decode
+            buffer_seconds: Ring capacity between the audio callback and the decoder
+        """
+        ring = AudioRingBuffer(max(buffer_seconds, 4 * step_seconds), self.sample_rate)
+        self.ring_buffer = ring
+        transcriber = StreamingTranscriber(
+            self.model,
+            sample_rate=self.sample_rate,
+            language=language,
+            step_seconds=step_seconds,
+            max_window_seconds=max_window_seconds,
+            beam_size=beam_size
+        )
+        step_samples = int(self.sample_rate * step_seconds)
+        scratch = np.empty(ring.capacity, dtype=np.float32)
+        
+        try:
+            with sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype=np.float32,
+                callback=ring.callback,
+                blocksize=int(self.sample_rate * 0.05)
+            ):
+                self.is_recording = True
+                
+                while self.is_recording:
+                    if ring.available() < step_samples:
+                        time.sleep(0.02)
+                        continue
+                    
+                    # Everything captured while the last decode ran goes into the window at once
+                    transcriber.insert_audio(ring.read(ring.available(), out=scratch))
+                    yield from transcriber.process()
+                    
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopping streaming transcription...")
+        finally:
+            self.is_recording = False
+        
+        yield from transcriber.finish()
+        stats = transcriber.stats()
+        if stats["first_text_latency"] is not None:
+            print(f"⏱️  First text after {stats['first_text_latency']:.2f}s, "
+                  f"{stats['avg_decode_ms']:.0f} ms per decode (RTF {stats['real_time_factor']:.2f})")
     
-    def _save_audio_buffer(self, audio_buffer: np.ndarray, output_path: str):
-        """Save audio buffer to WAV file"""
+    def streaming_transcription(self, callback: Optional[Callable[[Dict], None]] = None,
+                                language: Optional[str] = None, step_seconds: float = 0.5,
+                                max_window_seconds: float = 15.0, beam_size: int = 1):
+        """
+        Live speech-to-text with partial results
+        
+        Args:
+            callback: Called with every partial/final event (None prints them)
+            language: Language code (None for auto-detection)
+            step_seconds: How often the sliding window is re-decoded
+            max_window_seconds: Longest window before committed text is finalized
+            beam_size: Beam size per decode
+        """
+        print("⚡ STREAMING SPEECH-TO-TEXT ACTIVATED")
+        print("=" * 60)
+        print("Speak naturally. Text appears while you talk; finished sentences are printed on their own line.")
+        print("Press Ctrl+C to stop\n")
+        
+        for event in self.stream_microphone(language, step_seconds, max_window_seconds, beam_size):
+            if callback is not None:
+                callback(event)
+            elif event["type"] == "partial":
+                print(f"\r💬 {event['committed']} \033[2m{event['tentative']}\033[0m\033[K", end="", flush=True)
+            elif event["text"]:
+                print(f"\r🗣️  [{(event['language'] or '?').upper()}] {event['text']}\033[K")
+    
+    def _print_live_result(self, result: Dict):
+        if "text" in result and result["text"].strip():
+            print(f"\n🗣️  [{result['language'].upper()}] {result['text']}")
+            print("-" * 80)
+    
+    def save_audio(self, audio_buffer: np.ndarray, output_path: str):
+        """Save a float32 waveform to a 16-bit WAV file (only when a file is explicitly wanted)"""
         # Convert to 16-bit PCM
-        audio_int16 = (audio_buffer * 32767).astype(np.int16)
+        audio_int16 = (np.clip(audio_buffer, -1.0, 1.0) * 32767).astype(np.int16)
         
         with wave.open(output_path, 'wb') as wf:
             wf.setnchannels(self.channels)
@@ -207,34 +412,195 @@ class BestVoiceToText:
             wf.setframerate(self.sample_rate)
             wf.writeframes(audio_int16.tobytes())
     
-    def batch_transcribe(self, audio_files: List[str], output_dir: Optional[str] = None) -> Dict:
+    def batch_transcribe(self, audio_files: List[str], output_dir: Optional[str] = None,
+                         batched: bool = False, batch_size: int = 16, language: Optional[str] = None,
+                         beam_size: int = 5, vad: str = "auto") -> Dict:
         """
         Transcribe multiple audio files
         
         Args:
             audio_files: List of audio file paths
-            output_dir: Directory to save transcriptions
+            output_dir: Directory to save transcriptions (each file is written as soon as it is done)
+            batched: VAD-segment every file and decode the segments of all files in fixed-size
+                batches (faster-whisper >= 1.1 BatchedInferencePipeline); much higher throughput
+                for large archives
+            batch_size: Segments per batch in batched mode
+            language: Language code (None detects it per file)
+            beam_size: Beam size per segment
+            vad: VAD backend for batched segmentation ("auto", "silero" or "energy")
             
         Returns:
             Dictionary with results for each file
         """
-        results = {}
+        start_time = time.perf_counter()
+        existing = [audio_file for audio_file in audio_files if os.path.exists(audio_file)]
         
-        for audio_file in audio_files:
-            if os.path.exists(audio_file):
+        if batched:
+            results = self._batched_transcribe(existing, output_dir, batch_size, language, beam_size, vad)
+        else:
+            results = {}
+            for audio_file in existing:
                 print(f"📄 Processing: {os.path.basename(audio_file)}")
-                result = self.transcribe_audio(audio_file)
+                result = self.transcribe_audio(audio_file, language=language, beam_size=beam_size)
                 results[audio_file] = result
                 
                 # Save to file if output directory specified
                 if output_dir and "text" in result:
-                    os.makedirs(output_dir, exist_ok=True)
-                    output_file = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(audio_file))[0]}.txt")
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write(result["text"])
-                    print(f"💾 Transcription saved: {output_file}")
-            
+                    self._save_transcription(audio_file, result["text"], output_dir)
+        
+        self._report_batch(results, time.perf_counter() - start_time)
         return results
+    
+    def _batched_transcribe(self, audio_files: List[str], output_dir: Optional[str], batch_size: int,
+                            language: Optional[str], beam_size: int, vad: str) -> Dict:
+        """
+        Cross-file batched decoding of VAD segments
+        
+        Segments are grouped per language into packs of batch_size. A pack is
+        laid out as one array with every segment at the start of its own
+        30-second slot and passed as clip_timestamps, so the pipeline decodes
+        exactly one chunk per segment, all in one batch, and each output maps
+        back to its slot. A file's text is assembled in segment order and
+        saved as soon as its last segment is decoded. A pack that fails
+        reports an error for each of its files; the rest of the job goes on.
+        """
+        from faster_whisper import BatchedInferencePipeline
+        from faster_whisper.audio import decode_audio
+        
+        pipeline = BatchedInferencePipeline(model=self.model)
+        detector = create_vad(vad, self.sample_rate, energy_threshold=Config.SILENCE_THRESHOLD)
+        endpointer = StreamingVAD(detector, self.sample_rate, max_segment_seconds=BATCH_SLOT_SECONDS - 2)
+        slot = BATCH_SLOT_SECONDS * self.sample_rate
+        packed = np.zeros(slot * batch_size, dtype=np.float32)
+        
+        results = {}
+        # Files with segments still in flight: texts in segment order and how many are missing
+        files: Dict[str, Dict] = {}
+        # Segments waiting for a pack, per language: (file, segment index, segment)
+        pending: Dict[str, List[Tuple[str, int, SpeechSegment]]] = {}
+        
+        def finish_file(audio_file: str):
+            state = files.pop(audio_file)
+            text = " ".join(part for part in state["texts"] if part).strip()
+            results[audio_file] = {
+                "text": text,
+                "language": state["language"],
+                "language_probability": state["language_probability"],
+                "duration": state["duration"],
+                "segments": len(state["texts"]),
+                "model": "Whisper Large v3"
+            }
+            print(f"📄 Done: {os.path.basename(audio_file)} ({len(state['texts'])} segments)")
+            if output_dir:
+                self._save_transcription(audio_file, text, output_dir)
+        
+        def fail_file(audio_file: str, error: str):
+            # Segments of this file still queued in other packs are skipped
+            files.pop(audio_file, None)
+            results[audio_file] = {"error": error}
+            print(f"❌ {os.path.basename(audio_file)}: {error}")
+        
+        def run_pack(pack_language: str, pieces: List[Tuple[str, int, SpeechSegment]]):
+            pieces = [piece for piece in pieces if piece[0] in files]
+            if not pieces:
+                return
+            clips = []
+            for position, (_, _, segment) in enumerate(pieces):
+                base = position * slot
+                packed[base:base + slot] = 0.0
+                packed[base:base + len(segment.audio)] = segment.audio
+                clips.append({"start": base, "end": base + len(segment.audio)})
+            clip_starts = [clip["start"] for clip in clips]
+            
+            texts = [[] for _ in pieces]
+            try:
+                outputs, _ = pipeline.transcribe(
+                    packed[:len(pieces) * slot],
+                    language=pack_language,
+                    beam_size=beam_size,
+                    batch_size=batch_size,
+                    vad_filter=False,
+                    clip_timestamps=clips,
+                    without_timestamps=True
+                )
+                for output in outputs:
+                    # The clip an output starts in; anything outside every clip cannot be attributed
+                    start = int(round(output.start * self.sample_rate))
+                    position = bisect_right(clip_starts, start) - 1
+                    if position < 0 or start > clips[position]["end"]:
+                        raise RuntimeError(f"Output at {output.start:.2f}s matches no segment of the pack")
+                    texts[position].append(output.text.strip())
+            except Exception as e:
+                for audio_file in dict.fromkeys(piece[0] for piece in pieces):
+                    fail_file(audio_file, f"Transcription error: {e}")
+                return
+            
+            for (audio_file, index, _), parts in zip(pieces, texts):
+                state = files[audio_file]
+                state["texts"][index] = " ".join(parts)
+                state["remaining"] -= 1
+                if not state["remaining"]:
+                    finish_file(audio_file)
+        
+        for audio_file in audio_files:
+            try:
+                audio = decode_audio(audio_file, sampling_rate=self.sample_rate)
+            except Exception as e:
+                results[audio_file] = {"error": f"Could not decode audio: {e}"}
+                continue
+            
+            segments = split_speech(audio, endpointer)
+            file_language, probability = language, 1.0
+            if file_language is None and segments:
+                try:
+                    file_language, probability, _ = self.model.detect_language(audio)
+                except Exception as e:
+                    fail_file(audio_file, f"Language detection error: {e}")
+                    continue
+            files[audio_file] = {
+                "texts": [""] * len(segments),
+                "remaining": len(segments),
+                "language": file_language,
+                "language_probability": probability,
+                "duration": len(audio) / self.sample_rate
+            }
+            if not segments:
+                finish_file(audio_file)
+                continue
+            
+            queue = pending.setdefault(file_language, [])
+            for index, segment in enumerate(segments):
+                queue.append((audio_file, index, segment))
+                if len(queue) == batch_size:
+                    run_pack(file_language, queue)
+                    queue.clear()
+        
+        for pack_language, queue in pending.items():
+            if queue:
+                run_pack(pack_language, queue)
+        
+        # Input order, as in the sequential mode
+        return {audio_file: results[audio_file] for audio_file in audio_files if audio_file in results}
+    
+    def _save_transcription(self, audio_file: str, text: str, output_dir: str):
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(audio_file))[0]}.txt")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"💾 Transcription saved: {output_file}")
+    
+    def _report_batch(self, results: Dict, elapsed: float):
+        """Files per minute and real-time factor (processing time / audio time) of a batch run"""
+        audio_seconds = sum(result.get("duration") or 0.0 for result in results.values())
+        self.batch_stats = {
+            "files": len(results),
+            "elapsed_seconds": elapsed,
+            "audio_seconds": audio_seconds,
+            "files_per_minute": len(results) / elapsed * 60 if elapsed else 0.0,
+            "real_time_factor": elapsed / audio_seconds if audio_seconds else 0.0,
+        }
+        print(f"📊 {len(results)} files in {elapsed:.1f}s: {self.batch_stats['files_per_minute']:.1f} files/min, "
+              f"RTF {self.batch_stats['real_time_factor']:.3f} ({audio_seconds / 60:.1f} min of audio)")
 
 # 🎯 USAGE EXAMPLES
 
@@ -262,18 +628,23 @@ def demonstrate_best_voice_to_text():
     while True:
         print("Choose an option:")
         print("1. 🎤 Real-time speech-to-text")
-        print("2. 📁 Transcribe audio file")
-        print("3. ⏺️  Record and transcribe")
-        print("4. 📦 Batch transcribe multiple files")
-        print("5. 🚪 Exit")
+        print("2. ⚡ Streaming speech-to-text (live partial results)")
+        print("3. 📁 Transcribe audio file")
+        print("4. ⏺️  Record and transcribe")
+        print("5. 📦 Batch transcribe multiple files")
+        print("6. 🚪 Exit")
         
-        choice = input("\nEnter choice (1-5): ").strip()
+        choice = input("\nEnter choice (1-6): ").strip()
         
         if choice == "1":
             print("\nStarting real-time transcription...")
             stt.real_time_transcription()
             
         elif choice == "2":
+            print("\nStarting streaming transcription...")
+            stt.streaming_transcription()
+            
+        elif choice == "3":
             audio_path = input("Enter audio file path: ").strip()
             if os.path.exists(audio_path):
                 result = stt.transcribe_audio(audio_path)
@@ -285,24 +656,19 @@ def demonstrate_best_voice_to_text():
             else:
                 print("❌ File not found!")
                 
-        elif choice == "3":
+        elif choice == "4":
             try:
                 duration = float(input("Recording duration (seconds): ").strip() or "5")
-                audio_path = stt.record_audio(duration)
-                if audio_path:
-                    result = stt.transcribe_audio(audio_path)
+                audio = stt.record_audio(duration)
+                if audio is not None:
+                    result = stt.transcribe_audio(audio)
                     if "text" in result:
                         print(f"\n🎤 You said: {result['text']}")
                         print(f"🌐 Language: {result['language']}")
-                    # Clean up
-                    try:
-                        os.remove(audio_path)
-                    except:
-                        pass
             except ValueError:
                 print("❌ Please enter a valid number!")
                 
-        elif choice == "4":
+        elif choice == "5":
             files_input = input("Enter audio file paths (comma-separated): ").strip()
             audio_files = [f.strip() for f in files_input.split(',') if f.strip()]
             valid_files = [f for f in audio_files if os.path.exists(f)]
@@ -312,12 +678,12 @@ def demonstrate_best_voice_to_text():
                 if not output_dir:
                     output_dir = None
                 
-                results = stt.batch_transcribe(valid_files, output_dir)
+                results = stt.batch_transcribe(valid_files, output_dir, batched=len(valid_files) > 1)
                 print(f"\n✅ Processed {len(results)} files!")
             else:
                 print("❌ No valid files found!")
                 
-        elif choice == "5":
+        elif choice == "6":
             print("👋 Goodbye!")
             break
             
@@ -327,12 +693,12 @@ def demonstrate_best_voice_to_text():
         print("\n" + "=" * 80)
 
 # Quick one-liner function for simple use
-def quick_transcribe(audio_path: str, language: str = None) -> str:
+def quick_transcribe(audio_path: AudioInput, language: str = None) -> str:
     """
     Quick transcription function
     
     Args:
-        audio_path: Path to audio file
+        audio_path: Path to audio file, or in-memory audio
         language: Optional language code (en, hi, es, etc.)
     
     Returns:
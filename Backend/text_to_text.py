@@ -1,9 +1,64 @@
+import os
+import sys
+import threading
+import time
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+# Shared helpers live at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from translation_cache import PipelineCache, make_pipeline_key
+from translation_batching import bucket_by_length, padding_stats
+from model_registry import get_registry
+from translation_engines import tokenizer_lock
+
+# Warmed at startup unless warmup_pairs is given; same setting as Final_Optimized_Model
+DEFAULT_LANGUAGE_PAIRS = [
+    tuple(part.strip().lower() for part in item.split(":", 1))
+    for item in os.getenv("BABEL_LANGUAGE_PAIRS", "en:es,es:en,en:hi,hi:en").split(",") if ":" in item
+]
+
+class _DecoderState:
+    def __init__(self, model, input_ids, attention_mask):
+        """
+        One model's encoder output and decoder cache for assisted decoding
+        
+        The cache covers a prefix of the decoded tokens; logits() feeds only
+        the tokens past it, rewind() drops cached positions that were rejected.
+        """
+        self.model = model
+        self.attention_mask = attention_mask
+        self.encoder_outputs = model.get_encoder()(input_ids=input_ids, attention_mask=attention_mask)
+        self.cache = None
+        self.cached = 0
+    
+    def logits(self, tokens: List[int]):
+        """Next-token logits (one row per uncached token) for the decoder prefix tokens"""
+        outputs = self.model(
+            encoder_outputs=self.encoder_outputs,
+            attention_mask=self.attention_mask,
+            decoder_input_ids=torch.tensor([tokens[self.cached:]], device=self.model.device),
+            past_key_values=self.cache,
+            use_cache=True
+        )
+        self.cache = outputs.past_key_values
+        self.cached = len(tokens)
+        return outputs.logits[0]
+    
+    def rewind(self, length: int):
+        """Keep only the first length cached positions"""
+        if length < self.cached:
+            # A negative size removes that many positions on every transformers version
+            self.cache.crop(length - self.cached)
+            self.cached = length
 
 class UniversalTranslator:
-    def __init__(self, model_size: str = "facebook/nllb-200-distilled-600M", device: str = "auto"):
+    def __init__(self, model_size: str = "facebook/nllb-200-distilled-600M", device: str = "auto",
+                 warmup_pairs: Optional[List[Tuple[str, str]]] = None, pipeline_cache_size: int = 32,
+                 draft_model_size: Optional[str] = None, num_assistant_tokens: int = 5):
         """
         Universal translator supporting 200+ languages
         
@@ -13,6 +68,14 @@ class UniversalTranslator:
                 - "facebook/nllb-200-1.3B" (Better quality)
                 - "facebook/nllb-200-3.3B" (Best quality, needs more RAM)
             device: "cpu", "cuda", or "auto"
+            warmup_pairs: (source, target) pairs to build and warm at startup
+                (None = BABEL_LANGUAGE_PAIRS, [] = skip warm-up)
+            pipeline_cache_size: Maximum number of cached translation pipelines
+            draft_model_size: Smaller checkpoint sharing the vocabulary (e.g.
+                "facebook/nllb-200-distilled-600M") that drafts tokens for the
+                main model to verify. Enables assisted (speculative) greedy
+                decoding; beam search requests still run the main model alone.
+            num_assistant_tokens: Tokens drafted per verification step
         """
         print(f"🚀 Loading Universal Translator ({model_size})...")
         
@@ -23,18 +86,61 @@ class UniversalTranslator:
         self.device = device
         self.model_size = model_size
         
-        # Load tokenizer and model
-        self.tokenizer = AutoTokenizer.from_pretrained(model_size)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(
-            model_size,
-            torch_dtype=torch.float16 if device == "cuda" else torch.float32,
-            device_map="auto" if device == "cuda" else None
+        # Load tokenizer and model once per process and share them
+        registry = get_registry()
+        self.tokenizer = registry.get(
+            ("tokenizer", model_size),
+            lambda: AutoTokenizer.from_pretrained(model_size)
+        )
+        torch_dtype = torch.float16 if device == "cuda" else torch.float32
+        self.model = registry.get(
+            ("transformers", model_size, device, str(torch_dtype).replace("torch.", "")),
+            lambda: AutoModelForSeq2SeqLM.from_pretrained(
+                model_size,
+                torch_dtype=torch_dtype,
+                device_map="auto" if device == "cuda" else None
+            )
         )
         
+        # Draft model for assisted generation (loaded once, shared like the main model)
+        self.draft_model = None
+        self.draft_model_size = draft_model_size
+        if draft_model_size:
+            self.draft_model = registry.get(
+                ("transformers", draft_model_size, device, str(torch_dtype).replace("torch.", "")),
+                lambda: AutoModelForSeq2SeqLM.from_pretrained(
+                    draft_model_size,
+                    torch_dtype=torch_dtype,
+                    device_map="auto" if device == "cuda" else None
+                )
+            )
+            if self.draft_model.config.vocab_size != self.model.config.vocab_size:
+                raise ValueError(f"Draft model {draft_model_size} does not share the vocabulary of {model_size}")
+        self.num_assistant_tokens = num_assistant_tokens
+        # Updated by concurrent translate calls
+        self._speculative_lock = threading.Lock()
+        self.speculative_stats = {
+            "calls": 0,
+            "generated_tokens": 0,
+            "drafted_tokens": 0,
+            "accepted_tokens": 0,
+            "target_steps": 0,
+            "seconds": 0.0,
+        }
+        
         # Language code mapping
         self.language_map = self._create_language_map()
         
+        # Reuse pipelines across calls instead of rebuilding them per request
+        self.pipeline_cache = PipelineCache(max_size=pipeline_cache_size)
+        self.last_batch_stats: Dict = {}
+        warmup_pairs = warmup_pairs if warmup_pairs is not None else DEFAULT_LANGUAGE_PAIRS
+        if warmup_pairs:
+            self.warm_up(warmup_pairs)
+        
         print(f"✅ Translator ready on {device.upper()}!")
+        if self.draft_model is not None:
+            print(f"⚡ Assisted decoding with draft model {draft_model_size}")
         print(f"🌍 Supports {len(self.language_map)} languages!")
     
     def _create_language_map(self) -> Dict[str, str]:
@@ -125,15 +231,120 @@ class UniversalTranslator:
         """Convert common language code to NLLB format"""
         return self.language_map.get(lang_code.lower())
     
-    def translate(self, text: str, source_lang: str, target_lang: str, max_length: int = 512) -> Dict:
+    def _get_pipeline(self, src_nllb: str, tgt_nllb: str, max_length: int):
+        """Get a cached translation pipeline for a language pair and decoding settings"""
+        key = make_pipeline_key(src_nllb, tgt_nllb, max_length=max_length)
+        return self.pipeline_cache.get(key, lambda: pipeline(
+            'translation',
+            model=self.model,
+            tokenizer=self.tokenizer,
+            src_lang=src_nllb,
+            tgt_lang=tgt_nllb,
+            max_length=max_length,
+            device=0 if self.device == "cuda" else -1
+        ))
+    
+    def warm_up(self, pairs: List[Tuple[str, str]]):
+        """Build and run the pipeline for each language pair once"""
+        print(f"🔥 Warming up {len(pairs)} language pairs...")
+        for source_lang, target_lang in pairs:
+            result = self.translate("Hello", source_lang, target_lang)
+            if not result["success"]:
+                print(f"⚠️  Warm-up failed for {source_lang} → {target_lang}: {result['error']}")
+    
+    def get_cache_stats(self) -> Dict:
+        """Get pipeline cache hit/miss counters"""
+        return self.pipeline_cache.stats()
+    
+    def get_speculative_stats(self) -> Dict:
+        """Assisted decoding counters: draft acceptance rate and generation throughput"""
+        with self._speculative_lock:
+            stats = dict(self.speculative_stats)
+        stats["enabled"] = self.draft_model is not None
+        stats["draft_model"] = self.draft_model_size
+        stats["acceptance_rate"] = (stats["accepted_tokens"] / stats["drafted_tokens"]
+                                    if stats["drafted_tokens"] else 0.0)
+        stats["tokens_per_second"] = (stats["generated_tokens"] / stats["seconds"]
+                                      if stats["seconds"] > 0 else 0.0)
+        stats["tokens_per_target_step"] = (stats["generated_tokens"] / stats["target_steps"]
+                                           if stats["target_steps"] else 0.0)
+        return stats
+    
+    def _generate_assisted(self, input_ids: List[int], bos_token_id: int, max_length: int) -> str:
+        """
+        Greedy generation where the draft model proposes tokens and the main model verifies them
+        
+        Each round the draft greedily proposes up to num_assistant_tokens
+        tokens; one forward pass of the main model over them keeps the
+        longest prefix it agrees with plus its own next token. The output
+        therefore matches plain greedy decoding of the main model, and the
+        proposed/accepted counts are exact.
+        """
+        inputs = torch.tensor([input_ids], device=self.model.device)
+        attention_mask = torch.ones_like(inputs)
+        eos_token_id = self.model.config.eos_token_id
+        tokens = [self.model.config.decoder_start_token_id, bos_token_id]
+        drafted = accepted = target_steps = 0
+        start_time = time.time()
+        
+        with torch.inference_mode():
+            target = _DecoderState(self.model, inputs, attention_mask)
+            draft = _DecoderState(self.draft_model, inputs, attention_mask)
+            while len(tokens) < max_length and tokens[-1] != eos_token_id:
+                # Room for the proposals plus the main model's own token
+                candidates = []
+                for _ in range(min(self.num_assistant_tokens, max_length - len(tokens) - 1)):
+                    candidates.append(int(draft.logits(tokens + candidates)[-1].argmax()))
+                    if candidates[-1] == eos_token_id:
+                        break
+                
+                # Row i predicts the token after (tokens + candidates)[:len(tokens) + i]
+                predictions = target.logits(tokens + candidates)[-len(candidates) - 1:].argmax(dim=-1).tolist()
+                target_steps += 1
+                matched = 0
+                while matched < len(candidates) and predictions[matched] == candidates[matched]:
+                    matched += 1
+                drafted += len(candidates)
+                accepted += matched
+                tokens += candidates[:matched]
+                if tokens[-1] != eos_token_id:
+                    tokens.append(predictions[matched])
+                target.rewind(len(tokens) - 1)
+                draft.rewind(len(tokens) - 1)
+        
+        # Everything after the decoder start token was produced by generation
+        new_tokens = len(tokens) - 1
+        with self._speculative_lock:
+            stats = self.speculative_stats
+            stats["calls"] += 1
+            stats["generated_tokens"] += new_tokens
+            stats["drafted_tokens"] += drafted
+            stats["accepted_tokens"] += accepted
+            stats["target_steps"] += target_steps
+            stats["seconds"] += time.time() - start_time
+        return self.tokenizer.decode(tokens, skip_special_tokens=True)
+    
+    def _uses_draft(self, num_beams: Optional[int]) -> bool:
+        """Assisted decoding only reproduces greedy search, so beam search runs the main model alone"""
+        if self.draft_model is None:
+            return False
+        # None means the checkpoint's own generation default
+        return (num_beams if num_beams is not None else self.model.generation_config.num_beams) == 1
+    
+    def translate(self, text: str, source_lang: str, target_lang: str, max_length: int = 512,
+                  num_beams: Optional[int] = None) -> Dict:
         """
         Translate text between any supported languages
         
+        The draft model (if any) is used only when decoding is greedy; with
+        more than one beam the request runs normal generation.
+        
         Args:
             text: Text to translate
             source_lang: Source language code (e.g., 'en', 'es', 'hi')
             target_lang: Target language code (e.g., 'en', 'es', 'hi')
             max_length: Maximum translation length
+            num_beams: Beam count (None uses the model's default)
             
         Returns:
             Dictionary with translation results
@@ -151,20 +362,21 @@ class UniversalTranslator:
             
             print(f"🌐 Translating {src_nllb} → {tgt_nllb}...")
             
-            # Use pipeline for reliable translation
-            translator = pipeline(
-                'translation',
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang=src_nllb,
-                tgt_lang=tgt_nllb,
-                max_length=max_length,
-                device=0 if self.device == "cuda" else -1
-            )
-            
-            # Perform translation
-            result = translator(text)
-            translated_text = result[0]['translation_text']
+            if self._uses_draft(num_beams):
+                # The tokenizer is shared process-wide; src_lang must not change mid-encode
+                with tokenizer_lock(self.tokenizer):
+                    self.tokenizer.src_lang = src_nllb
+                    input_ids = self.tokenizer(text, truncation=True, max_length=max_length)["input_ids"]
+                translated_text = self._generate_assisted(
+                    input_ids, self.tokenizer.convert_tokens_to_ids(tgt_nllb), max_length
+                )
+            else:
+                # Use pipeline for reliable translation
+                translator = self._get_pipeline(src_nllb, tgt_nllb, max_length)
+                
+                # Perform translation
+                result = translator(text) if num_beams is None else translator(text, num_beams=num_beams)
+                translated_text = result[0]['translation_text']
             
             return {
                 "success": True,
@@ -181,13 +393,123 @@ class UniversalTranslator:
                 "error": f"Translation error: {str(e)}"
             }
     
-    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[Dict]:
-        """Translate multiple texts efficiently"""
-        results = []
-        for text in texts:
-            result = self.translate(text, source_lang, target_lang)
-            results.append(result)
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: Union[str, List[str]],
+                        max_length: int = 512, max_tokens_per_batch: int = 4096,
+                        max_batch_size: int = 64, num_beams: Optional[int] = None) -> List[Dict]:
+        """
+        Translate multiple texts efficiently with length-bucketed batched generation
+        
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code shared by all texts
+            target_lang: One target language code, or one code per text
+            max_length: Maximum input/translation length in tokens
+            max_tokens_per_batch: Padded-token budget for a single generate call
+            max_batch_size: Maximum number of texts per generate call
+            num_beams: Beam count (None uses the model's default)
+            
+        Returns:
+            List of result dictionaries in the same order as texts
+        """
+        start_time = time.time()
+        targets = [target_lang] * len(texts) if isinstance(target_lang, str) else list(target_lang)
+        if len(targets) != len(texts):
+            error = f"Got {len(targets)} target languages for {len(texts)} texts"
+            return [{"success": False, "error": error} for _ in texts]
+        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        src_nllb = self._get_nllb_lang_code(source_lang)
+        
+        # Group by forced BOS token so mixed target languages share one call
+        groups: Dict[int, List[int]] = {}
+        for i, target in enumerate(targets):
+            tgt_nllb = self._get_nllb_lang_code(target)
+            if not src_nllb or not tgt_nllb:
+                results[i] = {
+                    "success": False,
+                    "error": f"Unsupported language. Source: {source_lang}, Target: {target}"
+                }
+                continue
+            groups.setdefault(self.tokenizer.convert_tokens_to_ids(tgt_nllb), []).append(i)
+        
+        batch_count = 0
+        real_tokens = 0
+        padded_tokens = 0
+        if groups:
+            # Tokenize everything once; padding happens per bucket
+            with tokenizer_lock(self.tokenizer):
+                self.tokenizer.src_lang = src_nllb
+                encoded = self.tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+            
+            for bos_token_id, indices in groups.items():
+                lengths = [len(encoded[i]) for i in indices]
+                buckets = bucket_by_length(lengths, max_tokens_per_batch, max_batch_size)
+                plan = padding_stats(lengths, buckets)
+                batch_count += plan["batches"]
+                real_tokens += plan["real_tokens"]
+                padded_tokens += plan["padded_tokens"]
+                
+                for bucket in buckets:
+                    batch_indices = [indices[j] for j in bucket]
+                    self._generate_bucket(texts, targets, encoded, batch_indices, bos_token_id,
+                                          source_lang, src_nllb, max_length, num_beams, results)
+        
+        elapsed = time.time() - start_time
+        self.last_batch_stats = {
+            "sentences": len(texts),
+            "batches": batch_count,
+            "seconds": elapsed,
+            "sentences_per_second": len(texts) / elapsed if elapsed > 0 else 0.0,
+            "padding_ratio": (padded_tokens - real_tokens) / padded_tokens if padded_tokens else 0.0,
+        }
+        print(f"📦 Batch translated {len(texts)} texts in {batch_count} batches "
+              f"({self.last_batch_stats['sentences_per_second']:.1f} sentences/s)")
         return results
+    
+    def _generate_bucket(self, texts: List[str], targets: List[str], encoded: List[List[int]],
+                         batch_indices: List[int], bos_token_id: int, source_lang: str,
+                         src_nllb: str, max_length: int, num_beams: Optional[int],
+                         results: List[Optional[Dict]]):
+        """Translate one bucket and write results back by original index"""
+        try:
+            if self._uses_draft(num_beams):
+                # Assisted generation verifies one sequence at a time
+                decoded = [self._generate_assisted(encoded[i], bos_token_id, max_length) for i in batch_indices]
+            else:
+                decoded = self._generate_padded(encoded, batch_indices, bos_token_id, max_length, num_beams)
+            
+            tgt_nllb = self.tokenizer.convert_ids_to_tokens(bos_token_id)
+            for i, translated_text in zip(batch_indices, decoded):
+                results[i] = {
+                    "success": True,
+                    "translated_text": translated_text,
+                    "source_lang": source_lang,
+                    "target_lang": targets[i],
+                    "source_nllb": src_nllb,
+                    "target_nllb": tgt_nllb
+                }
+        except Exception as e:
+            for i in batch_indices:
+                results[i] = {
+                    "success": False,
+                    "error": f"Translation error: {str(e)}"
+                }
+    
+    def _generate_padded(self, encoded: List[List[int]], batch_indices: List[int], bos_token_id: int,
+                         max_length: int, num_beams: Optional[int]) -> List[str]:
+        """Translate one bucket with a single padded generate call"""
+        batch = self.tokenizer.pad(
+            {"input_ids": [encoded[i] for i in batch_indices]},
+            return_tensors="pt"
+        ).to(self.model.device)
+        
+        generate_kwargs = {"forced_bos_token_id": bos_token_id, "max_length": max_length}
+        if num_beams is not None:
+            generate_kwargs["num_beams"] = num_beams
+        
+        with torch.inference_mode():
+            generated = self.model.generate(**batch, **generate_kwargs)
+        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
 
 # 🎯 TESTED AND WORKING EXAMPLES
 
@@ -280,6 +602,16 @@ def interactive_translator():
 
 # 🚀 SIMPLE ONE-LINER FUNCTIONS
 
+def get_translator(model_size: str = "facebook/nllb-200-distilled-600M", device: str = "auto",
+                   draft_model_size: Optional[str] = None) -> UniversalTranslator:
+    """Get the shared UniversalTranslator for a model/device (created on first call)"""
+    if device == "auto":
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    return get_registry().get(
+        ("UniversalTranslator", model_size, device, draft_model_size),
+        lambda: UniversalTranslator(model_size=model_size, device=device, draft_model_size=draft_model_size)
+    )
+
 def translate_text(text: str, source_lang: str, target_lang: str) -> str:
     """
     Simple translation function - Just import and use!
@@ -288,7 +620,7 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         translate_text("Hello", "en", "es") → "Hola"
         translate_text("नमस्ते", "hi", "en") → "Hello"
     """
-    translator = UniversalTranslator(model_size="facebook/nllb-200-distilled-600M")
+    translator = get_translator("facebook/nllb-200-distilled-600M")
     result = translator.translate(text, source_lang, target_lang)
     return result["translated_text"] if result["success"] else f"Error: {result['error']}"
 
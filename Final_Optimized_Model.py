@@ -1,41 +1,114 @@
-import torch
+try:
+    import torch
+except ImportError:  # ONNX Runtime / CTranslate2 deployments may ship without torch
+    torch = None
 from gtts import gTTS
 import playsound
+import json
 import os
 import tempfile
 import time
-from typing import Dict, List
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
+from typing import Dict, List, Optional, Tuple, Union
 import threading
+from translation_cache import TranslationCache
+from segmentation import split_sentences, join_sentences
+from translation_engines import create_engine
+from phrasebook import Phrasebook
+from language_id import LanguageIdentifier
+from placeholders import mask_spans, restore_spans
+from model_registry import get_registry
+from translation_metrics import TranslationMetrics
+from decoding_profiles import DecodingProfile, OPTIMIZATION_PROFILES, get_profile
+from deadlines import Deadline, DeadlineExceeded, TIMEOUT_POLICIES, deadline_expired, timeout_result
+
+def _load_language_pairs() -> List[Tuple[str, str]]:
+    """Read configured language pairs from BABEL_LANGUAGE_PAIRS (e.g. "en:es,en:hi")"""
+    configured = os.getenv("BABEL_LANGUAGE_PAIRS", "en:es,es:en,en:hi,hi:en")
+    pairs = []
+    for item in configured.split(","):
+        if ":" in item:
+            src, tgt = item.split(":", 1)
+            pairs.append((src.strip().lower(), tgt.strip().lower()))
+    return pairs
+
+# Language pairs warmed at startup so the first real request hits a cached pipeline
+DEFAULT_LANGUAGE_PAIRS = _load_language_pairs()
+
+# Checkpoint name or local directory (e.g. a vocab_trimming.py output)
+DEFAULT_MODEL = os.getenv("BABEL_TRANSLATION_MODEL", "facebook/nllb-200-distilled-600M")
+
+# Translation backend: "transformers" (PyTorch), "continuous" (PyTorch with
+# iteration-level batching), "ctranslate2" or "onnxruntime"
+DEFAULT_ENGINE = os.getenv("BABEL_TRANSLATION_ENGINE", "transformers")
+
+# Opt-in torch.compile for the PyTorch engines (long-running servers)
+DEFAULT_COMPILE = os.getenv("BABEL_TORCH_COMPILE", "false").lower() == "true"
+
+# source_lang value that asks the translator to detect the language
+AUTO_LANGUAGE = "auto"
+
+# CPU weight precision used for each optimization level
+OPTIMIZATION_PRECISION = {
+    "high": "int8",
+    "medium": "float32",
+    "low": "float32",
+}
 
 class UniversalVoiceTranslator:
-    def __init__(self, device: str = "auto", optimization_level: str = "high"):
+    def __init__(self, device: str = "auto", optimization_level: str = "high",
+                 language_pairs: Optional[List[Tuple[str, str]]] = None,
+                 cache_size: int = 10000, cache_ttl: Optional[float] = 3600,
+                 cache_path: Optional[str] = os.getenv("BABEL_TRANSLATION_CACHE"),
+                 engine: str = DEFAULT_ENGINE, engine_options: Optional[Dict] = None,
+                 model_size: str = DEFAULT_MODEL):
         """
         Initialize the optimized voice translation system
         
         Args:
             device: "cpu", "cuda", or "auto"
-            optimization_level: "high" (fastest), "medium", "low" (highest quality)
+            optimization_level: "high" (fastest), "medium", "low" (highest quality); selects
+                the decoding profile (fast / balanced / quality) and CPU weight precision
+            language_pairs: (source, target) pairs to warm up at startup
+            cache_size: Maximum in-memory cached translations
+            cache_ttl: Seconds an in-memory translation stays valid (None = forever)
+            cache_path: Optional SQLite file for translations that survive restarts
+            engine: Translation backend ("transformers", "continuous", "ctranslate2" or "onnxruntime")
+            engine_options: Extra engine settings (e.g. compute_type, inter_threads)
+            model_size: Translation checkpoint name or local directory
         """
         print("🚀 Initializing Optimized Universal Voice Translator...")
         
         # Auto-detect device
         if device == "auto":
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.device = "cuda" if torch is not None and torch.cuda.is_available() else "cpu"
         else:
             self.device = device
             
         self.optimization_level = optimization_level
+        # Shared by the translator and TTS so one snapshot covers the whole pipeline
+        self.metrics = TranslationMetrics()
         
         # Initialize components with optimized settings
-        self.tts = MultiLanguageTTS()
+        self.tts = MultiLanguageTTS(metrics=self.metrics)
+        self.translation_cache = TranslationCache(
+            max_entries=cache_size,
+            ttl_seconds=cache_ttl,
+            db_path=cache_path
+        )
         self.translator = UniversalTranslator(
-            model_size="facebook/nllb-200-distilled-600M",  # Fastest model
-            device=self.device
+            model_size=model_size,
+            device=self.device,
+            precision=OPTIMIZATION_PRECISION.get(optimization_level, "float32"),
+            engine=engine,
+            engine_options=engine_options,
+            decoding_profile=OPTIMIZATION_PROFILES.get(optimization_level),
+            warmup_pairs=language_pairs,
+            translation_cache=self.translation_cache,
+            metrics=self.metrics
         )
         
         print(f"✅ Optimized Universal Voice Translator ready on {self.device.upper()}!")
-        print(f"⚡ Optimization level: {optimization_level}")
+        print(f"⚡ Optimization level: {optimization_level} ({self.translator.decoding_profile.name} decoding)")
     
     def text_to_voice_translation(self, text: str, source_lang: str, target_lang: str):
         """
@@ -53,8 +126,11 @@ class UniversalVoiceTranslator:
             return None
         
         target_text = translation["translated_text"]
-        translate_time = time.time() - start_time
+        detection_time = translation.get("detection_time", 0.0)
+        translate_time = time.time() - start_time - detection_time
         print(f"Translation: {target_text}")
+        if "detected_lang" in translation:
+            print(f"🔎 Detected {translation['detected_lang']} in {detection_time * 1000:.1f}ms")
         print(f"⏱️  Translation time: {translate_time:.2f}s")
         
         # Speak asynchronously
@@ -66,7 +142,8 @@ class UniversalVoiceTranslator:
         return {
             "translated_text": target_text,
             "translation_time": translate_time,
-            "source_lang": source_lang,
+            "detection_time": detection_time,
+            "source_lang": translation["source_lang"],
             "target_lang": target_lang
         }
     
@@ -74,22 +151,31 @@ class UniversalVoiceTranslator:
         """
         Text-only translation without TTS
         Useful for frontend that handles its own speech synthesis
+        
+        source_lang may be "auto" to detect the language of the text.
         """
         print(f"📝 Text Translation: {source_lang} → {target_lang}")
         
         start_time = time.time()
         translation = self.translator.translate_fast(text, source_lang, target_lang)
-        translate_time = time.time() - start_time
+        # Language detection (source_lang="auto") is timed on its own
+        detection_time = translation.get("detection_time", 0.0)
+        translate_time = time.time() - start_time - detection_time
         
         if translation["success"]:
+            if "detected_lang" in translation:
+                print(f"🔎 Detected {translation['detected_lang']} in {detection_time * 1000:.1f}ms")
             print(f"✅ Translation completed in {translate_time:.2f}s")
             return {
                 "success": True,
                 "source_text": text,
                 "translated_text": translation["translated_text"],
-                "source_lang": source_lang,
+                "source_lang": translation["source_lang"],
                 "target_lang": target_lang,
-                "translation_time": translate_time
+                "translation_time": translate_time,
+                "detection_time": detection_time,
+                "cached": translation.get("cached", False),
+                "same_language": translation.get("same_language", False)
             }
         else:
             print(f"❌ Translation failed: {translation['error']}")
@@ -112,21 +198,28 @@ class UniversalVoiceTranslator:
         }
     
     def get_performance_info(self) -> Dict:
-        """Get performance information"""
-        return {
+        """
+        Get measured performance information
+        
+        Rolling per-stage latency percentiles, token throughput, cache hit
+        rates and model load/warm-up times (see UniversalTranslator.get_metrics).
+        """
+        info = {
             "device": self.device,
             "optimization_level": self.optimization_level,
-            "translation_model": "NLLB-200 Distilled 600M (fastest)",
-            "expected_translation_speed": "3-8x faster than original",
+            "decoding_profile": self.translator.decoding_profile.cache_settings(),
             "supported_translation_languages": len(self.translator.get_supported_languages()),
-            "supported_tts_languages": len(self.tts.supported_languages)
+            "supported_tts_languages": len(self.tts.supported_languages),
         }
+        info.update(self.translator.get_metrics())
+        return info
 
 # OPTIMIZED COMPONENTS
 
 class MultiLanguageTTS:
-    def __init__(self):
-        """Initialize optimized TTS"""
+    def __init__(self, metrics: Optional[TranslationMetrics] = None):
+        """Initialize optimized TTS (synthesis and playback are timed into metrics)"""
+        self.metrics = metrics if metrics is not None else TranslationMetrics()
         self.supported_languages = {
             'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German',
             'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
@@ -144,13 +237,15 @@ class MultiLanguageTTS:
             lang = 'en'
         
         try:
-            tts = gTTS(text=text, lang=lang, slow=slow)
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                temp_filename = tmp_file.name
-            
-            tts.save(temp_filename)
-            playsound.playsound(temp_filename)
+            with self.metrics.time("tts"):
+                tts = gTTS(text=text, lang=lang, slow=slow)
+                
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
+                    temp_filename = tmp_file.name
+                
+                tts.save(temp_filename)
+            with self.metrics.time("playback"):
+                playsound.playsound(temp_filename)
             os.unlink(temp_filename)
             
             return True
@@ -159,56 +254,155 @@ class MultiLanguageTTS:
             return False
 
 class UniversalTranslator:
-    def __init__(self, model_size: str = "facebook/nllb-200-distilled-600M", device: str = "auto"):
-        """Optimized translator"""
-        print(f"🚀 Loading Optimized Translator ({model_size})...")
+    def __init__(self, model_size: str = DEFAULT_MODEL, device: str = "auto",
+                 precision: str = "float32",
+                 warmup_pairs: Optional[List[Tuple[str, str]]] = None, pipeline_cache_size: int = 32,
+                 translation_cache: Optional[TranslationCache] = None, long_text_threshold: int = 200,
+                 engine: str = DEFAULT_ENGINE, engine_options: Optional[Dict] = None,
+                 phrasebook: Optional[Phrasebook] = None, mask_placeholders: bool = True,
+                 metrics: Optional[TranslationMetrics] = None, timeout_policy: str = "partial",
+                 decoding_profile: Optional[str] = None):
+        """
+        Optimized translator
+        
+        decoding_profile names the default DecodingProfile ("fast", "balanced",
+        "quality"; BABEL_DECODING_PROFILE when None). Every translate method
+        also takes a per-request profile.
+        
+        timeout_policy decides what a request gets when its deadline passes
+        mid-generation: "partial" returns the best hypothesis so far (marked
+        timed_out/partial), "error" returns a timeout error instead.
+        """
+        if timeout_policy not in TIMEOUT_POLICIES:
+            raise ValueError(f"Unknown timeout policy: {timeout_policy}. Use one of {TIMEOUT_POLICIES}")
+        self.decoding_profile = get_profile(decoding_profile)
+        print(f"🚀 Loading Optimized Translator ({model_size}, {engine} engine)...")
         
         if device == "auto":
-            device = "cuda" if torch.cuda.is_available() else "cpu"
+            device = "cuda" if torch is not None and torch.cuda.is_available() else "cpu"
         
         self.device = device
         self.model_size = model_size
         
-        # Faster loading with appropriate precision
-        if device == "cuda":
-            torch_dtype = torch.float16
-        else:
-            torch_dtype = torch.float32
+        options = dict(engine_options or {})
+        if engine in ("transformers", "continuous"):
+            options.setdefault("precision", precision)
+            options.setdefault("pipeline_cache_size", pipeline_cache_size)
+            options.setdefault("compile", DEFAULT_COMPILE)
+        # Latency, token and load-time counters behind get_metrics()
+        self.metrics = metrics if metrics is not None else TranslationMetrics()
+        load_start = time.perf_counter()
+        self.engine = create_engine(engine, model_size, device, options)
+        self.metrics.set_timing("model_load_seconds", time.perf_counter() - load_start)
+        self.tokenizer = self.engine.tokenizer
+        # PyTorch model, when the engine has one
+        self.model = getattr(self.engine, "model", None)
+        self.precision = getattr(self.engine, "precision", getattr(self.engine, "compute_type", None))
+        # Cached translations are only valid for the exact weights that produced them
+        self.model_id = self.engine.model_id
         
-        self.tokenizer = AutoTokenizer.from_pretrained(model_size)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(
-            model_size,
-            torch_dtype=torch_dtype,
-            device_map="auto" if device == "cuda" else None
-        )
+        self.translation_cache = translation_cache
+        # Known formulaic phrases are answered from precomputed indexes (BABEL_PHRASEBOOK_DIR)
+        self.phrasebook = phrasebook if phrasebook is not None else Phrasebook()
+        # Indexes built with other weights are ignored
+        self.phrasebook.bind(self.model_id)
+        # URLs, emails, numbers and emoji are swapped for short placeholders around the model
+        self.mask_placeholders = mask_placeholders
+        self.timeout_policy = timeout_policy
+        # Inputs longer than this (in characters) are translated sentence by sentence
+        self.long_text_threshold = long_text_threshold
+        self.language_map = self._create_language_map()
+        # Trimmed checkpoints only know the language codes they were built for
+        unknown_id = self.tokenizer.unk_token_id
+        self.language_map = {
+            lang: code for lang, code in self.language_map.items()
+            if self.tokenizer.convert_tokens_to_ids(code) != unknown_id
+        }
+        self.language_identifier = LanguageIdentifier(languages=self.get_supported_languages())
         
-        # Pre-warm the model
-        self._warm_up()
+        # Pre-warm the model; warm-up requests are not counted as traffic
+        warmup_start = time.perf_counter()
+        self._warm_up(warmup_pairs if warmup_pairs is not None else DEFAULT_LANGUAGE_PAIRS)
+        self.metrics.set_timing("warmup_seconds", time.perf_counter() - warmup_start)
+        self.metrics.reset()
         
-        self.language_map = self._create_language_map()
         print(f"✅ Optimized Translator ready on {device.upper()}!")
     
-    def _warm_up(self):
-        """Warm up the model for faster first inference"""
-        print("🔥 Warming up translation model...")
+    def _warm_up(self, pairs: List[Tuple[str, str]]):
+        """Warm up the model and pipeline cache for every configured language pair"""
+        print(f"🔥 Warming up translation model ({len(pairs)} language pairs)...")
+        for source_lang, target_lang in pairs:
+            # Same settings as translate_fast so the warmed pipeline is reused
+            result = self.translate_fast("Hello", source_lang, target_lang, use_cache=False)
+            if not result["success"]:
+                print(f"⚠️  Warm-up failed for {source_lang} → {target_lang}: {result['error']}")
+    
+    def detect_language(self, text: str) -> Dict:
+        """Identify the source language: {"language", "confidence", "seconds"}"""
+        start_time = time.perf_counter()
+        language, confidence = self.language_identifier.detect(text)
+        seconds = time.perf_counter() - start_time
+        self.metrics.record("detection", seconds)
+        return {"language": language, "confidence": confidence, "seconds": seconds}
+    
+    def translate_fast(self, text: str, source_lang: str, target_lang: str, max_length: int = 256,
+                       use_cache: bool = True, deadline: Optional[Deadline] = None,
+                       profile: Optional[str] = None) -> Dict:
+        """
+        Optimized fast translation
+        
+        source_lang="auto" detects the language first; the result then carries
+        detected_lang, detection_confidence and detection_time (seconds).
+        
+        With a deadline, a request that is already late never reaches the model,
+        and generation running past it stops early (see timeout_policy).
+        
+        profile overrides the translator's decoding profile for this request.
+        """
+        start_time = time.perf_counter()
         try:
-            # Quick warm-up translation
-            test_text = "Hello"
-            warmup_pipeline = pipeline(
-                'translation',
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang='eng_Latn',
-                tgt_lang='spa_Latn',
-                max_length=50,
-                device=0 if self.device == "cuda" else -1
-            )
-            warmup_pipeline(test_text)
-        except:
-            pass
+            decoding = self._resolve_profile(profile)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        if source_lang.lower() != AUTO_LANGUAGE:
+            result = self._translate_fast(text, source_lang, target_lang, max_length, use_cache, deadline,
+                                          decoding)
+        else:
+            detection = self.detect_language(text)
+            if detection["language"] is None:
+                result = {"success": False, "error": "Could not detect source language"}
+            else:
+                result = self._translate_fast(text, detection["language"], target_lang, max_length,
+                                              use_cache, deadline, decoding)
+            result.update(detected_lang=detection["language"], detection_confidence=detection["confidence"],
+                          detection_time=detection["seconds"])
+        result = self._apply_timeout_policy(result, deadline)
+        self.metrics.record("translate", time.perf_counter() - start_time)
+        self.metrics.record_request(result["success"])
+        return result
+    
+    def _resolve_profile(self, profile: Union[str, DecodingProfile, None]) -> DecodingProfile:
+        """Per-request profile, falling back to the translator's default"""
+        return get_profile(profile) if profile is not None else self.decoding_profile
+    
+    def _apply_timeout_policy(self, result: Dict, deadline: Optional[Deadline]) -> Dict:
+        """Mark a translation cut off by its deadline as partial, or turn it into a timeout error"""
+        if result.get("timed_out"):
+            # Dropped before reaching the model
+            self.metrics.record_timeout()
+            return result
+        # Only an output the engine actually cut short is partial; one that finished just
+        # after the deadline is a complete translation
+        if deadline is None or not deadline.cut_short or not result["success"] or result.get("cached"):
+            return result
+        self.metrics.record_timeout()
+        if self.timeout_policy == "error":
+            return timeout_result()
+        result.update(timed_out=True, partial=True)
+        return result
     
-    def translate_fast(self, text: str, source_lang: str, target_lang: str, max_length: int = 256) -> Dict:
-        """Optimized fast translation"""
+    def _translate_fast(self, text: str, source_lang: str, target_lang: str, max_length: int,
+                        use_cache: bool, deadline: Optional[Deadline], decoding: DecodingProfile) -> Dict:
         try:
             src_nllb = self.language_map.get(source_lang.lower())
             tgt_nllb = self.language_map.get(target_lang.lower())
@@ -216,29 +410,504 @@ class UniversalTranslator:
             if not src_nllb or not tgt_nllb:
                 return {"success": False, "error": "Unsupported language"}
             
-            # Use optimized pipeline settings
-            translator = pipeline(
-                'translation',
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang=src_nllb,
-                tgt_lang=tgt_nllb,
-                max_length=max_length,  # Shorter for speed
-                num_beams=3,  # Fewer beams for speed
-                device=0 if self.device == "cuda" else -1
-            )
+            known = self._known_translation(text, source_lang, target_lang, src_nllb, tgt_nllb, use_cache,
+                                            decoding)
+            if known is not None:
+                return known
+            
+            # Long multi-sentence inputs would be truncated or decode slowly in one beam search
+            if self._is_long(text):
+                return self.translate_long(text, source_lang, target_lang, max_length, use_cache=use_cache,
+                                           deadline=deadline, profile=decoding)
             
-            result = translator(text)
+            masked_text, spans = self._mask(text)
+            cache_key, cached_text = self._cached_translation(masked_text, spans, src_nllb, tgt_nllb,
+                                                              max_length, use_cache, decoding)
+            if cached_text is not None:
+                return {
+                    "success": True,
+                    "translated_text": cached_text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "cached": True
+                }
+            
+            translated_text, cacheable = self._translate_masked(
+                [text], [(masked_text, spans)], src_nllb, tgt_nllb, max_length, decoding, deadline=deadline
+            )[0]
+            if translated_text is None:
+                return timeout_result()
+            if cache_key is not None and cacheable is not None:
+                self.translation_cache.put(cache_key, cacheable)
             return {
                 "success": True,
-                "translated_text": result[0]['translation_text'],
+                "translated_text": translated_text,
                 "source_lang": source_lang,
-                "target_lang": target_lang
+                "target_lang": target_lang,
+                "cached": False
             }
             
+        except DeadlineExceeded:
+            return timeout_result()
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    def _known_translation(self, text: str, source_lang: str, target_lang: str, src_nllb: str, tgt_nllb: str,
+                           use_cache: bool, decoding: DecodingProfile) -> Optional[Dict]:
+        """Result for text that needs no model call: already in the target language, or a phrasebook entry"""
+        # Text already in the target language needs no decode at all
+        if src_nllb == tgt_nllb:
+            return {
+                "success": True,
+                "translated_text": text,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "cached": False,
+                "same_language": True
+            }
+        if use_cache:
+            phrase_translation = self.phrasebook.lookup(text, src_nllb, tgt_nllb, decoding.name)
+            if phrase_translation is not None:
+                return {
+                    "success": True,
+                    "translated_text": phrase_translation,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "cached": True,
+                    "phrasebook": True
+                }
+        return None
+    
+    def _cached_translation(self, masked_text: str, spans: List[str], src_nllb: str, tgt_nllb: str,
+                            max_length: int, use_cache: bool,
+                            decoding: DecodingProfile) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Memo cache lookup for masked text
+        
+        Returns (cache key to store the new translation under, restored cached
+        translation or None). Keys use the masked text, so "call me at [0]"
+        hits regardless of the number.
+        """
+        if not use_cache or self.translation_cache is None:
+            return None, None
+        cache_key = self.translation_cache.make_key(
+            masked_text, src_nllb, tgt_nllb, self.model_id, max_length=max_length, **decoding.cache_settings()
+        )
+        cached_text = self.translation_cache.get(cache_key)
+        return cache_key, restore_spans(cached_text, spans) if cached_text is not None else None
+    
+    def _is_long(self, text: str) -> bool:
+        """Multi-sentence text long enough to go through translate_long"""
+        return len(text) > self.long_text_threshold and len(split_sentences(text)) > 1
+    
+    def translate_long(self, text: str, source_lang: str, target_lang: str, max_length: int = 256,
+                       batch_size: int = 16, use_cache: bool = True, deadline: Optional[Deadline] = None,
+                       profile: Union[str, DecodingProfile, None] = None) -> Dict:
+        """
+        Long-text translation: split into sentences, translate them as one batch
+        and reassemble with the original whitespace and paragraph breaks
+        """
+        try:
+            decoding = self._resolve_profile(profile)
+            src_nllb = self.language_map.get(source_lang.lower())
+            tgt_nllb = self.language_map.get(target_lang.lower())
+            
+            if not src_nllb or not tgt_nllb:
+                return {"success": False, "error": "Unsupported language"}
+            
+            pieces = split_sentences(text)
+            sentences = [sentence for sentence, _ in pieces if sentence]
+            translations = self._translate_sentences(
+                sentences, src_nllb, tgt_nllb, max_length, batch_size, use_cache, decoding, deadline
+            )
+            if sentences and all(translation is None for translation in translations):
+                return timeout_result()
+            # Sentences the deadline dropped are left out of a partial translation
+            translations = iter(translations)
+            translated_text = join_sentences(
+                [(next(translations) or "") if sentence else "" for sentence, _ in pieces], pieces
+            )
+            return {
+                "success": True,
+                "translated_text": translated_text,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                "sentences": len(sentences),
+                "cached": False
+            }
+            
+        except DeadlineExceeded:
+            return timeout_result()
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def translate_multi(self, text: str, source_lang: str, target_langs: List[str],
+                        max_length: int = 256, use_cache: bool = True, deadline: Optional[Deadline] = None,
+                        profile: Optional[str] = None) -> Dict:
+        """
+        Fan-out translation: one source text into several target languages
+        
+        Each target is prepared as in translate_fast (auto detection, masking,
+        same-language, phrasebook and cache), then all remaining targets are
+        decoded together in one engine call. The Transformers and ONNX Runtime
+        engines also run the encoder once for every target; CTranslate2
+        repeats the source per target row within that call.
+        
+        Returns:
+            {"success", "source_lang", "translations": {target_lang: text}, "errors": {target_lang: error},
+             "partial": [target_lang cut off by the deadline]}, plus the detection fields of
+            translate_fast for source_lang="auto"
+        """
+        start_time = time.perf_counter()
+        try:
+            decoding = self._resolve_profile(profile)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        detection = None
+        if source_lang.lower() == AUTO_LANGUAGE:
+            detection = self.detect_language(text)
+            source_lang = detection["language"]
+        
+        if source_lang is None:
+            results = {target_lang: {"success": False, "error": "Could not detect source language"}
+                       for target_lang in dict.fromkeys(target_langs)}
+        else:
+            results = self._translate_multi(text, source_lang, target_langs, max_length, use_cache, deadline,
+                                            decoding)
+        
+        multi = {"success": False, "source_lang": source_lang, "translations": {}, "errors": {}, "partial": []}
+        for target_lang, result in results.items():
+            result = self._apply_timeout_policy(result, deadline)
+            self.metrics.record_request(result["success"])
+            if result["success"]:
+                multi["translations"][target_lang] = result["translated_text"]
+                if result.get("partial"):
+                    multi["partial"].append(target_lang)
+            else:
+                multi["errors"][target_lang] = result["error"]
+        multi["success"] = bool(multi["translations"])
+        if detection is not None:
+            multi.update(detected_lang=detection["language"], detection_confidence=detection["confidence"],
+                         detection_time=detection["seconds"])
+        self.metrics.record("translate_multi", time.perf_counter() - start_time)
+        return multi
+    
+    def _translate_multi(self, text: str, source_lang: str, target_langs: List[str], max_length: int,
+                         use_cache: bool, deadline: Optional[Deadline], decoding: DecodingProfile) -> Dict[str, Dict]:
+        """One translate_fast-shaped result per distinct target language"""
+        src_nllb = self.language_map.get(source_lang.lower())
+        results: Dict[str, Dict] = {}
+        pending: List[Tuple[str, str, Optional[str]]] = []
+        masked_text, spans = self._mask(text)
+        for target_lang in dict.fromkeys(target_langs):
+            tgt_nllb = self.language_map.get(target_lang.lower())
+            if not src_nllb or not tgt_nllb:
+                results[target_lang] = {"success": False, "error": "Unsupported language"}
+                continue
+            known = self._known_translation(text, source_lang, target_lang, src_nllb, tgt_nllb, use_cache,
+                                            decoding)
+            if known is not None:
+                results[target_lang] = known
+                continue
+            if self._is_long(text):
+                # Long inputs go through sentence batching for each target instead
+                results[target_lang] = self.translate_long(text, source_lang, target_lang, max_length,
+                                                           use_cache=use_cache, deadline=deadline,
+                                                           profile=decoding)
+                continue
+            cache_key, cached_text = self._cached_translation(masked_text, spans, src_nllb, tgt_nllb,
+                                                              max_length, use_cache, decoding)
+            if cached_text is not None:
+                results[target_lang] = {
+                    "success": True,
+                    "translated_text": cached_text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "cached": True
+                }
+                continue
+            pending.append((target_lang, tgt_nllb, cache_key))
+        
+        if pending:
+            try:
+                outputs = self._translate_masked_multi(
+                    text, masked_text, spans, src_nllb, [tgt_nllb for _, tgt_nllb, _ in pending],
+                    max_length, decoding, deadline
+                )
+                for (target_lang, _, cache_key), (translated_text, cacheable) in zip(pending, outputs):
+                    if translated_text is None:
+                        results[target_lang] = timeout_result()
+                        continue
+                    if cache_key is not None and cacheable is not None:
+                        self.translation_cache.put(cache_key, cacheable)
+                    results[target_lang] = {
+                        "success": True,
+                        "translated_text": translated_text,
+                        "source_lang": source_lang,
+                        "target_lang": target_lang,
+                        "cached": False
+                    }
+            except DeadlineExceeded:
+                for target_lang, _, _ in pending:
+                    results[target_lang] = timeout_result()
+            except Exception as e:
+                for target_lang, _, _ in pending:
+                    results[target_lang] = {"success": False, "error": str(e)}
+        
+        # Keep the caller's order of targets
+        return {target_lang: results[target_lang] for target_lang in dict.fromkeys(target_langs)}
+    
+    def translate_many(self, texts: List[str], source_lang: str, target_lang: str,
+                       max_length: int = 256, batch_size: int = 16, use_cache: bool = True,
+                       deadline: Optional[Deadline] = None,
+                       profile: Union[str, DecodingProfile, None] = None) -> List[Dict]:
+        """
+        Translate independent texts for one language pair in a single batched call
+        
+        Returns one result dict per text, in order (same shape as translate_fast)
+        """
+        try:
+            decoding = self._resolve_profile(profile)
+        except ValueError as e:
+            return [{"success": False, "error": str(e)} for _ in texts]
+        if source_lang.lower() == AUTO_LANGUAGE:
+            return self._translate_many_detected(texts, target_lang, max_length, batch_size, use_cache,
+                                                 deadline, decoding)
+        
+        start_time = time.perf_counter()
+        results = self._translate_many(texts, source_lang, target_lang, max_length, batch_size, use_cache,
+                                       deadline, decoding)
+        results = [self._apply_timeout_policy(result, deadline) for result in results]
+        self.metrics.record("translate_batch", time.perf_counter() - start_time)
+        for result in results:
+            self.metrics.record_request(result["success"])
+        return results
+    
+    def _translate_many(self, texts: List[str], source_lang: str, target_lang: str, max_length: int,
+                        batch_size: int, use_cache: bool, deadline: Optional[Deadline],
+                        decoding: DecodingProfile) -> List[Dict]:
+        src_nllb = self.language_map.get(source_lang.lower())
+        tgt_nllb = self.language_map.get(target_lang.lower())
+        if not src_nllb or not tgt_nllb:
+            return [{"success": False, "error": "Unsupported language"} for _ in texts]
+        if src_nllb == tgt_nllb:
+            return [{"success": True, "translated_text": text, "source_lang": source_lang,
+                     "target_lang": target_lang, "same_language": True} for text in texts]
+        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        short = []
+        for i, text in enumerate(texts):
+            if self._is_long(text):
+                results[i] = self.translate_long(text, source_lang, target_lang, max_length,
+                                                 batch_size, use_cache, deadline, decoding)
+            else:
+                short.append(i)
+        
+        if short:
+            try:
+                translations = self._translate_sentences(
+                    [texts[i] for i in short], src_nllb, tgt_nllb, max_length, batch_size, use_cache,
+                    decoding, deadline
+                )
+                for i, translated_text in zip(short, translations):
+                    if translated_text is None:
+                        results[i] = timeout_result()
+                        continue
+                    results[i] = {
+                        "success": True,
+                        "translated_text": translated_text,
+                        "source_lang": source_lang,
+                        "target_lang": target_lang
+                    }
+            except DeadlineExceeded:
+                for i in short:
+                    results[i] = timeout_result()
+            except Exception as e:
+                for i in short:
+                    results[i] = {"success": False, "error": str(e)}
+        
+        return results
+    
+    def _translate_many_detected(self, texts: List[str], target_lang: str, max_length: int,
+                                 batch_size: int, use_cache: bool, deadline: Optional[Deadline],
+                                 decoding: DecodingProfile) -> List[Dict]:
+        """translate_many for source_lang="auto": detect each text, then batch per detected language"""
+        detections = [self.detect_language(text) for text in texts]
+        results: List[Dict] = [{"success": False, "error": "Could not detect source language"} for _ in texts]
+        groups: Dict[str, List[int]] = {}
+        for i, detection in enumerate(detections):
+            if detection["language"] is not None:
+                groups.setdefault(detection["language"], []).append(i)
+        
+        for language, indices in groups.items():
+            outputs = self.translate_many([texts[i] for i in indices], language, target_lang,
+                                          max_length, batch_size, use_cache, deadline, decoding)
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        for result, detection in zip(results, detections):
+            result.update(detected_lang=detection["language"], detection_confidence=detection["confidence"],
+                          detection_time=detection["seconds"])
+        return results
+    
+    def _translate_sentences(self, sentences: List[str], src_nllb: str, tgt_nllb: str,
+                             max_length: int, batch_size: int, use_cache: bool,
+                             decoding: DecodingProfile, deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+        """
+        Translate sentences in batches, serving known phrases and repeats without the model
+        
+        Sentences the deadline dropped before any text was decoded come back as None.
+        """
+        results: List[Optional[str]] = [None] * len(sentences)
+        cache_keys: List[Optional[str]] = [None] * len(sentences)
+        masked = [self._mask(sentence) for sentence in sentences]
+        pending = []
+        
+        for i, sentence in enumerate(sentences):
+            if use_cache:
+                results[i] = self.phrasebook.lookup(sentence, src_nllb, tgt_nllb, decoding.name)
+            if results[i] is None:
+                cache_keys[i], results[i] = self._cached_translation(masked[i][0], masked[i][1], src_nllb,
+                                                                     tgt_nllb, max_length, use_cache, decoding)
+            if results[i] is None:
+                pending.append(i)
+        
+        if pending:
+            # Similar lengths side by side keep padding low inside each batch
+            pending.sort(key=lambda i: len(masked[i][0]))
+            outputs = self._translate_masked(
+                [sentences[i] for i in pending], [masked[i] for i in pending],
+                src_nllb, tgt_nllb, max_length, decoding, batch_size, deadline
+            )
+            for i, (translated_text, cacheable) in zip(pending, outputs):
+                results[i] = translated_text
+                if cache_keys[i] is not None and cacheable is not None:
+                    self.translation_cache.put(cache_keys[i], cacheable)
+        
+        return results
+    
+    def _mask(self, text: str) -> Tuple[str, List[str]]:
+        """Placeholder-masked text and the spans it replaced (unchanged when masking is off)"""
+        return mask_spans(text) if self.mask_placeholders else (text, [])
+    
+    def _translate_masked(self, texts: List[str], masked: List[Tuple[str, List[str]]], src_nllb: str,
+                          tgt_nllb: str, max_length: int, decoding: DecodingProfile, batch_size: int = 16,
+                          deadline: Optional[Deadline] = None) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Translate masked texts and restore their spans
+        
+        Returns (translation, masked translation to cache) per text. Outputs that
+        dropped or mangled a placeholder are retranslated from the original text
+        and not cached. Hypotheses cut off by the deadline are never cached or
+        retranslated, and texts dropped before any of them was decoded come
+        back as (None, None). Raises DeadlineExceeded if the deadline passed
+        before the model call.
+        """
+        if deadline_expired(deadline):
+            raise DeadlineExceeded()
+        inputs = [masked_text for masked_text, _ in masked]
+        input_lengths = self._token_lengths(inputs)
+        # The output cap follows the longest input of the call
+        settings = decoding.engine_settings(max(input_lengths), max_length)
+        start_time = time.perf_counter()
+        outputs = self.engine.translate_batch(
+            inputs, src_nllb, tgt_nllb, max_length=max_length, num_beams=decoding.num_beams,
+            batch_size=batch_size, deadline=deadline, decoding=settings
+        )
+        seconds = time.perf_counter() - start_time
+        self.metrics.record("model", seconds)
+        self.metrics.record_generation(sum(input_lengths), sum(self._token_lengths(outputs)), seconds)
+        
+        def retranslate(retry: List[int]) -> List[str]:
+            retry_texts = [texts[i] for i in retry]
+            return self.engine.translate_batch(
+                retry_texts, src_nllb, tgt_nllb, max_length=max_length, num_beams=decoding.num_beams,
+                batch_size=batch_size, deadline=deadline,
+                decoding=decoding.engine_settings(max(self._token_lengths(retry_texts)), max_length)
+            )
+        
+        return self._restore_outputs(outputs, [spans for _, spans in masked], deadline, retranslate)
+    
+    def _translate_masked_multi(self, text: str, masked_text: str, spans: List[str], src_nllb: str,
+                                tgt_nllbs: List[str], max_length: int, decoding: DecodingProfile,
+                                deadline: Optional[Deadline] = None) -> List[Tuple[Optional[str], Optional[str]]]:
+        """_translate_masked for one text into several target languages"""
+        if deadline_expired(deadline):
+            raise DeadlineExceeded()
+        input_length = self._token_lengths([masked_text])[0]
+        start_time = time.perf_counter()
+        outputs = self.engine.translate_multi_target(
+            masked_text, src_nllb, tgt_nllbs, max_length=max_length, num_beams=decoding.num_beams,
+            deadline=deadline, decoding=decoding.engine_settings(input_length, max_length)
+        )
+        seconds = time.perf_counter() - start_time
+        self.metrics.record("model", seconds)
+        self.metrics.record_generation(input_length * len(tgt_nllbs), sum(self._token_lengths(outputs)), seconds)
+        
+        def retranslate(retry: List[int]) -> List[str]:
+            return self.engine.translate_multi_target(
+                text, src_nllb, [tgt_nllbs[i] for i in retry], max_length=max_length,
+                num_beams=decoding.num_beams, deadline=deadline,
+                decoding=decoding.engine_settings(self._token_lengths([text])[0], max_length)
+            )
+        
+        return self._restore_outputs(outputs, [spans] * len(tgt_nllbs), deadline, retranslate)
+    
+    def _restore_outputs(self, outputs: List[Optional[str]], spans: List[List[str]], deadline: Optional[Deadline],
+                         retranslate) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Restore placeholders into model outputs; retranslate(indices) redoes the failed ones unmasked
+        
+        Returns (translation, masked translation to cache) per output. When the
+        deadline cut decoding short, an output with no text (dropped by the
+        engine, or stopped right after the language code) comes back as
+        (None, None) so it is reported as a timeout rather than an empty success.
+        """
+        if deadline is not None and deadline.cut_short:
+            return [(restore_spans(output, output_spans, partial=True), None) if output else (None, None)
+                    for output, output_spans in zip(outputs, spans)]
+        results: List[Optional[Tuple[str, Optional[str]]]] = []
+        retry = []
+        for i, (output, output_spans) in enumerate(zip(outputs, spans)):
+            restored = restore_spans(output, output_spans)
+            if restored is None:
+                retry.append(i)
+            results.append((restored, output) if restored is not None else None)
+        
+        if retry:
+            for i, output in zip(retry, retranslate(retry)):
+                results[i] = (output, None)
+        return results
+    
+    def _token_lengths(self, texts: List[Optional[str]]) -> List[int]:
+        """Subword tokens per text (without language/EOS markers); dropped outputs (None) count as 0"""
+        return [len(ids) for ids in self.tokenizer([text or "" for text in texts],
+                                                   add_special_tokens=False)["input_ids"]]
+    
+    def get_metrics(self) -> Dict:
+        """
+        Live metrics snapshot for the CLI and HTTP exporters
+        
+        Stage latencies (p50/p95/p99 over a rolling window), token counts and
+        throughput, cache/phrasebook hit rates, and model load/warm-up times.
+        """
+        metrics = self.metrics.snapshot()
+        metrics.update({
+            "translation_model": self.model_size,
+            "precision": self.precision,
+            "decoding_profile": self.decoding_profile.name,
+            "engine": self.engine.get_info(),
+            "pipeline_cache": self.get_cache_stats(),
+            "translation_cache": self.translation_cache.stats() if self.translation_cache is not None else {},
+            "phrasebook": self.phrasebook.stats(),
+            "language_id": self.language_identifier.stats(),
+        })
+        return metrics
+    
+    def get_cache_stats(self) -> Dict:
+        """Get pipeline cache hit/miss counters (empty for engines without pipelines)"""
+        pipeline_cache = getattr(self.engine, "pipeline_cache", None)
+        return pipeline_cache.stats() if pipeline_cache is not None else {}
+    
     def translate(self, text: str, source_lang: str, target_lang: str, max_length: int = 512) -> Dict:
         """Standard translation (higher quality)"""
         return self.translate_fast(text, source_lang, target_lang, max_length)
@@ -289,13 +958,26 @@ def interactive_translator():
     else:
         device = "auto"
     
-    translator = UniversalVoiceTranslator(device=device, optimization_level=optimization)
+    # Engine selection (defaults to BABEL_TRANSLATION_ENGINE)
+    engine_choice = input(f"Engine (1=Transformers, 2=CTranslate2, 3=ONNX Runtime, "
+                          f"4=Continuous batching, Enter={DEFAULT_ENGINE}): ").strip()
+    if engine_choice == "1":
+        engine = "transformers"
+    elif engine_choice == "2":
+        engine = "ctranslate2"
+    elif engine_choice == "3":
+        engine = "onnxruntime"
+    elif engine_choice == "4":
+        engine = "continuous"
+    else:
+        engine = DEFAULT_ENGINE
+    
+    translator = UniversalVoiceTranslator(device=device, optimization_level=optimization, engine=engine)
     
     # Show performance info
     perf_info = translator.get_performance_info()
     print(f"\n⚡ Performance Configuration:")
-    for k, v in perf_info.items():
-        print(f"  {k}: {v}")
+    print(json.dumps(perf_info, indent=2, default=str))
     
     print("\nType 'quit' to exit")
     print("Type 'perf' to show performance info")
@@ -313,8 +995,7 @@ def interactive_translator():
         
         if choice.lower() == "perf":
             info = translator.get_performance_info()
-            for k, v in info.items():
-                print(f"{k}: {v}")
+            print(json.dumps(info, indent=2, default=str))
             continue
         elif choice.lower() == "lang":
             langs = translator.get_supported_languages()
@@ -325,7 +1006,7 @@ def interactive_translator():
             
         if choice == "1":
             text = input("Enter text to translate: ").strip()
-            src_lang = input("Source language (e.g., en, es, hi): ").strip()
+            src_lang = input("Source language (e.g., en, es, hi, auto): ").strip()
             tgt_lang = input("Target language (e.g., en, es, hi): ").strip()
             
             result = translator.text_to_voice_translation(text, src_lang, tgt_lang)
@@ -334,7 +1015,7 @@ def interactive_translator():
             
         elif choice == "2":
             text = input("Enter text to translate: ").strip()
-            src_lang = input("Source language (e.g., en, es, hi): ").strip()
+            src_lang = input("Source language (e.g., en, es, hi, auto): ").strip()
             tgt_lang = input("Target language (e.g., en, es, hi): ").strip()
             
             result = translator.translate_text_only(text, src_lang, tgt_lang)
@@ -359,9 +1040,14 @@ def interactive_translator():
             print("❌ Invalid choice!")
 
 # API-like functions for integration with frontend
-def create_translator_api(device="auto", optimization="high"):
-    """Create a translator instance for API use"""
-    return UniversalVoiceTranslator(device=device, optimization_level=optimization)
+def create_translator_api(device="auto", optimization="high", engine=DEFAULT_ENGINE, engine_options=None):
+    """Get the shared translator instance for API use (created on first call)"""
+    key = ("UniversalVoiceTranslator", device, optimization, engine,
+           tuple(sorted((engine_options or {}).items())))
+    return get_registry().get(key, lambda: UniversalVoiceTranslator(
+        device=device, optimization_level=optimization,
+        engine=engine, engine_options=engine_options
+    ))
 
 if __name__ == "__main__":
     interactive_translator()
\ No newline at end of file
@@ -27,7 +27,28 @@ class Config:
     # Translation settings
     DEFAULT_SOURCE_LANG: str = "en"
     DEFAULT_TARGET_LANG: str = "es"
-    TRANSLATION_TIMEOUT: int = 10
+    # Seconds a translation may take, queueing included; later requests are dropped or cut short
+    TRANSLATION_TIMEOUT: float = float(os.getenv("TRANSLATION_TIMEOUT", "10"))
+    # At the timeout: "partial" sends the hypothesis decoded so far, "error" reports a failure
+    TRANSLATION_TIMEOUT_POLICY: str = os.getenv("TRANSLATION_TIMEOUT_POLICY", "partial")
+    # Decoding profile for new sessions: "fast", "balanced" or "quality" (clients may switch per session)
+    DECODING_PROFILE: str = os.getenv("DECODING_PROFILE", "balanced")
+    TRANSLATION_MODEL: str = os.getenv("TRANSLATION_MODEL", "facebook/nllb-200-distilled-600M")
+    # "transformers", "continuous", "ctranslate2", "onnxruntime" or "none" (echo source text without a model);
+    # "ctranslate2" needs the optional ctranslate2 package and falls back to "transformers" without it
+    TRANSLATION_ENGINE: str = os.getenv("TRANSLATION_ENGINE", "transformers")
+    TRANSLATION_DEVICE: str = os.getenv("TRANSLATION_DEVICE", "auto")
+    CT2_COMPUTE_TYPE: str = os.getenv("CT2_COMPUTE_TYPE", "int8")
+    CT2_INTER_THREADS: int = int(os.getenv("CT2_INTER_THREADS", "1"))
+    CT2_INTRA_THREADS: int = int(os.getenv("CT2_INTRA_THREADS", "0"))
+    # torch.compile the PyTorch engines ("transformers"/"continuous"); compiles at startup
+    TRANSLATION_COMPILE: bool = os.getenv("TRANSLATION_COMPILE", "false").lower() == "true"
+    ONNX_MODEL_DIR: str = os.getenv("ONNX_MODEL_DIR", "")
+    ONNX_QUANTIZED: bool = os.getenv("ONNX_QUANTIZED", "true").lower() == "true"
+    # Micro-batching: wait this long for concurrent requests to join a batch
+    # (with the "continuous" engine, TRANSLATION_MAX_BATCH_SIZE caps the running decode batch)
+    TRANSLATION_BATCH_WAIT_MS: float = float(os.getenv("TRANSLATION_BATCH_WAIT_MS", "5"))
+    TRANSLATION_MAX_BATCH_SIZE: int = int(os.getenv("TRANSLATION_MAX_BATCH_SIZE", "16"))
     
     # WebSocket settings
     WS_HEARTBEAT_INTERVAL: int = 30
@@ -65,6 +86,26 @@ class Config:
         print(f"   - Temp audio directory: {os.path.abspath(cls.TEMP_AUDIO_DIR)}")
         print(f"   - Server will run on: http://{cls.HOST}:{cls.PORT}")
     
+    @classmethod
+    def get_engine_options(cls) -> Dict:
+        """Engine-specific settings for the configured translation engine"""
+        if cls.TRANSLATION_ENGINE == "ctranslate2":
+            return {
+                "compute_type": cls.CT2_COMPUTE_TYPE,
+                "inter_threads": cls.CT2_INTER_THREADS,
+                "intra_threads": cls.CT2_INTRA_THREADS,
+            }
+        if cls.TRANSLATION_ENGINE == "continuous":
+            return {"max_running": cls.TRANSLATION_MAX_BATCH_SIZE, "compile": cls.TRANSLATION_COMPILE}
+        if cls.TRANSLATION_ENGINE == "transformers":
+            return {"compile": cls.TRANSLATION_COMPILE}
+        if cls.TRANSLATION_ENGINE == "onnxruntime":
+            return {
+                "model_dir": cls.ONNX_MODEL_DIR or None,
+                "quantized": cls.ONNX_QUANTIZED,
+            }
+        return {}
+    
     @classmethod
     def get_supported_languages(cls) -> Dict[str, str]:
         """Get supported languages for translation"""
@@ -1,13 +1,27 @@
 import asyncio
 import base64
 import io
+import json
 import uuid
 import os
+import sys
 from aiohttp import web
 import socketio
 import speech_recognition as sr
 from gtts import gTTS
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+# The translator lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from translation_scheduler import TranslationScheduler
+from translation_metrics import TranslationMetrics, to_prometheus
+from deadlines import Deadline
+from decoding_profiles import PROFILES
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +31,7 @@ class ClientSession:
         self.user_id = user_id
         self.source_language = 'en'
         self.target_language = 'es'
+        self.decoding_profile = Config.DECODING_PROFILE
         self.connected_at = asyncio.get_event_loop().time()
         self.last_activity = asyncio.get_event_loop().time()
 
@@ -31,6 +46,11 @@ class VoiceTranslationServer:
         self.sio.attach(self.app)
         self.sessions = {}
         self.recognizer = sr.Recognizer()
+        self.translator = None
+        self.scheduler = None
+        self.translation_executor = None
+        # Per-stage latency of the audio pipeline (speech recognition, translation, TTS)
+        self.metrics = TranslationMetrics()
         
     async def initialize(self):
         """Initialize server components"""
@@ -40,6 +60,22 @@ class VoiceTranslationServer:
         if not os.path.exists('temp_audio'):
             os.makedirs('temp_audio')
         
+        # Load the translation engine off the event loop (model loading is slow)
+        loop = asyncio.get_event_loop()
+        self.translator = await loop.run_in_executor(None, self._load_translator)
+        if self.translator is not None and Config.TRANSLATION_ENGINE == "continuous":
+            # The engine merges concurrent calls at every decoding step; just let them in together
+            self.translation_executor = ThreadPoolExecutor(
+                max_workers=Config.MAX_CONCURRENT_TRANSLATIONS, thread_name_prefix="translation"
+            )
+        elif self.translator is not None:
+            # Concurrent sessions share batched generate calls instead of queuing one by one
+            self.scheduler = TranslationScheduler(
+                self.translator,
+                max_batch_size=Config.TRANSLATION_MAX_BATCH_SIZE,
+                max_wait_ms=Config.TRANSLATION_BATCH_WAIT_MS
+            )
+        
         # Setup routes (without manual CORS)
         self._setup_routes()
         self._setup_socket_handlers()
@@ -49,11 +85,36 @@ class VoiceTranslationServer:
     def create_app(self):
         return self.app
     
+    def _load_translator(self):
+        """Create the translator for the configured engine, or None to echo text"""
+        if Config.TRANSLATION_ENGINE == "none":
+            logger.info("Translation engine disabled, echoing recognized text")
+            return None
+        
+        try:
+            from Final_Optimized_Model import UniversalTranslator
+            
+            translator = UniversalTranslator(
+                model_size=Config.TRANSLATION_MODEL,
+                device=Config.TRANSLATION_DEVICE,
+                engine=Config.TRANSLATION_ENGINE,
+                engine_options=Config.get_engine_options(),
+                warmup_pairs=[(Config.DEFAULT_SOURCE_LANG, Config.DEFAULT_TARGET_LANG)],
+                decoding_profile=Config.DECODING_PROFILE,
+                timeout_policy=Config.TRANSLATION_TIMEOUT_POLICY
+            )
+            logger.info(f"✅ Translation engine ready: {Config.TRANSLATION_ENGINE}")
+            return translator
+        except Exception as e:
+            logger.error(f"Could not load {Config.TRANSLATION_ENGINE} translation engine: {e}")
+            return None
+    
     def _setup_routes(self):
         """Setup HTTP routes without manual CORS"""
         self.app.router.add_get('/', self.handle_root)
         self.app.router.add_get('/health', self.handle_health)
         self.app.router.add_get('/languages', self.handle_get_languages)
+        self.app.router.add_get('/metrics', self.handle_metrics)
         self.app.router.add_static('/audio', 'temp_audio')
     
     def _setup_socket_handlers(self):
@@ -96,12 +157,20 @@ class VoiceTranslationServer:
                 session = self.sessions[sid]
                 session.source_language = data.get('source', 'en')
                 session.target_language = data.get('target', 'es')
+                # Optional speed/quality trade-off for this session's translations
+                profile = data.get('profile')
+                if profile in PROFILES:
+                    session.decoding_profile = profile
+                elif profile is not None:
+                    await self.sio.emit('error', {'message': f'Unknown decoding profile: {profile}'}, room=sid)
                 
-                logger.info(f"🌐 Languages set: {session.source_language} -> {session.target_language}")
+                logger.info(f"🌐 Languages set: {session.source_language} -> {session.target_language} "
+                            f"({session.decoding_profile})")
                 
                 await self.sio.emit('languages_updated', {
                     'source': session.source_language,
-                    'target': session.target_language
+                    'target': session.target_language,
+                    'profile': session.decoding_profile
                 }, room=sid)
                 
             except Exception as e:
@@ -125,11 +194,16 @@ class VoiceTranslationServer:
                 audio_data = base64.b64decode(audio_b64)
                 
                 # Process audio directly
-                text = await self._audio_to_text(audio_data, session.source_language)
+                with self.metrics.time("stt"):
+                    text = await self._audio_to_text(audio_data, session.source_language)
                 
                 if text:
-                    # Simple translation simulation
-                    translated_text = f"Translated to {session.target_language}: {text}"
+                    with self.metrics.time("translate"):
+                        translated_text = await self._translate(text, session.source_language, session.target_language,
+                                                                session.decoding_profile)
+                    if translated_text is None:
+                        await self.sio.emit('error', {'message': 'Translation failed'}, room=sid)
+                        return
                     
                     # Send translation result
                     await self.sio.emit('translation_result', {
@@ -140,7 +214,8 @@ class VoiceTranslationServer:
                     }, room=sid)
                     
                     # Generate speech
-                    audio_url = await self._text_to_speech(translated_text, session.target_language, session.user_id)
+                    with self.metrics.time("tts"):
+                        audio_url = await self._text_to_speech(translated_text, session.target_language, session.user_id)
                     
                     if audio_url:
                         await self.sio.emit('translated_audio', {
@@ -179,6 +254,30 @@ class VoiceTranslationServer:
             logger.error(f"Audio processing error: {e}")
             return None
     
+    async def _translate(self, text: str, source_lang: str, target_lang: str, profile: str = None):
+        """Translate text with the configured engine without blocking the event loop"""
+        if self.translator is None:
+            # No engine loaded: fall back to a labelled echo of the source text
+            return f"Translated to {target_lang}: {text}"
+        
+        # The clock starts now, so time spent queued counts against the timeout
+        deadline = Deadline(Config.TRANSLATION_TIMEOUT)
+        if self.scheduler is not None:
+            result = await self.scheduler.translate_async(text, source_lang, target_lang, deadline=deadline,
+                                                          profile=profile)
+        else:
+            result = await asyncio.get_event_loop().run_in_executor(
+                self.translation_executor,
+                lambda: self.translator.translate_fast(text, source_lang, target_lang, deadline=deadline,
+                                                       profile=profile)
+            )
+        if not result["success"]:
+            logger.error(f"Translation error: {result['error']}")
+            return None
+        if result.get("partial"):
+            logger.warning(f"Translation cut off after {Config.TRANSLATION_TIMEOUT}s, sending partial result")
+        return result["translated_text"]
+    
     async def _text_to_speech(self, text: str, language: str, user_id: str):
         """Convert text to speech"""
         try:
@@ -206,7 +305,7 @@ class VoiceTranslationServer:
         return web.json_response({
             'service': 'Voice Translation Server',
             'status': 'running',
-            'endpoints': ['/health', '/languages', '/ws']
+            'endpoints': ['/health', '/languages', '/metrics', '/ws']
         })
     
     async def handle_health(self, request):
@@ -220,7 +319,27 @@ class VoiceTranslationServer:
             'supported_languages': self.get_supported_languages()
         })
     
+    def get_metrics(self):
+        """Server pipeline, translator and batching metrics as one dict"""
+        return {
+            'sessions': len(self.sessions),
+            'server': self.metrics.snapshot(),
+            'translator': self.translator.get_metrics() if self.translator is not None else {},
+            'scheduler': self.scheduler.stats() if self.scheduler is not None else {}
+        }
+    
+    async def handle_metrics(self, request):
+        """JSON metrics, or Prometheus text format with ?format=prometheus"""
+        metrics = self.get_metrics()
+        if request.query.get('format') == 'prometheus':
+            return web.Response(text=to_prometheus(metrics), content_type='text/plain')
+        return web.json_response(metrics, dumps=lambda data: json.dumps(data, default=str))
+    
     async def cleanup(self):
         """Cleanup resources"""
         logger.info("Cleaning up...")
+        if self.scheduler is not None:
+            await self.scheduler.close()
+        if self.translation_executor is not None:
+            self.translation_executor.shutdown(wait=False)
         self.sessions.clear()
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    def __init__(self, capacity_seconds: float = 30.0, sample_rate: int = 16000):
+        """
+        Fixed-capacity float32 ring buffer between a capture callback and a transcriber
+
+        One thread writes (the sounddevice callback), one thread reads. The
+        writer never blocks or allocates: when the reader falls behind, the
+        oldest unread samples are overwritten and counted as overflow. Memory
+        stays at capacity_seconds of audio however long the session runs.
+
+        Args:
+            capacity_seconds: Audio kept before old samples are overwritten
+            sample_rate: Samples per second of the mono stream
+        """
+        self.sample_rate = sample_rate
+        self.capacity = int(capacity_seconds * sample_rate)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        # Total samples ever written / consumed; positions in the ring are these modulo capacity
+        self._written = 0
+        self._consumed = 0
+        # End of the write in progress: samples before it minus capacity may be overwritten by now
+        self._reserved = 0
+        self.overflows = 0
+        self.dropped_samples = 0
+        self.input_overflows = 0
+
+    def callback(self, indata, frames, time_info, status):
+        """sounddevice InputStream callback: copy the first channel into the ring"""
+        if status and status.input_overflow:
+            # The audio device itself dropped frames before we saw them
+            self.input_overflows += 1
+        self.write(indata[:frames, 0])
+
+    def write(self, samples: np.ndarray):
+        """Append samples (writer thread only); never blocks"""
+        written = self._written + len(samples)
+        # A write longer than the ring keeps only its tail
+        count = min(len(samples), self.capacity)
+        samples = samples[len(samples) - count:]
+        # Announce the region about to be overwritten before touching it
+        self._reserved = written
+        start = (written - count) % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        if first < count:
+            self._data[:count - first] = samples[first:]
+
+        # Publish the new end only after the samples are in place
+        unread = written - self._consumed
+        if unread > self.capacity:
+            self.overflows += 1
+            self.dropped_samples += unread - self.capacity
+        self._written = written
+
+    def available(self) -> int:
+        """Unread samples still held in the ring"""
+        return min(self._written - self._consumed, self.capacity)
+
+    def _skip_overwritten(self):
+        oldest = self._written - self.capacity
+        if self._consumed < oldest:
+            self._consumed = oldest
+
+    def read(self, count: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Consume the next count unread samples (reader thread only)
+
+        Returns a view of out when given (no allocation), otherwise a new
+        array. Fewer samples come back if fewer are available, or if the
+        writer overwrote the oldest of them during the copy.
+        """
+        self._skip_overwritten()
+        position = self._consumed
+        count = min(count, self.available())
+        result = self._copy(position, count, out)
+        self._consumed = position + count
+        return result
+
+    def latest(self, count: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Most recent count samples (read or not) without consuming anything"""
+        count = min(count, self._written, self.capacity)
+        return self._copy(self._written - count, count, out)
+
+    def consume(self, count: int):
+        """Mark count samples as read without copying them"""
+        self._skip_overwritten()
+        self._consumed += min(count, self.available())
+
+    def _copy(self, position: int, count: int, out: Optional[np.ndarray]) -> np.ndarray:
+        """Copy count samples from position, keeping only those no write touched meanwhile"""
+        target = out[:count] if out is not None else np.empty(count, dtype=np.float32)
+        start = position % self.capacity
+        first = min(count, self.capacity - start)
+        target[:first] = self._data[start:start + first]
+        if first < count:
+            target[first:] = self._data[:count - first]
+
+        # A write that started during the copy may have replaced its oldest samples
+        lost = min(count, max(0, self._reserved - self.capacity - position))
+        if lost:
+            target[:count - lost] = target[lost:]
+            target = target[:count - lost]
+        return target
+
+    @property
+    def total_seconds(self) -> float:
+        """Audio written since the stream started"""
+        return self._written / self.sample_rate
+
+    def stats(self) -> Dict:
+        """Fill level and overflow counters"""
+        return {
+            "capacity_seconds": self.capacity / self.sample_rate,
+            "buffered_seconds": self.available() / self.sample_rate,
+            "total_seconds": self.total_seconds,
+            "overflows": self.overflows,
+            "dropped_seconds": self.dropped_samples / self.sample_rate,
+            "input_overflows": self.input_overflows,
+        }
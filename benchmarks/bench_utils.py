@@ -0,0 +1,106 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Sequence
+
+# Benchmarks import the translator modules from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_TEST_SET = os.path.join(DATA_DIR, "translation_test_set.jsonl")
+
+
+def load_test_set(path: str = DEFAULT_TEST_SET) -> List[Dict]:
+    """Load a JSONL test set with source_lang, target_lang, text and reference fields"""
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                rows.append(json.loads(line))
+    return rows
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux and bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def latency_summary(latencies: Sequence[float]) -> Dict:
+    """Mean/p50/p95 latency in milliseconds"""
+    if not latencies:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    ordered = sorted(latencies)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[p95_index] * 1000,
+    }
+
+
+def run_test_set(translate: Callable[[str, str, str], Dict], rows: List[Dict]) -> Dict:
+    """Translate every row, timing each call; returns hypotheses and latencies"""
+    hypotheses = []
+    latencies = []
+    for row in rows:
+        start_time = time.perf_counter()
+        result = translate(row["text"], row["source_lang"], row["target_lang"])
+        latencies.append(time.perf_counter() - start_time)
+        hypotheses.append(result.get("translated_text", "") if result.get("success") else "")
+    return {"hypotheses": hypotheses, "latencies": latencies}
+
+
+def score_translations(hypotheses: List[str], references: List[str]) -> Dict:
+    """Corpus BLEU and chrF (requires sacrebleu)"""
+    try:
+        import sacrebleu
+    except ImportError:
+        print("⚠️  sacrebleu not installed, skipping quality scores (pip install sacrebleu)")
+        return {"bleu": None, "chrf": None}
+    return {
+        "bleu": sacrebleu.corpus_bleu(hypotheses, [references]).score,
+        "chrf": sacrebleu.corpus_chrf(hypotheses, [references]).score,
+    }
+
+
+def run_worker(script: str, args: List[str]) -> Dict:
+    """
+    Run one benchmark configuration in a fresh interpreter
+
+    A separate process keeps peak memory and load time of each
+    configuration independent. The worker must print its result as
+    JSON on the last line of stdout.
+    """
+    completed = subprocess.run(
+        [sys.executable, script] + args,
+        capture_output=True, text=True, encoding='utf-8'
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "worker failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_table(results: List[Dict], columns: List[str]):
+    """Print benchmark results as an aligned text table"""
+    def fmt(value):
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return "-" if value is None else str(value)
+
+    widths = [max(len(col), *(len(fmt(r.get(col))) for r in results)) for col in columns]
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for result in results:
+        print("  ".join(fmt(result.get(col)).ljust(w) for col, w in zip(columns, widths)))
@@ -0,0 +1,65 @@
+"""
+Compare latency and quality of every decoding profile on the local test set
+
+Each profile translates the test set with the cache off. The table shows
+mean/p50/p95 latency, BLEU and chrF, and the script recommends the fastest
+profile whose chrF is within --tolerance of the best one. That is the
+candidate for BABEL_DECODING_PROFILE.
+
+Usage:
+    python benchmarks/benchmark_decoding_profiles.py
+    python benchmarks/benchmark_decoding_profiles.py --engine ctranslate2 --tolerance 0.5
+"""
+import argparse
+
+from bench_utils import DEFAULT_TEST_SET, latency_summary, load_test_set, print_table, run_test_set, score_translations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark decoding profiles")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--engine", default="transformers")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--test-set", default=DEFAULT_TEST_SET)
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="chrF points a faster profile may lose and still be recommended")
+    args = parser.parse_args()
+
+    from Final_Optimized_Model import UniversalTranslator
+    from decoding_profiles import PROFILES
+
+    rows = load_test_set(args.test_set)
+    references = [row["reference"] for row in rows]
+    translator = UniversalTranslator(model_size=args.model, device=args.device, engine=args.engine,
+                                     warmup_pairs=[])
+
+    results = []
+    for name, profile in PROFILES.items():
+        translate = lambda text, src, tgt: translator.translate_fast(text, src, tgt, use_cache=False, profile=name)
+        translate("Hello", "en", "es")
+        run = run_test_set(translate, rows)
+        encoded = translator.tokenizer(run["hypotheses"], add_special_tokens=False)["input_ids"]
+        output_tokens = sum(len(ids) for ids in encoded)
+        result = {
+            "profile": name,
+            "beams": profile.num_beams,
+            "avg_output_tokens": output_tokens / len(rows),
+        }
+        result.update(latency_summary(run["latencies"]))
+        result.update(score_translations(run["hypotheses"], references))
+        results.append(result)
+
+    print(f"\n📊 Decoding profiles on {len(rows)} sentences ({args.model}, {args.engine} engine)")
+    print_table(results, ["profile", "beams", "mean_ms", "p50_ms", "p95_ms", "avg_output_tokens", "bleu", "chrf"])
+
+    scored = [result for result in results if result["chrf"] is not None]
+    if scored:
+        best_chrf = max(result["chrf"] for result in scored)
+        eligible = [result for result in scored if result["chrf"] >= best_chrf - args.tolerance]
+        choice = min(eligible, key=lambda result: result["mean_ms"])
+        print(f"\nRecommended default: {choice['profile']} "
+              f"(chrF {choice['chrf']:.2f}, best {best_chrf:.2f}, {choice['mean_ms']:.0f} ms mean)")
+
+
+if __name__ == "__main__":
+    main()
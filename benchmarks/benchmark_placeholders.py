@@ -0,0 +1,77 @@
+"""
+Measure what placeholder masking of URLs, emails, numbers and emoji saves
+
+Compares source token counts and translate_fast latency with masking off
+and on, then replays the corpus with every digit changed to show how many
+requests the translation cache now answers.
+
+Usage:
+    python benchmarks/benchmark_placeholders.py
+    python benchmarks/benchmark_placeholders.py --corpus benchmarks/data/chat_corpus.jsonl
+"""
+import argparse
+import os
+import re
+
+from bench_utils import DATA_DIR, latency_summary, load_test_set, print_table, run_test_set
+
+DEFAULT_CORPUS = os.path.join(DATA_DIR, "chat_corpus.jsonl")
+
+
+def shift_digits(text: str) -> str:
+    """Same message with different numbers (e.g. another phone number or OTP)"""
+    return re.sub(r"\d", lambda match: str((int(match.group(0)) + 3) % 10), text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark placeholder masking")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--engine", default="transformers")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    from Final_Optimized_Model import UniversalTranslator
+    from placeholders import mask_spans
+    from translation_cache import TranslationCache
+
+    rows = load_test_set(args.corpus)
+    translator = UniversalTranslator(model_size=args.model, device="cpu", engine=args.engine,
+                                     warmup_pairs=[], translation_cache=TranslationCache())
+    translator.translate_fast("Hello", "en", "es", use_cache=False)
+
+    results = []
+    for masking in (False, True):
+        translator.mask_placeholders = masking
+        texts = [mask_spans(row["text"])[0] if masking else row["text"] for row in rows]
+        source_tokens = sum(len(translator.tokenizer(text)["input_ids"]) for text in texts)
+        run = run_test_set(
+            lambda text, src, tgt: translator.translate_fast(text, src, tgt, use_cache=False), rows
+        )
+
+        # Prime the cache with the corpus, then replay it with different numbers
+        cache = TranslationCache()
+        translator.translation_cache = cache
+        for row in rows:
+            translator.translate_fast(row["text"], row["source_lang"], row["target_lang"])
+        hits_before = cache.stats()["memory_hits"]
+        for row in rows:
+            translator.translate_fast(shift_digits(row["text"]), row["source_lang"], row["target_lang"])
+        replay_hits = cache.stats()["memory_hits"] - hits_before
+
+        result = {
+            "masking": "on" if masking else "off",
+            "source_tokens": source_tokens,
+            "replay_cache_hits": f"{replay_hits}/{len(rows)}",
+        }
+        result.update(latency_summary(run["latencies"]))
+        results.append(result)
+
+    saved = 1 - results[1]["source_tokens"] / results[0]["source_tokens"]
+    speedup = results[0]["mean_ms"] / results[1]["mean_ms"] if results[1]["mean_ms"] else 0.0
+    print(f"\n📊 Placeholder masking on {len(rows)} chat messages ({args.engine})")
+    print_table(results, ["masking", "source_tokens", "mean_ms", "p50_ms", "p95_ms", "replay_cache_hits"])
+    print(f"\nSource tokens: -{saved:.0%}, mean latency: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare float32, int8 and bf16 CPU inference for the NLLB translator
+
+Reports peak memory, load time, latency and BLEU/chrF on the local test set.
+
+Usage:
+    python benchmarks/benchmark_quantization.py
+    python benchmarks/benchmark_quantization.py --precisions float32 int8
+"""
+import argparse
+import json
+import time
+from typing import Dict
+
+from bench_utils import (DEFAULT_TEST_SET, latency_summary, load_test_set, peak_rss_mb,
+                         print_table, run_test_set, run_worker, score_translations)
+
+
+def benchmark_precision(model_size: str, precision: str, test_set: str) -> Dict:
+    """Load the translator at one precision and run the test set"""
+    from Final_Optimized_Model import UniversalTranslator
+
+    rows = load_test_set(test_set)
+    start_time = time.perf_counter()
+    translator = UniversalTranslator(model_size=model_size, device="cpu", precision=precision,
+                                     warmup_pairs=[])
+    load_time = time.perf_counter() - start_time
+
+    # One untimed call so lazy initialisation doesn't land in the first sample
+    translator.translate_fast("Hello", "en", "es")
+    run = run_test_set(translator.translate_fast, rows)
+    scores = score_translations(run["hypotheses"], [row["reference"] for row in rows])
+
+    result = {
+        "precision": translator.precision,
+        "load_s": load_time,
+        "peak_rss_mb": peak_rss_mb(),
+        "sentences_per_s": len(rows) / sum(run["latencies"]),
+    }
+    result.update(latency_summary(run["latencies"]))
+    result.update(scores)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NLLB CPU precisions")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--precisions", nargs="+", default=["float32", "int8", "bf16"])
+    parser.add_argument("--test-set", default=DEFAULT_TEST_SET)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(benchmark_precision(args.model, args.worker, args.test_set)))
+        return
+
+    print(f"📊 Benchmarking {args.model} on {args.test_set}")
+    results = []
+    for precision in args.precisions:
+        print(f"⏱️  Running {precision}...")
+        result = run_worker(__file__, ["--worker", precision, "--model", args.model,
+                                       "--test-set", args.test_set])
+        result.setdefault("precision", precision)
+        results.append(result)
+
+    print()
+    print_table(results, ["precision", "load_s", "peak_rss_mb", "mean_ms", "p50_ms", "p95_ms",
+                          "sentences_per_s", "bleu", "chrf", "error"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare serialized translate_fast calls with the micro-batching scheduler
+
+Simulates N concurrent callers (default 20) translating test-set sentences
+and reports total wall time, requests/second and per-request latency.
+
+Usage:
+    python benchmarks/benchmark_scheduler.py
+    python benchmarks/benchmark_scheduler.py --callers 20 --max-wait-ms 5 --max-batch-size 16
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_utils import DEFAULT_TEST_SET, latency_summary, load_test_set, print_table
+
+
+async def run_serialized(translator, requests):
+    """Baseline: every caller runs its own batch-of-one call on a shared model thread"""
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def call(row):
+        start_time = time.perf_counter()
+        await loop.run_in_executor(executor, translator.translate_fast,
+                                   row["text"], row["source_lang"], row["target_lang"])
+        return time.perf_counter() - start_time
+
+    return await asyncio.gather(*[call(row) for row in requests])
+
+
+async def run_scheduled(translator, requests, max_batch_size, max_wait_ms):
+    """All callers go through TranslationScheduler.translate_async"""
+    from translation_scheduler import TranslationScheduler
+
+    scheduler = TranslationScheduler(translator, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    async def call(row):
+        start_time = time.perf_counter()
+        await scheduler.translate_async(row["text"], row["source_lang"], row["target_lang"])
+        return time.perf_counter() - start_time
+
+    latencies = await asyncio.gather(*[call(row) for row in requests])
+    stats = scheduler.stats()
+    await scheduler.close()
+    return latencies, stats
+
+
+def summarize(mode, latencies, wall_time):
+    result = {"mode": mode, "wall_s": wall_time, "requests_per_s": len(latencies) / wall_time}
+    result.update(latency_summary(latencies))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent translation scheduling")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--engine", default="transformers")
+    parser.add_argument("--callers", type=int, default=20)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--test-set", default=DEFAULT_TEST_SET)
+    args = parser.parse_args()
+
+    from Final_Optimized_Model import UniversalTranslator
+
+    rows = load_test_set(args.test_set)
+    requests = [rows[i % len(rows)] for i in range(args.callers)]
+    translator = UniversalTranslator(model_size=args.model, device="cpu", engine=args.engine,
+                                     warmup_pairs=[])
+    translator.translate_fast("Hello", "en", "es")
+
+    results = []
+    start_time = time.perf_counter()
+    latencies = asyncio.run(run_serialized(translator, requests))
+    results.append(summarize("serialized", latencies, time.perf_counter() - start_time))
+
+    start_time = time.perf_counter()
+    latencies, stats = asyncio.run(run_scheduled(translator, requests, args.max_batch_size, args.max_wait_ms))
+    results.append(summarize("scheduler", latencies, time.perf_counter() - start_time))
+
+    print(f"\n📊 {args.callers} concurrent callers ({args.engine})")
+    print_table(results, ["mode", "wall_s", "requests_per_s", "mean_ms", "p50_ms", "p95_ms"])
+    print(f"\nScheduler: {stats['batches']} batches, avg size {stats['avg_batch_size']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
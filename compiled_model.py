@@ -0,0 +1,129 @@
+"""
+Opt-in torch.compile acceleration for the NLLB translator
+
+The encoder runs compiled with static shapes. Inputs are padded up to a
+small set of (batch, length) buckets, so only a handful of graphs ever get
+built. The decoder step is compiled with dynamic shapes because its
+KV cache grows by one position per step. Inductor's FX graph cache (and,
+on torch >= 2.7, the portable cache artifacts) live in BABEL_COMPILE_CACHE,
+so a restarted server reuses compiled kernels instead of compiling again.
+"""
+import os
+import time
+from typing import Dict, Sequence
+
+import torch
+
+COMPILE_CACHE_DIR = os.getenv("BABEL_COMPILE_CACHE", "./compile_cache")
+
+# Padded sequence lengths and batch sizes the encoder is compiled for
+LENGTH_BUCKETS = (16, 32, 64, 128, 256)
+BATCH_BUCKETS = (1, 2, 4, 8, 16)
+
+ARTIFACTS_FILE = "compile_artifacts.bin"
+
+
+def _bucket(value: int, buckets: Sequence[int]) -> int:
+    """Smallest bucket holding value (values beyond the last bucket keep their own size)"""
+    for bucket in buckets:
+        if value <= bucket:
+            return bucket
+    return value
+
+
+def enable_compile_cache(cache_dir: str = COMPILE_CACHE_DIR):
+    """Point inductor's on-disk caches at cache_dir and preload saved artifacts"""
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.abspath(cache_dir))
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    os.environ.setdefault("TORCHINDUCTOR_AUTOGRAD_CACHE", "1")
+    try:
+        import torch._inductor.config as inductor_config
+        inductor_config.fx_graph_cache = True
+    except (ImportError, AttributeError):
+        pass
+
+    artifacts = os.path.join(cache_dir, ARTIFACTS_FILE)
+    if os.path.exists(artifacts) and hasattr(torch.compiler, "load_cache_artifacts"):
+        with open(artifacts, 'rb') as f:
+            torch.compiler.load_cache_artifacts(f.read())
+        print(f"📦 Loaded compile cache: {artifacts}")
+
+
+def save_compile_cache(cache_dir: str = COMPILE_CACHE_DIR):
+    """Write the portable compile artifacts gathered so far (torch >= 2.7)"""
+    if not hasattr(torch.compiler, "save_cache_artifacts"):
+        return
+    saved = torch.compiler.save_cache_artifacts()
+    if saved is None:
+        return
+    artifacts = os.path.join(cache_dir, ARTIFACTS_FILE)
+    temp_path = artifacts + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(saved[0])
+    os.replace(temp_path, artifacts)
+
+
+def compile_model(model, pad_token_id: int, length_buckets: Sequence[int] = LENGTH_BUCKETS,
+                  batch_buckets: Sequence[int] = BATCH_BUCKETS):
+    """
+    Compile the encoder (bucketed static shapes) and decoder step (dynamic shapes) in place
+
+    The model keeps its generate()/pipeline interface; only the encoder and
+    decoder forward methods are swapped.
+    """
+    encoder = model.get_encoder()
+    decoder = model.get_decoder()
+    compiled_encoder = torch.compile(encoder.forward, backend="inductor", dynamic=False)
+    decoder.forward = torch.compile(decoder.forward, backend="inductor", dynamic=True)
+
+    def bucketed_encoder(input_ids=None, attention_mask=None, **kwargs):
+        if input_ids is None:
+            return compiled_encoder(attention_mask=attention_mask, **kwargs)
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        batch, length = input_ids.shape
+        padded_batch = _bucket(batch, batch_buckets)
+        padded_length = _bucket(length, length_buckets)
+
+        # Padding is masked out, so real positions get the same states as unpadded input
+        padded_ids = input_ids.new_full((padded_batch, padded_length), pad_token_id)
+        padded_mask = attention_mask.new_zeros((padded_batch, padded_length))
+        padded_ids[:batch, :length] = input_ids
+        padded_mask[:batch, :length] = attention_mask
+        # Filler rows need at least one visible token to keep attention finite
+        padded_mask[batch:, 0] = 1
+
+        outputs = compiled_encoder(input_ids=padded_ids, attention_mask=padded_mask, **kwargs)
+        outputs.last_hidden_state = outputs.last_hidden_state[:batch, :length]
+        return outputs
+
+    encoder.forward = bucketed_encoder
+    return model
+
+
+def warm_up_compiled(model, tokenizer, length_buckets: Sequence[int] = (16, 32, 64),
+                     batch_sizes: Sequence[int] = (1,), num_beams: int = 3,
+                     cache_dir: str = COMPILE_CACHE_DIR) -> Dict:
+    """
+    Compile the common bucket sizes now instead of on the first user requests
+
+    Runs a short generate for every (batch, length) combination, then saves
+    the compile artifacts for the next start.
+    """
+    timings = {}
+    start_time = time.time()
+    with torch.inference_mode():
+        for length in length_buckets:
+            for batch in batch_sizes:
+                shape_start = time.time()
+                input_ids = torch.full((batch, length), tokenizer.unk_token_id, dtype=torch.long,
+                                       device=model.device)
+                input_ids[:, -1] = tokenizer.eos_token_id
+                model.generate(input_ids=input_ids, attention_mask=torch.ones_like(input_ids),
+                               num_beams=num_beams, max_new_tokens=4)
+                timings[f"{batch}x{length}"] = time.time() - shape_start
+    save_compile_cache(cache_dir)
+    total = time.time() - start_time
+    print(f"🔥 Compiled {len(timings)} encoder shapes in {total:.1f}s")
+    return {"seconds": total, "shapes": timings}
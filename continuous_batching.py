@@ -0,0 +1,364 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from deadlines import Deadline, deadline_expired
+
+
+class _Sequence:
+    __slots__ = ("text", "src_nllb", "target_token_id", "max_length", "deadline", "future", "enqueued_at",
+                 "encoder_states", "cross_kv", "tokens")
+
+    def __init__(self, text: str, src_nllb: str, target_token_id: int, max_length: int,
+                 deadline: Optional[Deadline] = None):
+        self.text = text
+        self.src_nllb = src_nllb
+        self.target_token_id = target_token_id
+        self.max_length = max_length
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.encoder_states = None
+        # Per decoder layer cross-attention (key, value) tensors of shape (1, heads, length, head_dim)
+        self.cross_kv: List = []
+        self.tokens: List[int] = []
+
+
+class ContinuousBatcher:
+    def __init__(self, model, tokenizer, max_running: int = 16, tokenizer_lock: Optional[threading.Lock] = None):
+        """
+        Iteration-level (continuous) batching for an NLLB/M2M100 model
+
+        A background thread owns a running set of sequences, each with its own
+        encoder output and cross-attention cache. Every step decodes one token
+        for all of them; finished sequences leave immediately and queued
+        requests join at the next step, so a short utterance never waits for
+        the longest one.
+
+        Decoding is greedy. Rows with different decoder lengths share a step by
+        left-padding the self-attention cache and correcting each row's
+        sinusoidal position embedding. The padded batch cache is kept between
+        steps and only rebuilt when sequences join or leave.
+
+        Args:
+            model: AutoModelForSeq2SeqLM (NLLB / M2M100)
+            tokenizer: Matching NLLB tokenizer
+            max_running: Maximum sequences decoded together
+            tokenizer_lock: Lock shared by everything that sets src_lang on this tokenizer
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.tokenizer_lock = tokenizer_lock or threading.Lock()
+        self.max_running = max(1, max_running)
+        self.decoder = model.get_decoder()
+        self.eos_token_id = model.config.eos_token_id
+        self.decoder_start_token_id = model.config.decoder_start_token_id
+        # Positions beyond the sinusoidal table would need it regrown mid-step
+        self.max_positions = model.config.max_position_embeddings
+
+        self._pending: "queue.Queue[_Sequence]" = queue.Queue()
+        self._running: List[_Sequence] = []
+        # Padded caches/masks of the running set; valid while its membership is unchanged
+        self._batch: Optional[Dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.steps = 0
+        self.admitted = 0
+        self.completed = 0
+        self.total_running = 0
+        self.total_queue_wait = 0.0
+        self.expired = 0
+
+    def submit(self, text: str, src_nllb: str, tgt_nllb: str, max_length: int = 256,
+               deadline: Optional[Deadline] = None) -> Future:
+        """
+        Queue one translation; the future resolves to the translated string
+
+        Past the deadline a running request is retired with the tokens decoded
+        so far; one that had not decoded any text yet is dropped and resolves
+        to None.
+        """
+        self._ensure_started()
+        sequence = _Sequence(text, src_nllb, self.tokenizer.convert_tokens_to_ids(tgt_nllb),
+                             min(max_length, self.max_positions), deadline)
+        self._pending.put(sequence)
+        return sequence.future
+
+    def translate(self, texts: List[str], src_nllb: str, tgt_nllb: str, max_length: int = 256,
+                  deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+        """Submit texts and block until all of them are translated (None for dropped ones)"""
+        futures = [self.submit(text, src_nllb, tgt_nllb, max_length, deadline) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="continuous-batching", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            # Sleep on the queue only when nothing is decoding
+            self._admit(block=not self._running)
+            if not self._running:
+                continue
+            try:
+                self._step()
+            except Exception as e:
+                for sequence in self._running:
+                    if not sequence.future.done():
+                        sequence.future.set_exception(e)
+                self._running = []
+                self._batch = None
+
+    def _admit(self, block: bool):
+        """Move queued requests into the running set (up to max_running)"""
+        arrivals = []
+        if block:
+            arrivals.append(self._pending.get())
+        while len(self._running) + len(arrivals) < self.max_running:
+            try:
+                arrivals.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        # Requests that waited past their deadline never reach the encoder
+        live = []
+        for sequence in arrivals:
+            if deadline_expired(sequence.deadline):
+                self.expired += 1
+                sequence.deadline.cut_short = True
+                sequence.future.set_result(None)
+            else:
+                live.append(sequence)
+        arrivals = live
+        if not arrivals:
+            return
+
+        now = time.perf_counter()
+        self.admitted += len(arrivals)
+        self.total_queue_wait += sum(now - sequence.enqueued_at for sequence in arrivals)
+        groups: Dict[str, List[_Sequence]] = {}
+        for sequence in arrivals:
+            groups.setdefault(sequence.src_nllb, []).append(sequence)
+        for sequences in groups.values():
+            try:
+                self._encode(sequences)
+                self._running.extend(sequences)
+            except Exception as e:
+                for sequence in sequences:
+                    sequence.future.set_exception(e)
+
+    def _encode(self, sequences: List[_Sequence]):
+        """Run the encoder once for new arrivals and precompute their cross-attention caches"""
+        import torch
+
+        with self.tokenizer_lock:
+            self.tokenizer.src_lang = sequences[0].src_nllb
+            inputs = self.tokenizer(
+                [sequence.text for sequence in sequences], padding=True, truncation=True,
+                max_length=self.max_positions, return_tensors="pt"
+            )
+        inputs = inputs.to(self.model.device)
+        lengths = inputs["attention_mask"].sum(dim=1).tolist()
+
+        with torch.inference_mode():
+            states = self.model.get_encoder()(**inputs).last_hidden_state
+            cross = []
+            for layer in self.decoder.layers:
+                attention = layer.encoder_attn
+                cross.append((self._split_heads(attention, attention.k_proj(states)),
+                              self._split_heads(attention, attention.v_proj(states))))
+
+        for i, sequence in enumerate(sequences):
+            length = lengths[i]
+            sequence.encoder_states = states[i:i + 1, :length]
+            sequence.cross_kv = [(k[i:i + 1, :, :length], v[i:i + 1, :, :length]) for k, v in cross]
+            sequence.tokens = [self.decoder_start_token_id]
+
+    def _split_heads(self, attention, projected):
+        """(batch, length, hidden) -> (batch, heads, length, head_dim)"""
+        batch, length, _ = projected.shape
+        heads = getattr(attention, "num_heads", None) or self.model.config.decoder_attention_heads
+        return projected.view(batch, length, heads, -1).transpose(1, 2)
+
+    def _embed(self, tokens, past_lengths: List[int], padded_length: int):
+        """Token embeddings with each row's own position swapped in for the shared padded one"""
+        import torch
+
+        embed_tokens = self.decoder.embed_tokens
+        embeds = embed_tokens(tokens)
+        if not hasattr(embed_tokens, "embed_scale"):
+            embeds = embeds * getattr(self.decoder, "embed_scale", 1.0)
+
+        # The decoder adds the position after padded_length cached tokens to every row
+        positions = self.decoder.embed_positions
+        offset = positions.padding_idx + 1
+        own = positions.weights.index_select(
+            0, torch.tensor([offset + n for n in past_lengths], device=positions.weights.device)
+        )
+        shared = positions.weights[offset + padded_length]
+        return embeds + (own - shared).unsqueeze(1).to(embeds.dtype)
+
+    def _build_batch(self, running: List[_Sequence]):
+        """
+        Pad the running set's caches into batch tensors
+
+        Only called when sequences joined or left: a continuing sequence's
+        self-attention entries are taken from its row of the previous batch
+        cache, new arrivals start empty.
+        """
+        import torch
+
+        device = self.model.device
+        batch = len(running)
+        previous = self._batch
+        rows = {id(sequence): i for i, sequence in enumerate(previous["members"])} if previous else {}
+        past_lengths = [len(sequence.tokens) - 1 for sequence in running]
+        padded_past = max(past_lengths)
+        source_length = max(sequence.encoder_states.shape[1] for sequence in running)
+
+        # Self-attention caches are left-padded so every row ends at the current step
+        self_mask = torch.zeros(batch, padded_past + 1, dtype=torch.long, device=device)
+        encoder_mask = torch.zeros(batch, source_length, dtype=torch.long, device=device)
+        first = running[0]
+        encoder_states = first.encoder_states.new_zeros(batch, source_length, first.encoder_states.shape[2])
+        for i, sequence in enumerate(running):
+            self_mask[i, padded_past - past_lengths[i]:] = 1
+            length = sequence.encoder_states.shape[1]
+            encoder_mask[i, :length] = 1
+            encoder_states[i, :length] = sequence.encoder_states[0]
+
+        cache = []
+        for layer in range(len(self.decoder.layers)):
+            cross_k = first.cross_kv[layer][0]
+            heads, head_dim = cross_k.shape[1], cross_k.shape[3]
+            padded = [cross_k.new_zeros(batch, heads, padded_past, head_dim) for _ in range(2)]
+            padded += [cross_k.new_zeros(batch, heads, source_length, head_dim) for _ in range(2)]
+            for i, sequence in enumerate(running):
+                n = past_lengths[i]
+                if n:
+                    row = rows[id(sequence)]
+                    padded[0][i, :, padded_past - n:] = previous["cache"][layer][0][row, :, -n:]
+                    padded[1][i, :, padded_past - n:] = previous["cache"][layer][1][row, :, -n:]
+                length = sequence.encoder_states.shape[1]
+                padded[2][i, :, :length] = sequence.cross_kv[layer][0][0]
+                padded[3][i, :, :length] = sequence.cross_kv[layer][1][0]
+            cache.append(tuple(padded))
+
+        self._batch = {
+            "members": list(running),
+            "cache": cache,
+            "self_mask": self_mask,
+            "encoder_mask": encoder_mask,
+            "encoder_states": encoder_states,
+        }
+
+    def _step(self):
+        """Decode one token for every running sequence and retire the finished ones"""
+        import torch
+
+        running = self._running
+        device = self.model.device
+        batch = len(running)
+        past_lengths = [len(sequence.tokens) - 1 for sequence in running]
+
+        with torch.inference_mode():
+            if self._batch is None or self._batch["members"] != running:
+                self._build_batch(running)
+            state = self._batch
+            padded_past = state["self_mask"].shape[1] - 1
+
+            tokens = torch.tensor([[sequence.tokens[-1]] for sequence in running], device=device)
+            embeds = self._embed(tokens, past_lengths, padded_past)
+            outputs = self.decoder(
+                inputs_embeds=embeds,
+                attention_mask=state["self_mask"],
+                encoder_hidden_states=state["encoder_states"],
+                encoder_attention_mask=state["encoder_mask"],
+                past_key_values=self._to_cache(state["cache"]),
+                use_cache=True,
+                return_dict=True
+            )
+            logits = self.model.lm_head(outputs.last_hidden_state[:, -1])
+            if hasattr(self.model, "final_logits_bias"):
+                logits = logits + self.model.final_logits_bias
+            next_tokens = logits.argmax(dim=-1).tolist()
+            # The returned cache already holds this step's keys/values for every row; the
+            # next step reuses it as is while nobody joins or leaves
+            state["cache"] = list(self._from_cache(outputs.past_key_values))
+            state["self_mask"] = torch.cat(
+                [state["self_mask"], state["self_mask"].new_ones(batch, 1)], dim=1
+            )
+
+        self.steps += 1
+        self.total_running += batch
+        still_running = []
+        for i, sequence in enumerate(running):
+            # NLLB always starts the output with the target language code
+            token = sequence.target_token_id if len(sequence.tokens) == 1 else next_tokens[i]
+            sequence.tokens.append(token)
+            if token == self.eos_token_id or len(sequence.tokens) >= sequence.max_length:
+                self.completed += 1
+                sequence.future.set_result(self.tokenizer.decode(sequence.tokens, skip_special_tokens=True))
+            elif deadline_expired(sequence.deadline):
+                # Retired mid-sentence with the tokens decoded so far; the decoder start and
+                # target language code alone are no text at all
+                self.expired += 1
+                sequence.deadline.cut_short = True
+                sequence.future.set_result(
+                    self.tokenizer.decode(sequence.tokens, skip_special_tokens=True) if len(sequence.tokens) > 2
+                    else None
+                )
+            else:
+                still_running.append(sequence)
+        self._running = still_running
+
+    @staticmethod
+    def _to_cache(legacy_cache):
+        """
+        Wrap per-layer (self k, self v, cross k, cross v) tuples in the cache class the decoder expects
+
+        Built layer by layer through DynamicCache.update, which every
+        transformers release with cache classes supports (from_legacy_cache
+        was removed in 5.x).
+        """
+        try:
+            from transformers.cache_utils import DynamicCache, EncoderDecoderCache
+        except ImportError:
+            return tuple(legacy_cache)
+        self_attention, cross_attention = DynamicCache(), DynamicCache()
+        for layer, (key, value, cross_key, cross_value) in enumerate(legacy_cache):
+            self_attention.update(key, value, layer)
+            cross_attention.update(cross_key, cross_value, layer)
+        return EncoderDecoderCache(self_attention, cross_attention)
+
+    @staticmethod
+    def _from_cache(cache):
+        """Per-layer (self k, self v, cross k, cross v) tuples of a decoder cache"""
+        if isinstance(cache, tuple):
+            return cache
+
+        def layer_tensors(layer_cache, layer):
+            if hasattr(layer_cache, "layers"):
+                return layer_cache.layers[layer].keys, layer_cache.layers[layer].values
+            return layer_cache.key_cache[layer], layer_cache.value_cache[layer]
+
+        return tuple(
+            layer_tensors(cache.self_attention_cache, layer) + layer_tensors(cache.cross_attention_cache, layer)
+            for layer in range(len(cache.self_attention_cache))
+        )
+
+    def stats(self) -> Dict:
+        """Decode-loop counters for monitoring"""
+        return {
+            "running": len(self._running),
+            "queued": self._pending.qsize(),
+            "steps": self.steps,
+            "completed": self.completed,
+            "expired": self.expired,
+            "avg_running": self.total_running / self.steps if self.steps else 0.0,
+            "avg_queue_wait_ms": self.total_queue_wait / self.admitted * 1000 if self.admitted else 0.0,
+            "max_running": self.max_running,
+        }
@@ -0,0 +1,56 @@
+import time
+from typing import Iterable, Optional
+
+# What a translation returns when its deadline passes mid-generation
+TIMEOUT_POLICIES = ("partial", "error")
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        """
+        Point in time a translation request must be answered by
+
+        Engines poll expired() while decoding. Once it returns True the
+        deadline remembers it (exceeded); an engine that then actually stops
+        unfinished work early sets cut_short, so callers can tell a cut-off
+        hypothesis from one that completed just after the deadline.
+
+        Args:
+            seconds: Time budget from now
+        """
+        self.expires_at = time.monotonic() + seconds
+        self.exceeded = False
+        self.cut_short = False
+
+    @classmethod
+    def latest(cls, deadlines: Iterable[Optional["Deadline"]]) -> Optional["Deadline"]:
+        """One deadline for a batch of requests: the latest, or None if any request has none"""
+        deadlines = list(deadlines)
+        if not deadlines or any(deadline is None for deadline in deadlines):
+            return None
+        combined = cls(0)
+        combined.expires_at = max(deadline.expires_at for deadline in deadlines)
+        return combined
+
+    def remaining(self) -> float:
+        """Seconds left (negative once passed)"""
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        if time.monotonic() >= self.expires_at:
+            self.exceeded = True
+        return self.exceeded
+
+
+def deadline_expired(deadline: Optional[Deadline]) -> bool:
+    """expired() that treats a missing deadline as never expiring"""
+    return deadline is not None and deadline.expired()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request's deadline passed before its model call could start"""
+
+
+def timeout_result() -> dict:
+    """Result dict (same shape as a failed translate_fast) for a request that ran out of time"""
+    return {"success": False, "error": "Translation deadline exceeded", "timed_out": True}
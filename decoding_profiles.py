@@ -0,0 +1,77 @@
+"""
+Named decoding profiles: the speed/quality trade-off of translation in one place
+
+A profile fixes the beam count (1 = greedy), length penalty, early stopping,
+repetition guards and an output cap proportional to the input length, so a
+three-word utterance can never decode for max_length tokens. Engines apply
+the settings they support (see TranslationEngine.translate_batch).
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Union
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    name: str
+    num_beams: int = 1
+    length_penalty: float = 1.0
+    early_stopping: bool = True
+    # Output cap: max_new_tokens_ratio * input tokens + max_new_tokens_extra
+    max_new_tokens_ratio: float = 2.0
+    max_new_tokens_extra: int = 10
+    no_repeat_ngram_size: int = 0
+    repetition_penalty: float = 1.0
+
+    @property
+    def greedy(self) -> bool:
+        return self.num_beams == 1
+
+    def max_new_tokens(self, input_tokens: int, max_length: int) -> int:
+        """Generated-token cap for the longest input of a batch"""
+        return min(max_length, int(self.max_new_tokens_ratio * input_tokens) + self.max_new_tokens_extra)
+
+    def engine_settings(self, input_tokens: int, max_length: int) -> Dict:
+        """Decoding settings beyond num_beams, as generate() keyword arguments"""
+        settings = {"max_new_tokens": self.max_new_tokens(input_tokens, max_length)}
+        if not self.greedy:
+            settings.update(length_penalty=self.length_penalty, early_stopping=self.early_stopping)
+        if self.no_repeat_ngram_size:
+            settings["no_repeat_ngram_size"] = self.no_repeat_ngram_size
+        if self.repetition_penalty != 1.0:
+            settings["repetition_penalty"] = self.repetition_penalty
+        return settings
+
+    def cache_settings(self) -> Dict:
+        """Everything that changes the output, for translation cache keys"""
+        return asdict(self)
+
+
+PROFILES = {
+    # Greedy with a tight cap; the n-gram guard stops greedy decoding from looping
+    "fast": DecodingProfile("fast", num_beams=1, max_new_tokens_ratio=1.5, max_new_tokens_extra=8,
+                            no_repeat_ngram_size=4),
+    # The translator's long-standing settings (3 beams)
+    "balanced": DecodingProfile("balanced", num_beams=3, early_stopping=True),
+    "quality": DecodingProfile("quality", num_beams=5, early_stopping=False, max_new_tokens_ratio=2.5,
+                               max_new_tokens_extra=16, repetition_penalty=1.1),
+}
+
+# Profile each UniversalVoiceTranslator optimization_level decodes with
+OPTIMIZATION_PROFILES = {
+    "high": "fast",
+    "medium": "balanced",
+    "low": "quality",
+}
+
+DEFAULT_PROFILE = os.getenv("BABEL_DECODING_PROFILE", "balanced")
+
+
+def get_profile(profile: Union[str, DecodingProfile, None] = None) -> DecodingProfile:
+    """Resolve a profile name (None = BABEL_DECODING_PROFILE) to its DecodingProfile"""
+    if isinstance(profile, DecodingProfile):
+        return profile
+    name = (profile or DEFAULT_PROFILE).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown decoding profile: {name}. Available: {', '.join(PROFILES)}")
+    return PROFILES[name]
@@ -0,0 +1,163 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "last_used", "load_seconds")
+
+    def __init__(self, value: Any, load_seconds: float):
+        self.value = value
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.load_seconds = load_seconds
+
+
+class ModelRegistry:
+    def __init__(self, idle_timeout: Optional[float] = None):
+        """
+        Process-wide registry that loads each model once and shares it
+
+        Keys are tuples such as (kind, model id, device, compute type). The
+        first caller for a key runs the loader while concurrent callers for
+        the same key wait for it instead of loading a second copy.
+
+        Args:
+            idle_timeout: Seconds an unused model stays loaded (None = forever).
+                A model is unused once no caller holds a reference to it any
+                more; models still in use are never evicted, so evicting can't
+                lead to a second copy being loaded next to one still running.
+        """
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the model registered under key, loading it with loader on first use"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.last_used = time.time()
+                    self.hits += 1
+                    return entry.value
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+            # Only callers of the same key wait here; other models load in parallel
+            with key_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry.last_used = time.time()
+                        self.hits += 1
+                        return entry.value
+                    if self._key_locks.get(key) is not key_lock:
+                        # Evicted (and its lock dropped) while we waited; wait on the current lock
+                        continue
+
+                start_time = time.time()
+                value = loader()
+                load_seconds = time.time() - start_time
+
+                with self._lock:
+                    self._entries[key] = _Entry(value, load_seconds)
+                    self.loads += 1
+            self._ensure_reaper()
+            return value
+
+    def _drop(self, key: Hashable):
+        """Remove an entry and its load lock (caller holds self._lock)"""
+        del self._entries[key]
+        self._key_locks.pop(key, None)
+        self.evictions += 1
+
+    @staticmethod
+    def _in_use(entry: _Entry) -> bool:
+        """Whether anything besides the registry still references the model"""
+        # One reference from the entry, one from getrefcount's own argument
+        return sys.getrefcount(entry.value) > 2
+
+    def evict(self, key: Hashable) -> bool:
+        """Drop a model from the registry"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def evict_idle(self) -> int:
+        """
+        Drop every model unused for longer than idle_timeout; returns how many were dropped
+
+        A model some caller still references counts as in use and is kept,
+        however long ago it was last handed out.
+        """
+        if self.idle_timeout is None:
+            return 0
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = []
+            for key, entry in self._entries.items():
+                if self._in_use(entry):
+                    entry.last_used = time.time()
+                elif entry.last_used < cutoff:
+                    idle.append(key)
+            for key in idle:
+                self._drop(key)
+        return len(idle)
+
+    def clear(self):
+        """Drop all registered models"""
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def _ensure_reaper(self):
+        """Start the idle-eviction thread once a timeout is configured"""
+        if self.idle_timeout is None or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        interval = max(1.0, min(60.0, self.idle_timeout / 2))
+
+        def reap():
+            while True:
+                time.sleep(interval)
+                self.evict_idle()
+
+        self._reaper = threading.Thread(target=reap, name="model-registry-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self) -> Dict:
+        """Loaded models and load counters"""
+        with self._lock:
+            now = time.time()
+            return {
+                "loaded": len(self._entries),
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "models": {
+                    repr(key): {
+                        "load_seconds": entry.load_seconds,
+                        "idle_seconds": now - entry.last_used,
+                        "in_use": self._in_use(entry),
+                    }
+                    for key, entry in self._entries.items()
+                },
+            }
+
+
+_idle_timeout = os.getenv("BABEL_MODEL_IDLE_TIMEOUT")
+_registry = ModelRegistry(idle_timeout=float(_idle_timeout) if _idle_timeout else None)
+
+
+def get_registry() -> ModelRegistry:
+    """The registry shared by every translator and transcriber in this process"""
+    return _registry
@@ -0,0 +1,95 @@
+"""
+Export an NLLB checkpoint to ONNX for the ONNX Runtime translation engine
+
+Produces encoder_model.onnx, decoder_model.onnx and decoder_with_past_model.onnx
+(plus the tokenizer) in one directory, optionally with int8 dynamic quantization.
+Exporting needs torch and optimum; running the exported graphs only needs
+onnxruntime, numpy and the tokenizer.
+
+Usage:
+    python onnx_export.py --model facebook/nllb-200-distilled-600M
+    python onnx_export.py --model facebook/nllb-200-distilled-600M --quantize
+"""
+import argparse
+import os
+import shutil
+
+ONNX_MODELS_DIR = os.getenv("BABEL_ONNX_DIR", "./onnx_models")
+
+GRAPH_FILES = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+
+
+def onnx_model_dir(model_size: str, quantized: bool = False, base_dir: str = ONNX_MODELS_DIR) -> str:
+    """Directory holding the exported graphs for a checkpoint"""
+    safe_name = model_size.replace("/", "--")
+    return os.path.join(base_dir, f"{safe_name}-{'int8' if quantized else 'float32'}")
+
+
+def is_exported(output_dir: str) -> bool:
+    """Check whether all graphs needed by the engine are present"""
+    return all(os.path.exists(os.path.join(output_dir, name)) for name in GRAPH_FILES)
+
+
+def quantize_graphs(output_dir: str):
+    """Apply int8 dynamic quantization to every exported graph in place"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    for name in GRAPH_FILES:
+        path = os.path.join(output_dir, name)
+        quantized_path = path + ".int8"
+        print(f"⚙️  Quantizing {name}...")
+        quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8,
+                         use_external_data_format=True)
+        os.replace(quantized_path, path)
+
+
+def export_model(model_size: str, output_dir: str = None, quantize: bool = False) -> str:
+    """
+    Export encoder, decoder and decoder-with-past graphs
+
+    Args:
+        model_size: Hugging Face checkpoint name
+        output_dir: Destination directory (derived from the model name by default)
+        quantize: Apply int8 dynamic quantization after export
+
+    Returns:
+        Path of the directory holding the graphs and tokenizer
+    """
+    output_dir = output_dir or onnx_model_dir(model_size, quantize)
+    if is_exported(output_dir):
+        print(f"✅ ONNX model already exported: {output_dir}")
+        return output_dir
+
+    try:
+        from optimum.exporters.onnx import main_export
+    except ImportError:
+        raise ImportError("ONNX export requires: pip install optimum[exporters] onnxruntime")
+
+    print(f"📦 Exporting {model_size} to ONNX...")
+    temp_dir = output_dir + ".tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    # Separate decoder graphs (no merged If-node graph) keep the runtime loop simple
+    main_export(model_size, output=temp_dir, task="text2text-generation-with-past",
+                no_post_process=True)
+
+    if quantize:
+        quantize_graphs(temp_dir)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(temp_dir, output_dir)
+    print(f"💾 ONNX model saved: {output_dir}")
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export NLLB to ONNX")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--output", default=None, help="Output directory")
+    parser.add_argument("--quantize", action="store_true", help="Apply int8 dynamic quantization")
+    args = parser.parse_args()
+
+    export_model(args.model, args.output, args.quantize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Phrasebook fast path for formulaic utterances
+
+Greetings and meeting phrases ("good morning", "can you hear me?") make up
+much of live traffic. A phrasebook maps each normalized phrase to its
+translation for one language pair, so those utterances skip the model.
+Indexes are built offline by running the translator over a phrase list
+and stored as one compact JSON file per pair; they load lazily on the
+first lookup for that pair. Each file records the model and decoding
+profile that produced it, and is only served to a translator with the
+same model (and to requests decoding with the same profile).
+
+Usage:
+    python phrasebook.py --phrases phrases/en.txt --source en --targets es hi fr
+"""
+import argparse
+import json
+import os
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+PHRASEBOOK_DIR = os.getenv("BABEL_PHRASEBOOK_DIR", "./phrasebooks")
+
+
+def normalize_phrase(text: str) -> str:
+    """NFC, casefold, drop punctuation and collapse whitespace ("Hello, there!" -> "hello there")"""
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = "".join(" " if unicodedata.category(char).startswith("P") else char for char in text)
+    return " ".join(text.split())
+
+
+def phrasebook_path(src_nllb: str, tgt_nllb: str, directory: str = PHRASEBOOK_DIR) -> str:
+    """File holding the index for one NLLB language pair"""
+    return os.path.join(directory, f"{src_nllb}-{tgt_nllb}.json")
+
+
+class Phrasebook:
+    def __init__(self, directory: str = PHRASEBOOK_DIR, model_id: Optional[str] = None):
+        """
+        Lazily loaded phrase -> translation indexes, one per language pair
+
+        Args:
+            directory: Folder with <src_nllb>-<tgt_nllb>.json files; pairs
+                without a file simply never hit
+            model_id: Model the indexes must have been built with (None accepts any;
+                UniversalTranslator binds its own)
+        """
+        self.directory = directory
+        self.model_id = model_id
+        self._indexes: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, model_id: str):
+        """Only serve indexes built with model_id (reloads anything already loaded)"""
+        with self._lock:
+            if model_id != self.model_id:
+                self.model_id = model_id
+                self._indexes.clear()
+
+    def _index(self, src_nllb: str, tgt_nllb: str) -> Dict:
+        key = (src_nllb, tgt_nllb)
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._load(src_nllb, tgt_nllb)
+                    self._indexes[key] = index
+        return index
+
+    def _load(self, src_nllb: str, tgt_nllb: str) -> Dict:
+        """{"entries": ..., "decoding_profile": ...}; no entries if missing or built with another model"""
+        path = phrasebook_path(src_nllb, tgt_nllb, self.directory)
+        if not os.path.exists(path):
+            return {"entries": {}, "decoding_profile": None}
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if self.model_id is not None and data.get("model_id") != self.model_id:
+            print(f"⚠️  Ignoring phrasebook {path}: built with {data.get('model_id')}, "
+                  f"not {self.model_id} (rebuild it with phrasebook.py)")
+            return {"entries": {}, "decoding_profile": None}
+        # Older indexes did not record their profile
+        return {"entries": data["entries"], "decoding_profile": data.get("decoding_profile")}
+
+    def lookup(self, text: str, src_nllb: str, tgt_nllb: str, profile: Optional[str] = None) -> Optional[str]:
+        """Translation of a known phrase, or None (also when the index was built with another profile)"""
+        index = self._index(src_nllb, tgt_nllb)
+        entries = index["entries"]
+        if profile is not None and index["decoding_profile"] not in (None, profile):
+            entries = None
+        translation = entries.get(normalize_phrase(text)) if entries else None
+        if translation is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translation
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and loaded index sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "loaded_pairs": {f"{src}-{tgt}": len(index["entries"]) for (src, tgt), index in self._indexes.items()},
+        }
+
+
+def build_phrasebook(translator, phrases: List[str], source_lang: str, target_lang: str,
+                     directory: str = PHRASEBOOK_DIR) -> str:
+    """
+    Translate a phrase list with the model and write the pair's index
+
+    Args:
+        translator: Final_Optimized_Model.UniversalTranslator
+        phrases: Source-language phrases
+        source_lang: Source language code (e.g. "en")
+        target_lang: Target language code (e.g. "es")
+        directory: Output folder
+
+    Returns:
+        Path of the written index
+    """
+    src_nllb = translator.language_map[source_lang.lower()]
+    tgt_nllb = translator.language_map[target_lang.lower()]
+    # Deduplicate on the normalized form so each entry is translated once
+    unique = {}
+    for phrase in phrases:
+        unique.setdefault(normalize_phrase(phrase), phrase)
+    unique.pop("", None)
+
+    results = translator.translate_many(list(unique.values()), source_lang, target_lang, use_cache=False)
+    entries = {key: result["translated_text"] for key, result in zip(unique, results) if result["success"]}
+
+    os.makedirs(directory, exist_ok=True)
+    path = phrasebook_path(src_nllb, tgt_nllb, directory)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"model_id": translator.model_id, "decoding_profile": translator.decoding_profile.name,
+                   "entries": entries}, f, ensure_ascii=False, separators=(",", ":"))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build phrasebook indexes")
+    parser.add_argument("--phrases", required=True, help="Text file with one source phrase per line")
+    parser.add_argument("--source", default="en")
+    parser.add_argument("--targets", nargs="+", required=True)
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--engine", default="transformers")
+    parser.add_argument("--output", default=PHRASEBOOK_DIR)
+    args = parser.parse_args()
+
+    from Final_Optimized_Model import UniversalTranslator
+
+    with open(args.phrases, 'r', encoding='utf-8') as f:
+        phrases = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    translator = UniversalTranslator(model_size=args.model, engine=args.engine, warmup_pairs=[])
+    for target in args.targets:
+        path = build_phrasebook(translator, phrases, args.source, target, args.output)
+        print(f"📖 {args.source} → {target}: {path}")
+
+
+if __name__ == "__main__":
+    main()
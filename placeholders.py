@@ -0,0 +1,64 @@
+import re
+from typing import List, Optional, Tuple
+
+# Earlier alternatives win, so numbers inside URLs/emails stay part of them. A number
+# must stand alone: start of text, whitespace or an opening bracket/quote before it, and
+# end of text, whitespace or closing punctuation (itself followed by a break) after it,
+# so "v2.0", "COVID-19" or "10:30am" are never split. Inside a number a space only
+# separates thousands ("1 500 000"); "3 4" is two numbers, each restored on its own.
+SPAN_PATTERN = re.compile(
+    r"(?P<url>(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)\]])"
+    r"|(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?P<emoji>[\U0001F000-\U0001FAFF\u2600-\u27BF][\U0001F000-\U0001FAFF\u2600-\u27BF\uFE0F\u200D]*)"
+    r"|(?P<number>(?<![^\s(\[\"'«])\+?(?:\d{1,3}(?: \d{3})+(?!\d)|\d+)(?:[.,:/\-]\d+)*"
+    r"(?=$|\s|[,.;:!?)\]\"'»](?:\s|$)))"
+)
+
+PLACEHOLDER_PATTERN = re.compile(r"\[\s*(\d+)\s*\]")
+
+
+def mask_spans(text: str) -> Tuple[str, List[str]]:
+    """
+    Replace URLs, emails, emoji and numbers with compact placeholders
+
+    "Call +1-555-123-4567 😀" -> ("Call [0] [1]", ["+1-555-123-4567", "😀"])
+
+    Such spans tokenize into many subwords that the model would only copy
+    back one by one. Text that already contains placeholder-like markers is
+    left alone so restoring stays unambiguous.
+    """
+    if PLACEHOLDER_PATTERN.search(text):
+        return text, []
+    spans: List[str] = []
+
+    def replace(match):
+        spans.append(match.group(0))
+        return f"[{len(spans) - 1}]"
+
+    return SPAN_PATTERN.sub(replace, text), spans
+
+
+def restore_spans(text: str, spans: List[str], partial: bool = False) -> Optional[str]:
+    """
+    Put masked spans back; None if the translation lost or invented a placeholder
+
+    partial=True accepts missing placeholders and leaves unknown ones as
+    they are (for hypotheses cut off mid-sentence).
+    """
+    if not spans:
+        return text
+    restored = set()
+    invented = []
+
+    def replace(match):
+        index = int(match.group(1))
+        if index >= len(spans):
+            invented.append(index)
+            return match.group(0)
+        restored.add(index)
+        return spans[index]
+
+    result = PLACEHOLDER_PATTERN.sub(replace, text)
+    if partial:
+        return result
+    return result if not invented and len(restored) == len(spans) else None
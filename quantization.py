@@ -0,0 +1,81 @@
+import os
+import time
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+# Quantized checkpoints are written here once and reloaded on later starts
+QUANTIZED_MODELS_DIR = os.getenv("BABEL_QUANTIZED_DIR", "./quantized_models")
+
+SUPPORTED_PRECISIONS = ("float32", "int8", "bf16")
+
+
+def bf16_supported() -> bool:
+    """Check whether this CPU runs bfloat16 matmuls natively"""
+    try:
+        return bool(torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def resolve_precision(precision: str) -> str:
+    """Validate a precision name, falling back to int8 when bf16 isn't available"""
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision}. Use one of {SUPPORTED_PRECISIONS}")
+    if precision == "bf16" and not bf16_supported():
+        print("⚠️  bf16 not supported on this CPU, falling back to int8")
+        return "int8"
+    return precision
+
+
+def quantized_model_path(model_size: str, precision: str = "int8",
+                         cache_dir: str = QUANTIZED_MODELS_DIR) -> str:
+    """Location of the cached quantized artifact for a checkpoint"""
+    safe_name = model_size.replace("/", "--")
+    return os.path.join(cache_dir, f"{safe_name}-{precision}.pt")
+
+
+def quantize_dynamic_int8(model):
+    """Dynamically quantize every Linear layer to int8 (weights int8, activations quantized on the fly)"""
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_cpu_model(model_size: str, precision: str = "float32", cache_dir: str = QUANTIZED_MODELS_DIR,
+                   **load_options):
+    """
+    Load a seq2seq model for CPU inference at the requested precision
+
+    Args:
+        model_size: Hugging Face checkpoint name
+        precision: "float32", "int8" (dynamic quantization) or "bf16"
+        cache_dir: Directory holding cached quantized artifacts
+        load_options: Extra from_pretrained arguments (e.g. attn_implementation)
+
+    Returns:
+        The loaded model in eval mode
+    """
+    precision = resolve_precision(precision)
+
+    if precision == "bf16":
+        return AutoModelForSeq2SeqLM.from_pretrained(model_size, torch_dtype=torch.bfloat16, **load_options).eval()
+
+    if precision == "float32":
+        return AutoModelForSeq2SeqLM.from_pretrained(model_size, torch_dtype=torch.float32, **load_options).eval()
+
+    path = quantized_model_path(model_size, precision, cache_dir)
+    if os.path.exists(path):
+        print(f"📦 Loading cached int8 model: {path}")
+        # Trusted local artifact written by this module
+        return torch.load(path, weights_only=False).eval()
+
+    print("⚙️  Quantizing model to int8 (one-time cost)...")
+    start_time = time.time()
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_size, torch_dtype=torch.float32, **load_options)
+    model = quantize_dynamic_int8(model)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = path + ".tmp"
+    torch.save(model, temp_path)
+    os.replace(temp_path, path)
+    print(f"💾 Quantized model saved: {path} ({time.time() - start_time:.1f}s)")
+    return model
@@ -0,0 +1,95 @@
+from typing import List, Tuple
+
+# Terminators that end a sentence even without a following space
+# (Devanagari danda/double danda, CJK full stops, Urdu full stop, Arabic question mark)
+NO_SPACE_TERMINATORS = "।॥。！？｡．۔؟"
+# Terminators that only end a sentence when followed by whitespace or end of text
+SPACE_TERMINATORS = ".!?…"
+# Closing quotes/brackets that belong to the sentence they follow
+CLOSERS = "\"'”’)]}»」』）】"
+
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "fig", "approx", "dept", "inc", "ltd", "co",
+}
+# Abbreviations only before a number ("No. 5"); otherwise they are ordinary words ("I said no.")
+NUMBER_ABBREVIATIONS = {"no"}
+
+
+def _is_abbreviation(text: str, period_index: int) -> bool:
+    """Check whether the period at period_index ends a known abbreviation or an initial"""
+    start = period_index
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    word = text[start:period_index].lower()
+    if word in NUMBER_ABBREVIATIONS:
+        next_index = _whitespace_end(text, period_index + 1)
+        return next_index < len(text) and text[next_index].isdigit()
+    return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def _whitespace_end(text: str, index: int) -> int:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """
+    Split text into sentences while keeping the whitespace between them
+
+    Args:
+        text: Input text in any script
+
+    Returns:
+        List of (sentence, trailing_whitespace) pairs. Joining every sentence
+        and its whitespace reproduces the original text exactly, so newlines
+        and paragraph breaks survive a round trip. Leading whitespace is
+        returned as an empty first sentence.
+    """
+    pieces = []
+    leading_end = _whitespace_end(text, 0)
+    if leading_end:
+        pieces.append(("", text[:leading_end]))
+
+    start = leading_end
+    i = start
+    while i < len(text):
+        char = text[i]
+        boundary = None
+
+        if char == "\n":
+            boundary = i
+        elif char in NO_SPACE_TERMINATORS or char in SPACE_TERMINATORS:
+            end = i + 1
+            while end < len(text) and (text[end] in NO_SPACE_TERMINATORS
+                                       or text[end] in SPACE_TERMINATORS
+                                       or text[end] in CLOSERS):
+                end += 1
+            at_break = end == len(text) or text[end].isspace()
+            if char in NO_SPACE_TERMINATORS or at_break:
+                if not (char == "." and end == i + 1 and _is_abbreviation(text, i)):
+                    boundary = end
+            i = end - 1
+
+        if boundary is not None:
+            whitespace_end = _whitespace_end(text, boundary)
+            sentence = text[start:boundary]
+            # Spaces before a newline belong to the separator, not the sentence
+            stripped = sentence.rstrip()
+            pieces.append((stripped, sentence[len(stripped):] + text[boundary:whitespace_end]))
+            start = whitespace_end
+            i = whitespace_end
+            continue
+        i += 1
+
+    if start < len(text):
+        sentence = text[start:]
+        stripped = sentence.rstrip()
+        pieces.append((stripped, sentence[len(stripped):]))
+    return pieces
+
+
+def join_sentences(translations: List[str], pieces: List[Tuple[str, str]]) -> str:
+    """Reassemble translated sentences with the original whitespace from split_sentences"""
+    return "".join(translated + whitespace for translated, (_, whitespace) in zip(translations, pieces))
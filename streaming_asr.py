@@ -0,0 +1,241 @@
+"""
+Streaming speech recognition on top of faster-whisper
+
+A sliding window of recent audio is re-decoded every step_seconds. Words
+are committed only once consecutive hypotheses agree on them
+(LocalAgreement-2): the text a user sees never flickers once committed, and
+words are never split at a chunk boundary because the window still holds
+the audio around them. The unstable tail is reported as tentative text.
+When a committed word closes a sentence, or the window grows past
+max_window_seconds, the committed text is emitted as final and the window
+is trimmed to the end of that word.
+"""
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# (start seconds, end seconds, text) in stream time
+Word = Tuple[float, float, str]
+
+SENTENCE_END = (".", "?", "!", "。", "？", "！", "।")
+
+
+def _normalize(word: str) -> str:
+    return word.strip().lower().strip(",.?!;:\"'")
+
+
+def _join(words: List[Word]) -> str:
+    return "".join(word for _, _, word in words).strip()
+
+
+class StreamingTranscriber:
+    def __init__(self, model, sample_rate: int = 16000, language: Optional[str] = None,
+                 step_seconds: float = 0.5, max_window_seconds: float = 15.0, beam_size: int = 1,
+                 agreement: int = 2):
+        """
+        Incremental transcription with a stable-prefix commit policy
+
+        Args:
+            model: faster_whisper.WhisperModel (tiny/base/small keep first text under a second on CPU)
+            sample_rate: Rate of inserted audio
+            language: Force a language (None detects it on each decode)
+            step_seconds: New audio needed before the window is decoded again
+            max_window_seconds: Window length at which committed text is finalized regardless of punctuation
+            beam_size: Beam size per decode (1 = greedy, lowest latency)
+            agreement: Consecutive hypotheses that must agree before a word is committed
+        """
+        self.model = model
+        self.sample_rate = sample_rate
+        self.language = language
+        self.step_samples = int(step_seconds * sample_rate)
+        self.max_window_samples = int(max_window_seconds * sample_rate)
+        self.beam_size = beam_size
+        self.agreement = max(2, agreement)
+
+        # Window storage is allocated once; trimming shifts it in place
+        self._window = np.zeros(self.max_window_samples + 4 * self.step_samples, dtype=np.float32)
+        self._length = 0
+        self._window_start = 0.0
+        self._pending = 0
+        self._stream_samples = 0
+
+        self._committed: List[Word] = []
+        self._committed_end = 0.0
+        self._hypotheses: List[List[Word]] = []
+        self._tentative: List[Word] = []
+        self._finalized: List[str] = []
+
+        self.detected_language: Optional[str] = language
+        self.decodes = 0
+        self.decode_seconds = 0.0
+        self.dropped_seconds = 0.0
+        self.first_text_latency: Optional[float] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def stream_seconds(self) -> float:
+        return self._stream_samples / self.sample_rate
+
+    def insert_audio(self, samples: np.ndarray):
+        """Append mono float32 samples to the window"""
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        samples = samples[-len(self._window):]
+        count = len(samples)
+        overflow = self._length + count - len(self._window)
+        if overflow > 0:
+            # process() was not called for a long time: drop the oldest audio
+            self._trim_samples(overflow)
+            self.dropped_seconds += overflow / self.sample_rate
+        self._window[self._length:self._length + count] = samples
+        self._length += count
+        self._pending += count
+        self._stream_samples += count
+
+    def process(self) -> List[Dict]:
+        """Decode the window if a full step of new audio arrived; returns the resulting events"""
+        if self._pending < self.step_samples:
+            return []
+        self._pending = 0
+        events = self._update(self._decode())
+        if self._length > self.max_window_samples:
+            events.extend(self._finalize(force=True))
+        return events
+
+    def finish(self) -> List[Dict]:
+        """End of stream: decode what is left and finalize everything, tentative words included"""
+        events = []
+        if self._length:
+            events.extend(self._update(self._decode()))
+        if self._tentative:
+            self._committed.extend(self._tentative)
+            self._committed_end = self._tentative[-1][1]
+            self._tentative = []
+        events.extend(self._finalize(force=True))
+        self._hypotheses = []
+        return events
+
+    def iter_events(self, chunks: Iterable[np.ndarray]) -> Iterator[Dict]:
+        """Feed audio chunks and yield partial/final events as they become available"""
+        for chunk in chunks:
+            self.insert_audio(chunk)
+            yield from self.process()
+        yield from self.finish()
+
+    def _prompt(self) -> Optional[str]:
+        """Recent text as the decoder prompt, so each window continues the transcript"""
+        text = " ".join(self._finalized[-3:] + ([_join(self._committed)] if self._committed else []))
+        return text[-200:] or None
+
+    def _decode(self) -> List[Word]:
+        start_time = time.perf_counter()
+        segments, info = self.model.transcribe(
+            self._window[:self._length],
+            language=self.language,
+            beam_size=self.beam_size,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=self._prompt(),
+            vad_filter=False
+        )
+        words = [
+            (self._window_start + word.start, self._window_start + word.end, word.word)
+            for segment in segments for word in (segment.words or [])
+        ]
+        self.decodes += 1
+        self.decode_seconds += time.perf_counter() - start_time
+        if self.language is None:
+            self.detected_language = info.language
+        return words
+
+    def _fresh_words(self, words: List[Word]) -> List[Word]:
+        """Words after the commit point, minus a re-decoded copy of the committed tail"""
+        fresh = [word for word in words if word[0] > self._committed_end - 0.1]
+        tail = [_normalize(text) for _, _, text in self._committed[-5:]]
+        for size in range(min(len(tail), len(fresh)), 0, -1):
+            if [_normalize(text) for _, _, text in fresh[:size]] == tail[-size:]:
+                return fresh[size:]
+        return fresh
+
+    def _update(self, words: List[Word]) -> List[Dict]:
+        """LocalAgreement: commit the prefix shared by the last `agreement` hypotheses"""
+        fresh = self._fresh_words(words)
+        self._hypotheses = (self._hypotheses + [fresh])[-self.agreement:]
+
+        agreed = 0
+        if len(self._hypotheses) == self.agreement:
+            for position in range(min(len(h) for h in self._hypotheses)):
+                texts = {_normalize(h[position][2]) for h in self._hypotheses}
+                if len(texts) != 1:
+                    break
+                agreed = position + 1
+
+        if agreed:
+            self._committed.extend(fresh[:agreed])
+            self._committed_end = fresh[agreed - 1][1]
+            # Older hypotheses only matter beyond what was just committed
+            self._hypotheses = [h[agreed:] for h in self._hypotheses]
+        previous_tentative = _join(self._tentative)
+        self._tentative = fresh[agreed:]
+
+        events = []
+        if agreed or _join(self._tentative) != previous_tentative:
+            events.append(self._event("partial", fresh[:agreed]))
+        if self._committed and self._committed[-1][2].strip().endswith(SENTENCE_END):
+            events.extend(self._finalize())
+        return events
+
+    def _event(self, kind: str, newly_committed: List[Word]) -> Dict:
+        committed_text = _join(self._committed)
+        tentative_text = _join(self._tentative) if kind == "partial" else ""
+        words = self._committed + (self._tentative if kind == "partial" else [])
+        if self.first_text_latency is None and words:
+            self.first_text_latency = time.perf_counter() - self._started_at
+        return {
+            "type": kind,
+            "text": " ".join(part for part in (committed_text, tentative_text) if part),
+            "committed": committed_text,
+            "new_committed": _join(newly_committed),
+            "tentative": tentative_text,
+            "start": words[0][0] if words else self._committed_end,
+            "end": words[-1][1] if words else self._committed_end,
+            "language": self.detected_language,
+        }
+
+    def _finalize(self, force: bool = False) -> List[Dict]:
+        """Emit committed text as final and drop its audio from the window"""
+        events = []
+        if self._committed:
+            events.append(self._event("final", self._committed))
+            self._finalized.append(_join(self._committed))
+            self._committed = []
+            self._trim_to(self._committed_end)
+        elif force and self._length > self.max_window_samples:
+            # Nothing stable yet in a full window (noise, music): keep only its recent half
+            self._trim_samples(self._length - self.max_window_samples // 2)
+            self._hypotheses = []
+        return events
+
+    def _trim_to(self, seconds: float):
+        self._trim_samples(int((seconds - self._window_start) * self.sample_rate))
+
+    def _trim_samples(self, count: int):
+        count = max(0, min(count, self._length))
+        if not count:
+            return
+        remaining = self._length - count
+        self._window[:remaining] = self._window[count:self._length]
+        self._length = remaining
+        self._window_start += count / self.sample_rate
+
+    def stats(self) -> Dict:
+        """Decode cost relative to audio time, and how fast the first text appeared"""
+        return {
+            "decodes": self.decodes,
+            "avg_decode_ms": self.decode_seconds / self.decodes * 1000 if self.decodes else 0.0,
+            "real_time_factor": self.decode_seconds / self.stream_seconds if self.stream_seconds else 0.0,
+            "first_text_latency": self.first_text_latency,
+            "window_seconds": self._length / self.sample_rate,
+            "dropped_seconds": self.dropped_seconds,
+        }
@@ -0,0 +1,73 @@
+import os
+import sys
+
+# Shared modules live at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pytest
+
+
+def build_tiny_nllb(directory: str, seed: int = 0):
+    """
+    Save a tiny random M2M100 model with an NLLB tokenizer to directory
+
+    The tokenizer has a few dozen word pieces plus every NLLB language code,
+    so engines and translators load it exactly like a real checkpoint
+    without any download. Outputs are meaningless but deterministic; every
+    seed gives different weights over the same vocabulary.
+    """
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("tokenizers")
+    transformers = pytest.importorskip("transformers")
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers
+
+    pieces = ["▁hello", "▁world", "▁the", "▁cat", "▁sat", "▁on", "▁mat", "▁a", "▁dog", "▁"]
+    pieces += list("abcdefghijklmnopqrstuvwxyz0123456789")
+    vocab = [("<s>", 0.0), ("<pad>", 0.0), ("</s>", 0.0), ("<unk>", 0.0)]
+    vocab += [(piece, -1.0 - i * 0.01) for i, piece in enumerate(pieces)]
+    backend = Tokenizer(models.Unigram(vocab, unk_id=3))
+    backend.pre_tokenizer = pre_tokenizers.Metaspace()
+    backend.decoder = decoders.Metaspace()
+    os.makedirs(directory, exist_ok=True)
+    backend.save(os.path.join(directory, "tokenizer.json"))
+    tokenizer = transformers.NllbTokenizerFast(tokenizer_file=os.path.join(directory, "tokenizer.json"))
+    tokenizer.save_pretrained(directory)
+
+    torch.manual_seed(seed)
+    config = transformers.M2M100Config(
+        vocab_size=len(tokenizer), d_model=16, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, init_std=1.0, pad_token_id=tokenizer.pad_token_id, bos_token_id=0,
+        eos_token_id=tokenizer.eos_token_id, decoder_start_token_id=tokenizer.eos_token_id
+    )
+    model = transformers.M2M100ForConditionalGeneration(config).eval()
+    with torch.no_grad():
+        # Language codes would otherwise dominate the output; scaled down they still steer it
+        model.get_input_embeddings().weight[len(vocab):] *= 0.2
+    model.save_pretrained(directory)
+    return tokenizer, model
+
+
+@pytest.fixture(scope="session")
+def tiny_nllb(tmp_path_factory):
+    """(directory, tokenizer, model) of a tiny random NLLB-style checkpoint"""
+    directory = str(tmp_path_factory.mktemp("tiny-nllb"))
+    tokenizer, model = build_tiny_nllb(directory)
+    return directory, tokenizer, model
+
+
+@pytest.fixture
+def make_translator(tiny_nllb, tmp_path):
+    """Build a Final_Optimized_Model.UniversalTranslator on the tiny checkpoint (no warm-up, empty phrasebook)"""
+    from Final_Optimized_Model import UniversalTranslator
+    from phrasebook import Phrasebook
+
+    def make(engine: str = "transformers", engine_options=None, **kwargs):
+        kwargs.setdefault("warmup_pairs", [])
+        kwargs.setdefault("phrasebook", Phrasebook(str(tmp_path / "phrasebook")))
+        kwargs.setdefault("mask_placeholders", False)
+        return UniversalTranslator(model_size=tiny_nllb[0], device="cpu", engine=engine,
+                                   engine_options=engine_options, **kwargs)
+    return make
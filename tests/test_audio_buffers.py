@@ -0,0 +1,108 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_buffers import AudioRingBuffer
+
+
+def ramp(start, count):
+    return np.arange(start, start + count, dtype=np.float32)
+
+
+def test_read_returns_samples_in_order_across_the_wrap():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 7))
+    assert ring.read(5).tolist() == ramp(0, 5).tolist()
+    ring.write(ramp(7, 6))
+    assert ring.available() == 8
+    assert ring.read(100).tolist() == ramp(5, 8).tolist()
+    assert ring.available() == 0
+
+
+def test_overflow_drops_the_oldest_unread_samples():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 8))
+    ring.write(ramp(8, 8))
+    assert ring.overflows == 1
+    assert ring.dropped_samples == 6
+    assert ring.read(10).tolist() == ramp(6, 10).tolist()
+
+
+def test_oversized_write_keeps_its_tail():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 25))
+    assert ring.read(10).tolist() == ramp(15, 10).tolist()
+    assert ring.total_seconds == 2.5
+
+
+def test_read_into_a_preallocated_array():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    out = np.zeros(10, dtype=np.float32)
+    ring.write(ramp(1, 4))
+    view = ring.read(10, out=out)
+    assert view.base is out
+    assert view.tolist() == ramp(1, 4).tolist()
+
+
+def test_latest_and_consume():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 6))
+    assert ring.latest(3).tolist() == ramp(3, 3).tolist()
+    assert ring.available() == 6
+    ring.consume(4)
+    assert ring.read(10).tolist() == ramp(4, 2).tolist()
+
+
+def test_callback_takes_the_first_channel():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+
+    class Status:
+        input_overflow = True
+
+    ring.callback(np.stack([ramp(0, 4), -ramp(0, 4)], axis=1), 3, None, Status())
+    assert ring.read(10).tolist() == ramp(0, 3).tolist()
+    assert ring.stats()["input_overflows"] == 1
+
+
+class Interleaved:
+    """Ring storage that runs a callback (the other thread) just before its first get or set"""
+
+    def __init__(self, data, on_get=None, on_set=None):
+        self.data = data
+        self.on_get = on_get
+        self.on_set = on_set
+
+    def __getitem__(self, index):
+        on_get, self.on_get = self.on_get, None
+        if on_get:
+            on_get()
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        on_set, self.on_set = self.on_set, None
+        if on_set:
+            on_set()
+        self.data[index] = value
+
+
+def test_read_drops_samples_overwritten_during_the_copy():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 10))
+    ring._data = Interleaved(ring._data, on_get=lambda: ring.write(ramp(10, 4)))
+
+    # 0-3 were replaced by 10-13 while being copied; they must not come back as old audio
+    assert ring.read(10).tolist() == ramp(4, 6).tolist()
+    assert ring.read(10).tolist() == ramp(10, 4).tolist()
+
+
+def test_oversized_write_publishes_only_after_copying():
+    ring = AudioRingBuffer(capacity_seconds=1.0, sample_rate=10)
+    ring.write(ramp(0, 5))
+    seen = []
+    ring._data = Interleaved(ring._data, on_set=lambda: seen.append(ring.read(10).tolist()))
+
+    ring.write(ramp(5, 25))
+    # The concurrent read sees neither unwritten slots nor samples the write is replacing
+    assert seen == [[]]
+    assert ring.read(10).tolist() == ramp(20, 10).tolist()
+    assert ring.total_seconds == 3.0
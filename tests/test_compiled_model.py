@@ -0,0 +1,67 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+import compiled_model
+from compiled_model import _bucket, compile_model
+
+
+def test_bucket_rounds_up_and_keeps_oversized_values():
+    assert _bucket(1, (16, 32)) == 16
+    assert _bucket(16, (16, 32)) == 16
+    assert _bucket(17, (16, 32)) == 32
+    assert _bucket(40, (16, 32)) == 40
+
+
+@pytest.fixture
+def bucketed(tiny_nllb, monkeypatch):
+    """(reference model, bucketed model, encoder input shapes seen) with torch.compile left out"""
+    from transformers import AutoModelForSeq2SeqLM
+
+    shapes = []
+
+    def fake_compile(fn, dynamic=None, **kwargs):
+        def run(*args, **inputs):
+            # Only the encoder is compiled with static shapes
+            if dynamic is False and "input_ids" in inputs:
+                shapes.append(tuple(inputs["input_ids"].shape))
+            return fn(*args, **inputs)
+        return run
+
+    # Bucketing is what is under test; inductor itself is torch's concern
+    monkeypatch.setattr(compiled_model.torch, "compile", fake_compile)
+    reference = AutoModelForSeq2SeqLM.from_pretrained(tiny_nllb[0]).eval()
+    model = compile_model(AutoModelForSeq2SeqLM.from_pretrained(tiny_nllb[0]).eval(),
+                          tiny_nllb[1].pad_token_id, length_buckets=(8, 16), batch_buckets=(1, 4))
+    return reference, model, shapes
+
+
+def test_padded_encoder_output_equals_unpadded(bucketed, tiny_nllb):
+    reference, model, shapes = bucketed
+    tokenizer = tiny_nllb[1]
+    tokenizer.src_lang = "eng_Latn"
+    inputs = tokenizer(["hello world, the cat sat on a mat", "a dog"], padding=True, return_tensors="pt")
+
+    with torch.no_grad():
+        expected = reference.get_encoder()(**inputs).last_hidden_state
+        actual = model.get_encoder()(**inputs).last_hidden_state
+
+    assert shapes == [(4, 16)]
+    assert actual.shape == expected.shape
+    mask = inputs["attention_mask"].bool()
+    assert torch.allclose(actual[mask], expected[mask], atol=1e-5)
+
+
+def test_bucketed_model_generates_the_same_tokens(bucketed, tiny_nllb):
+    reference, model, shapes = bucketed
+    tokenizer = tiny_nllb[1]
+    tokenizer.src_lang = "eng_Latn"
+    inputs = tokenizer(["hello world", "the cat sat on a mat", "a dog"], padding=True, return_tensors="pt")
+    options = {"forced_bos_token_id": tokenizer.convert_tokens_to_ids("fra_Latn"), "max_new_tokens": 8}
+
+    for num_beams in (1, 3):
+        with torch.no_grad():
+            expected = reference.generate(**inputs, num_beams=num_beams, **options)
+            actual = model.generate(**inputs, num_beams=num_beams, **options)
+        assert torch.equal(actual, expected)
+    assert set(shapes) == {(4, 8)}
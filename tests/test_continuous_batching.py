@@ -0,0 +1,56 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+
+@pytest.fixture
+def batcher(tiny_nllb, monkeypatch):
+    from continuous_batching import ContinuousBatcher
+
+    _, tokenizer, model = tiny_nllb
+    batcher = ContinuousBatcher(model, tokenizer, max_running=8)
+    # Drive the decode loop by hand so the join point is deterministic
+    monkeypatch.setattr(batcher, "_ensure_started", lambda: None)
+    return batcher
+
+
+def generate(tiny_nllb, text: str, tgt_nllb: str, max_length: int) -> str:
+    _, tokenizer, model = tiny_nllb
+    tokenizer.src_lang = "eng_Latn"
+    inputs = tokenizer(text, return_tensors="pt")
+    with torch.inference_mode():
+        output = model.generate(**inputs, num_beams=1, do_sample=False, max_length=max_length,
+                                forced_bos_token_id=tokenizer.convert_tokens_to_ids(tgt_nllb))
+    return tokenizer.decode(output[0], skip_special_tokens=True)
+
+
+def run(batcher, steps: int = None):
+    """Admit queued requests and decode until nothing runs (or for a number of steps)"""
+    while batcher._running or not batcher._pending.empty():
+        if steps is not None:
+            if steps == 0:
+                return
+            steps -= 1
+        batcher._admit(block=False)
+        batcher._step()
+
+
+def test_batch_matches_greedy_generate(batcher, tiny_nllb):
+    texts = ["hello world", "the cat sat on a mat", "a dog"]
+    futures = [batcher.submit(text, "eng_Latn", "fra_Latn", max_length=16) for text in texts]
+    run(batcher)
+    assert [future.result() for future in futures] == [generate(tiny_nllb, text, "fra_Latn", 16) for text in texts]
+
+
+def test_request_joining_mid_run_matches_greedy_generate(batcher, tiny_nllb):
+    first = batcher.submit("the cat sat on a mat", "eng_Latn", "fra_Latn", max_length=24)
+    run(batcher, steps=5)
+    assert not first.done()
+    # Joins with an empty self-attention cache next to a row five tokens in
+    joined = [batcher.submit("hello world", "eng_Latn", "deu_Latn", max_length=12),
+              batcher.submit("a dog", "eng_Latn", "fra_Latn", max_length=20)]
+    run(batcher)
+    assert first.result() == generate(tiny_nllb, "the cat sat on a mat", "fra_Latn", 24)
+    assert joined[0].result() == generate(tiny_nllb, "hello world", "deu_Latn", 12)
+    assert joined[1].result() == generate(tiny_nllb, "a dog", "fra_Latn", 20)
+    assert batcher.stats()["completed"] == 3
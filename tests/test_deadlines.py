@@ -0,0 +1,33 @@
+import time
+
+from deadlines import Deadline, DeadlineExceeded, deadline_expired, timeout_result
+
+
+def test_deadline_expires_and_remembers_it():
+    deadline = Deadline(0.02)
+    assert not deadline.expired()
+    assert deadline.remaining() > 0
+    time.sleep(0.03)
+    assert deadline.expired()
+    assert deadline.exceeded
+    # Only engines that stop unfinished work mark a deadline as cutting output short
+    assert not deadline.cut_short
+
+
+def test_missing_deadline_never_expires():
+    assert not deadline_expired(None)
+    assert deadline_expired(Deadline(0))
+
+
+def test_latest_combines_a_batch():
+    early, late = Deadline(1), Deadline(5)
+    combined = Deadline.latest([early, late])
+    assert combined.expires_at == late.expires_at
+    assert Deadline.latest([early, None]) is None
+    assert Deadline.latest([]) is None
+
+
+def test_timeout_result_shape():
+    result = timeout_result()
+    assert result["success"] is False and result["timed_out"] is True
+    assert issubclass(DeadlineExceeded, TimeoutError)
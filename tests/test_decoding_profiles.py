@@ -0,0 +1,50 @@
+import pytest
+
+from decoding_profiles import OPTIMIZATION_PROFILES, PROFILES, DecodingProfile, get_profile
+
+
+def test_get_profile_resolves_names_and_instances():
+    assert get_profile("FAST") is PROFILES["fast"]
+    custom = DecodingProfile("custom", num_beams=2)
+    assert get_profile(custom) is custom
+    with pytest.raises(ValueError):
+        get_profile("turbo")
+    assert set(OPTIMIZATION_PROFILES.values()) <= set(PROFILES)
+
+
+def test_output_cap_scales_with_input_and_respects_max_length():
+    fast = PROFILES["fast"]
+    # 1.5 * 4 + 8
+    assert fast.max_new_tokens(4, 256) == 14
+    assert fast.max_new_tokens(400, 256) == 256
+
+
+def test_engine_settings_only_include_what_the_profile_changes():
+    assert PROFILES["fast"].engine_settings(4, 256) == {"max_new_tokens": 14, "no_repeat_ngram_size": 4}
+    assert PROFILES["balanced"].engine_settings(4, 256) == {
+        "max_new_tokens": 18, "length_penalty": 1.0, "early_stopping": True
+    }
+    assert PROFILES["quality"].engine_settings(4, 256)["repetition_penalty"] == 1.1
+
+
+def test_translator_decodes_and_caches_per_profile(make_translator):
+    from translation_cache import TranslationCache
+
+    translator = make_translator("transformers", decoding_profile="fast", translation_cache=TranslationCache())
+    calls = []
+    translate_batch = translator.engine.translate_batch
+
+    def recording(texts, src_nllb, tgt_nllb, max_length=256, num_beams=3, **kwargs):
+        calls.append((num_beams, kwargs.get("decoding")))
+        return translate_batch(texts, src_nllb, tgt_nllb, max_length, num_beams, **kwargs)
+
+    translator.engine.translate_batch = recording
+    assert translator.translate_fast("hello world", "en", "fr")["cached"] is False
+    assert calls[-1][0] == 1 and calls[-1][1]["no_repeat_ngram_size"] == 4
+    assert translator.translate_fast("hello world", "en", "fr")["cached"] is True
+
+    # A different profile may decode differently, so it must not be served the cached output
+    assert translator.translate_fast("hello world", "en", "fr", profile="quality")["cached"] is False
+    assert calls[-1][0] == 5 and calls[-1][1]["repetition_penalty"] == 1.1
+    assert translator.translate_fast("hello world", "en", "fr", profile="quality")["cached"] is True
+    assert len(calls) == 2
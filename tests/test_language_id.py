@@ -0,0 +1,59 @@
+import pytest
+
+from language_id import LanguageIdentifier
+
+
+@pytest.fixture
+def identifier(tmp_path):
+    # No fastText model on disk: the built-in classifier answers
+    return LanguageIdentifier(model_path=str(tmp_path / "missing.ftz"))
+
+
+@pytest.mark.parametrize("text, language", [
+    ("Hello, how are you today?", "en"),
+    ("Hola, ¿cómo estás? Gracias por todo", "es"),
+    ("Bonjour, merci pour le café", "fr"),
+    ("Guten Morgen, wie geht es dir?", "de"),
+    ("こんにちは、元気ですか", "ja"),
+    ("你好，今天天气很好", "zh"),
+    ("안녕하세요", "ko"),
+    ("Привет, как дела? Спасибо", "ru"),
+    ("यह मेरा घर है और मैं यहाँ हूँ", "hi"),
+])
+def test_builtin_detection(identifier, text, language):
+    assert identifier.detect(text)[0] == language
+    assert identifier.stats()["backend"] == "builtin"
+
+
+def test_unsure_input_returns_none(identifier):
+    assert identifier.detect("12345 !!!") == (None, 0.0)
+
+
+def test_shared_script_falls_back_to_its_default(identifier):
+    # Devanagari without any function word still resolves to Hindi, at reduced confidence
+    lang, confidence = identifier.detect("भारत")
+    assert lang == "hi"
+    assert 0 < confidence < 1
+
+
+def test_only_allowed_languages_are_returned(tmp_path):
+    identifier = LanguageIdentifier(model_path=str(tmp_path / "missing.ftz"), languages=["en", "es"])
+    assert identifier.detect("안녕하세요")[0] is None
+    assert identifier.detect("Bonjour, merci pour le café")[0] in (None, "en", "es")
+
+
+def test_low_confidence_is_rejected(tmp_path):
+    identifier = LanguageIdentifier(model_path=str(tmp_path / "missing.ftz"), min_confidence=0.99)
+    lang, confidence = identifier.detect("भारत")
+    assert lang is None
+    assert confidence > 0
+
+
+def test_concurrent_detections_are_all_counted(identifier):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(identifier.detect, ["Hello, how are you today?"] * 400))
+    stats = identifier.stats()
+    assert stats["detections"] == 400
+    assert stats["avg_ms"] > 0
@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+import model_registry
+from model_registry import ModelRegistry
+
+
+class Model:
+    pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for the registry: advance it with clock.now += seconds"""
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(model_registry.time, "time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ModelRegistry(idle_timeout=60)
+    # Tests call evict_idle themselves
+    monkeypatch.setattr(registry, "_ensure_reaper", lambda: None)
+    return registry
+
+
+def test_concurrent_callers_share_one_load(registry):
+    loads = []
+    started = threading.Event()
+
+    def loader():
+        loads.append(1)
+        started.wait(1)
+        return Model()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("m", loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_model_in_use_is_not_evicted(registry, clock):
+    model = registry.get("m", Model)
+    clock.now += 3600
+    assert registry.evict_idle() == 0
+    # Still the same copy; no second load next to the one in use
+    assert registry.get("m", Model) is model
+    assert registry.stats()["loads"] == 1
+
+
+def test_idle_time_counts_from_the_last_user_letting_go(registry, clock):
+    model = registry.get("m", Model)
+    clock.now += 3600
+    registry.evict_idle()
+    del model
+    clock.now += 30
+    assert registry.evict_idle() == 0
+    clock.now += 31
+    assert registry.evict_idle() == 1
+    assert registry.stats()["loaded"] == 0
+
+
+def test_eviction_drops_the_key_lock(registry, clock):
+    registry.get("a", Model)
+    registry.get("b", Model)
+    registry.get("c", Model)
+    assert set(registry._key_locks) == {"a", "b", "c"}
+
+    clock.now += 120
+    assert registry.evict_idle() == 3
+    assert registry._key_locks == {}
+
+    registry.get("a", Model)
+    assert registry.evict("a")
+    assert registry._key_locks == {}
+    assert registry.stats()["evictions"] == 4
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from onnx_export import GRAPH_FILES, export_model, is_exported, onnx_model_dir
+
+
+def test_onnx_model_dir_names_the_precision(tmp_path):
+    base_dir = str(tmp_path)
+    assert onnx_model_dir("facebook/nllb-200-distilled-600M", base_dir=base_dir) == \
+        os.path.join(base_dir, "facebook--nllb-200-distilled-600M-float32")
+    assert onnx_model_dir("facebook/nllb-200-distilled-600M", quantized=True, base_dir=base_dir) == \
+        os.path.join(base_dir, "facebook--nllb-200-distilled-600M-int8")
+
+
+def test_is_exported_needs_every_graph(tmp_path):
+    assert not is_exported(str(tmp_path / "missing"))
+    for name in GRAPH_FILES:
+        assert not is_exported(str(tmp_path))
+        (tmp_path / name).write_bytes(b"")
+    assert is_exported(str(tmp_path))
+
+
+def test_existing_export_is_reused_without_the_exporter(tmp_path, monkeypatch):
+    import sys
+
+    for name in GRAPH_FILES:
+        (tmp_path / name).write_bytes(b"")
+    # A None entry makes the optimum import fail; a finished export must not need it
+    monkeypatch.setitem(sys.modules, "optimum.exporters.onnx", None)
+    assert export_model("facebook/nllb-200-distilled-600M", str(tmp_path)) == str(tmp_path)
+
+
+def test_onnxruntime_engine_requires_an_export_when_not_exporting(tmp_path):
+    pytest.importorskip("onnxruntime")
+    from translation_engines import OnnxRuntimeEngine
+
+    with pytest.raises(FileNotFoundError):
+        OnnxRuntimeEngine("facebook/nllb-200-distilled-600M", "cpu", model_dir=str(tmp_path),
+                          export_if_missing=False)
@@ -0,0 +1,65 @@
+import json
+from types import SimpleNamespace
+
+from phrasebook import Phrasebook, build_phrasebook, normalize_phrase, phrasebook_path
+
+
+class EchoTranslator:
+    """Just enough of UniversalTranslator for build_phrasebook"""
+
+    language_map = {"en": "eng_Latn", "es": "spa_Latn"}
+    model_id = "nllb:test"
+    decoding_profile = SimpleNamespace(name="balanced")
+
+    def __init__(self):
+        self.calls = []
+
+    def translate_many(self, texts, source_lang, target_lang, use_cache=True):
+        self.calls.append(list(texts))
+        return [{"success": True, "translated_text": text.upper()} for text in texts]
+
+
+def write_index(directory, model_id="nllb:test", profile="balanced", entries=None):
+    path = phrasebook_path("eng_Latn", "spa_Latn", str(directory))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"model_id": model_id, "decoding_profile": profile,
+                   "entries": entries or {"good morning": "buenos días"}}, f)
+
+
+def test_normalize_phrase():
+    assert normalize_phrase("  Good   Morning!! ") == "good morning"
+    assert normalize_phrase("Can you hear me?") == "can you hear me"
+
+
+def test_lookup_hits_normalized_text(tmp_path):
+    write_index(tmp_path)
+    phrasebook = Phrasebook(str(tmp_path), model_id="nllb:test")
+    assert phrasebook.lookup("Good morning!", "eng_Latn", "spa_Latn") == "buenos días"
+    assert phrasebook.lookup("Good evening", "eng_Latn", "spa_Latn") is None
+    assert phrasebook.lookup("Good morning", "eng_Latn", "fra_Latn") is None
+    assert phrasebook.stats()["hits"] == 1 and phrasebook.stats()["misses"] == 2
+
+
+def test_index_from_another_model_is_ignored(tmp_path):
+    write_index(tmp_path, model_id="nllb:other")
+    phrasebook = Phrasebook(str(tmp_path))
+    phrasebook.bind("nllb:test")
+    assert phrasebook.lookup("good morning", "eng_Latn", "spa_Latn") is None
+
+
+def test_index_from_another_profile_only_serves_that_profile(tmp_path):
+    write_index(tmp_path, profile="quality")
+    phrasebook = Phrasebook(str(tmp_path), model_id="nllb:test")
+    assert phrasebook.lookup("good morning", "eng_Latn", "spa_Latn", "fast") is None
+    assert phrasebook.lookup("good morning", "eng_Latn", "spa_Latn", "quality") == "buenos días"
+
+
+def test_build_translates_each_phrase_once_and_records_its_origin(tmp_path):
+    translator = EchoTranslator()
+    path = build_phrasebook(translator, ["Hello!", "hello", "Thanks", "!!"], "en", "es", str(tmp_path))
+
+    assert translator.calls == [["Hello!", "Thanks"]]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["model_id"] == "nllb:test" and data["decoding_profile"] == "balanced"
+    assert Phrasebook(str(tmp_path), model_id="nllb:test").lookup("HELLO", "eng_Latn", "spa_Latn") == "HELLO!"
@@ -0,0 +1,48 @@
+import pytest
+
+from placeholders import mask_spans, restore_spans
+
+
+def test_masks_urls_emails_numbers_and_emoji():
+    masked, spans = mask_spans("Mail a@b.com or see https://x.com/a1 at 10:30, +1-555-123-4567 😀")
+    assert masked == "Mail [0] or see [1] at [2], [3] [4]"
+    assert spans == ["a@b.com", "https://x.com/a1", "10:30", "+1-555-123-4567", "😀"]
+
+
+@pytest.mark.parametrize("text", ["v2.0 released", "COVID-19 cases", "meet at 10:30am", "mp3 files", "x-5"])
+def test_numbers_inside_words_are_not_masked(text):
+    assert mask_spans(text) == (text, [])
+
+
+def test_trailing_sentence_punctuation_still_masks_the_number():
+    assert mask_spans("It costs 5.") == ("It costs [0].", ["5"])
+    assert mask_spans("(42) items, 3,000 total!") == ("([0]) items, [1] total!", ["42", "3,000"])
+
+
+def test_spaces_only_join_thousands_groups():
+    assert mask_spans("pages 3 4 and 12 345") == ("pages [0] [1] and [2]", ["3", "4", "12 345"])
+    assert mask_spans("1 500 000 people in 2024 100 days") == (
+        "[0] people in [1] [2] days", ["1 500 000", "2024", "100"]
+    )
+    assert mask_spans("costs 1 234,50 now") == ("costs [0] now", ["1 234,50"])
+    assert mask_spans("12 34") == ("[0] [1]", ["12", "34"])
+
+
+def test_text_with_placeholder_markers_is_left_alone():
+    assert mask_spans("see [1] and 42") == ("see [1] and 42", [])
+
+
+def test_restore_round_trip_allows_reordering_and_spacing():
+    masked, spans = mask_spans("from 9 to 5")
+    assert restore_spans("de [ 1 ] a [0]", spans) == "de 5 a 9"
+    assert restore_spans(masked, spans) == "from 9 to 5"
+
+
+def test_restore_rejects_lost_or_invented_placeholders():
+    assert restore_spans("only [0]", ["9", "5"]) is None
+    assert restore_spans("[0] and [7]", ["9"]) is None
+
+
+def test_partial_restore_accepts_cut_off_hypotheses():
+    assert restore_spans("only [0]", ["9", "5"], partial=True) == "only 9"
+    assert restore_spans("[0] [7]", ["9"], partial=True) == "9 [7]"
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+import quantization
+from quantization import load_cpu_model, quantized_model_path, resolve_precision
+
+
+def test_resolve_precision_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        resolve_precision("int4")
+    assert resolve_precision("float32") == "float32"
+    assert resolve_precision("int8") == "int8"
+
+
+def test_bf16_falls_back_to_int8_without_native_support(monkeypatch):
+    monkeypatch.setattr(quantization, "bf16_supported", lambda: False)
+    assert resolve_precision("bf16") == "int8"
+    monkeypatch.setattr(quantization, "bf16_supported", lambda: True)
+    assert resolve_precision("bf16") == "bf16"
+
+
+def test_quantized_model_path_flattens_the_checkpoint_name(tmp_path):
+    path = quantized_model_path("facebook/nllb-200-distilled-600M", "int8", str(tmp_path))
+    assert path == os.path.join(str(tmp_path), "facebook--nllb-200-distilled-600M-int8.pt")
+
+
+def test_int8_model_is_quantized_once_and_reloaded_from_the_cache(tiny_nllb, tmp_path, monkeypatch):
+    directory, tokenizer, _ = tiny_nllb
+    cache_dir = str(tmp_path / "quantized")
+
+    model = load_cpu_model(directory, "int8", cache_dir=cache_dir)
+    assert os.path.exists(quantized_model_path(directory, "int8", cache_dir))
+    assert not any(type(module) is torch.nn.Linear for module in model.modules())
+
+    def from_pretrained(*args, **kwargs):
+        raise AssertionError("cached int8 model should not be rebuilt")
+
+    monkeypatch.setattr(quantization.AutoModelForSeq2SeqLM, "from_pretrained", from_pretrained)
+    cached = load_cpu_model(directory, "int8", cache_dir=cache_dir)
+
+    inputs = tokenizer("the cat sat on a mat", return_tensors="pt")
+    with torch.no_grad():
+        expected = model.generate(**inputs, max_new_tokens=8, num_beams=1, do_sample=False)
+        reloaded = cached.generate(**inputs, max_new_tokens=8, num_beams=1, do_sample=False)
+    assert torch.equal(expected, reloaded)
+
+
+def test_high_optimization_uses_int8_weights():
+    from Final_Optimized_Model import OPTIMIZATION_PRECISION
+
+    assert OPTIMIZATION_PRECISION["high"] == "int8"
+    assert OPTIMIZATION_PRECISION["low"] == "float32"
@@ -0,0 +1,41 @@
+from segmentation import join_sentences, split_sentences
+
+
+def sentences(text):
+    return [sentence for sentence, _ in split_sentences(text)]
+
+
+def test_round_trip_keeps_whitespace():
+    text = "  Hello there.  How are you?\n\nFine!\n"
+    pieces = split_sentences(text)
+    assert "".join(sentence + whitespace for sentence, whitespace in pieces) == text
+    assert pieces[0] == ("", "  ")
+    assert sentences(text) == ["", "Hello there.", "How are you?", "Fine!"]
+
+
+def test_abbreviations_and_initials_do_not_split():
+    assert sentences("Dr. Smith met J. Doe. They talked.") == ["Dr. Smith met J. Doe.", "They talked."]
+
+
+def test_no_is_an_abbreviation_only_before_a_number():
+    assert sentences("See No. 5 on the list. Thanks.") == ["See No. 5 on the list.", "Thanks."]
+    assert sentences("I said no. Then he left.") == ["I said no.", "Then he left."]
+    assert sentences("The answer was no.") == ["The answer was no."]
+
+
+def test_decimals_need_a_space_to_split():
+    assert sentences("It costs 3.50 today. Cheap.") == ["It costs 3.50 today.", "Cheap."]
+
+
+def test_closing_quotes_stay_with_their_sentence():
+    assert sentences('He said "stop." Then left.') == ['He said "stop."', "Then left."]
+
+
+def test_terminators_without_spaces():
+    assert sentences("नमस्ते। आप कैसे हैं?") == ["नमस्ते।", "आप कैसे हैं?"]
+    assert sentences("你好。再见。") == ["你好。", "再见。"]
+
+
+def test_join_sentences_uses_original_separators():
+    pieces = split_sentences("One.\n\nTwo.")
+    assert join_sentences(["Uno.", "Dos."], pieces) == "Uno.\n\nDos."
@@ -0,0 +1,62 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from conftest import build_tiny_nllb
+
+
+@pytest.fixture(scope="module")
+def draft_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("tiny-nllb-draft"))
+    build_tiny_nllb(directory, seed=1)
+    return directory
+
+
+def make_translator(model_dir: str, draft_dir: str):
+    from Backend.text_to_text import UniversalTranslator
+
+    return UniversalTranslator(model_size=model_dir, device="cpu", warmup_pairs=[], draft_model_size=draft_dir,
+                               num_assistant_tokens=3)
+
+
+def greedy(translator, text: str, tgt_nllb: str, max_length: int) -> str:
+    """The main model's own greedy output, without the draft"""
+    tokenizer, model = translator.tokenizer, translator.model
+    tokenizer.src_lang = "eng_Latn"
+    # translate() caps the input at max_length tokens as well
+    inputs = tokenizer(text, truncation=True, max_length=max_length, return_tensors="pt")
+    with torch.inference_mode():
+        output = model.generate(**inputs, num_beams=1, do_sample=False, max_length=max_length,
+                                forced_bos_token_id=tokenizer.convert_tokens_to_ids(tgt_nllb))
+    return tokenizer.decode(output[0], skip_special_tokens=True)
+
+
+TEXTS = ["hello world", "the cat sat on a mat", "a dog"]
+
+
+def test_draft_identical_to_target_accepts_every_proposal(tiny_nllb):
+    translator = make_translator(tiny_nllb[0], tiny_nllb[0])
+    for text in TEXTS:
+        result = translator.translate(text, "en", "fr", max_length=20, num_beams=1)
+        assert result["translated_text"] == greedy(translator, text, "fra_Latn", 20)
+
+    stats = translator.get_speculative_stats()
+    assert stats["calls"] == 3
+    assert stats["drafted_tokens"] > 0
+    assert stats["accepted_tokens"] == stats["drafted_tokens"]
+    assert stats["acceptance_rate"] == 1.0
+    # Each verification step keeps every proposal plus one token of its own
+    assert stats["tokens_per_target_step"] > 3
+
+
+def test_different_draft_keeps_target_greedy_output(tiny_nllb, draft_dir):
+    translator = make_translator(tiny_nllb[0], draft_dir)
+    for text in TEXTS:
+        result = translator.translate(text, "en", "fr", max_length=20, num_beams=1)
+        assert result["translated_text"] == greedy(translator, text, "fra_Latn", 20)
+
+    stats = translator.get_speculative_stats()
+    assert 0 <= stats["accepted_tokens"] < stats["drafted_tokens"]
+    assert stats["acceptance_rate"] < 1.0
+    # Decoder start excluded; the target language code and every decoded token count
+    assert stats["generated_tokens"] == 3 * 19
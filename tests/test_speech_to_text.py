@@ -0,0 +1,203 @@
+import io
+import os
+import wave
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faster_whisper")
+pytest.importorskip("sounddevice")
+
+from Backend.speech_to_text_3 import BestVoiceToText
+
+RATE = 16000
+
+
+class FakeWhisper:
+    """Stands in for WhisperModel: records what it is given and echoes a fixed transcript"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append((audio, options))
+        info = SimpleNamespace(language="en", language_probability=0.9, duration=len(audio) / RATE)
+        return iter([SimpleNamespace(text="hello"), SimpleNamespace(text="world")]), info
+
+
+@pytest.fixture
+def stt():
+    """BestVoiceToText around a FakeWhisper, without loading any weights"""
+    transcriber = BestVoiceToText.__new__(BestVoiceToText)
+    transcriber.model = FakeWhisper()
+    transcriber.device = "cpu"
+    transcriber.sample_rate = RATE
+    transcriber.channels = 1
+    transcriber.batch_stats = None
+    return transcriber
+
+
+def test_arrays_and_raw_pcm_become_float32(stt):
+    pcm = np.array([0, 16384, -32768], dtype=np.int16)
+    expected = np.array([0.0, 0.5, -1.0], dtype=np.float32)
+    assert np.array_equal(stt.load_audio(pcm), expected)
+    assert np.array_equal(stt.load_audio(pcm.tobytes()), expected)
+    assert np.array_equal(stt.load_audio(memoryview(expected.tobytes()).cast("f")), expected)
+
+    stereo = np.array([[0.2, 0.4], [-0.2, 0.0]], dtype=np.float32)
+    assert np.allclose(stt.load_audio(stereo), [0.3, -0.1])
+    # Linear resampling to 16 kHz
+    assert stt.load_audio(np.zeros(8000, dtype=np.float32), sample_rate=8000).size == RATE
+
+
+def test_encoded_wav_bytes_are_decoded_in_memory(stt):
+    t = np.arange(RATE // 2, dtype=np.float32) / RATE
+    waveform = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    encoded = io.BytesIO()
+    with wave.open(encoded, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes((waveform * 32767).astype(np.int16).tobytes())
+
+    decoded = stt.load_audio(encoded.getvalue())
+    assert decoded.dtype == np.float32
+    assert np.allclose(decoded, waveform, atol=1e-3)
+
+
+def test_in_memory_audio_reaches_the_model_without_temp_files(stt, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pcm = (np.full(RATE, 0.25) * 32768).astype(np.int16)
+
+    result = stt.transcribe_audio(pcm.tobytes(), language="en")
+    assert result["text"] == "hello world"
+    assert result["duration"] == 1.0
+    audio, options = stt.model.calls[-1]
+    assert isinstance(audio, np.ndarray) and np.allclose(audio, 0.25)
+    assert options["language"] == "en"
+    assert os.listdir(tmp_path) == []
+
+
+def test_unusable_audio_is_reported_without_calling_the_model(stt):
+    assert stt.transcribe_audio(np.array([], dtype=np.float32)) == {"error": "Empty audio"}
+    # An odd byte count is neither an encoded file nor int16 PCM
+    assert "Unsupported audio input" in stt.transcribe_audio(b"\x01\x02\x03")["error"]
+    assert "not found" in stt.transcribe_audio("missing.wav")["error"]
+    assert stt.model.calls == []
+
+
+def tone(seconds, amplitude):
+    t = np.arange(int(seconds * RATE), dtype=np.float32) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def recording(*levels):
+    """Utterances separated by pauses; each utterance's peak (in hundredths) identifies it"""
+    parts = [silence(0.5)]
+    for level in levels:
+        parts += [tone(0.8, level / 100), silence(0.6)]
+    return np.concatenate(parts + [silence(0.5)])
+
+
+class FakePipeline:
+    """Stands in for BatchedInferencePipeline: one output per clip, named after the clip's peak"""
+
+    packs = []
+
+    def __init__(self, model):
+        self.model = model
+
+    def transcribe(self, audio, clip_timestamps, **options):
+        FakePipeline.packs.append((len(audio), [dict(clip) for clip in clip_timestamps]))
+
+        def outputs():
+            for clip in clip_timestamps:
+                level = int(round(float(np.abs(audio[clip["start"]:clip["end"]]).max()) * 100))
+                if level == 90:
+                    raise RuntimeError("corrupt segment")
+                # Outputs start a little after their clip, as real chunk timestamps do
+                yield SimpleNamespace(start=clip["start"] / RATE + 0.4, text=f" s{level}")
+        return outputs(), None
+
+
+@pytest.fixture
+def archive(stt, tmp_path, monkeypatch):
+    """Write empty files for the given recordings and route batched decoding through FakePipeline"""
+    import faster_whisper
+    import faster_whisper.audio
+
+    recordings = {}
+    FakePipeline.packs = []
+    monkeypatch.setattr(faster_whisper, "BatchedInferencePipeline", FakePipeline)
+    monkeypatch.setattr(faster_whisper.audio, "decode_audio",
+                        lambda path, sampling_rate: recordings[os.path.basename(path)])
+
+    def add(**files):
+        paths = []
+        for name, audio in files.items():
+            path = tmp_path / f"{name}.wav"
+            path.write_bytes(b"")
+            recordings[path.name] = audio
+            paths.append(str(path))
+        return paths
+    return add
+
+
+def test_batched_mode_packs_segments_across_files(stt, archive):
+    a, b = archive(a=recording(10, 20, 30), b=recording(40))
+    results = stt.batch_transcribe([a, b], batched=True, batch_size=2, language="en", vad="energy")
+
+    assert results[a]["text"] == "s10 s20 s30" and results[a]["segments"] == 3
+    assert results[b]["text"] == "s40" and results[b]["language"] == "en"
+    # Two packs of two: a's last segment shares a batch with b's only one
+    slot = 30 * RATE
+    assert [length for length, _ in FakePipeline.packs] == [2 * slot, 2 * slot]
+    for _, clips in FakePipeline.packs:
+        assert [clip["start"] for clip in clips] == [0, slot]
+    assert stt.batch_stats["files"] == 2
+
+
+def test_a_failed_pack_only_fails_its_own_files(stt, archive):
+    a, b, c = archive(a=recording(10), b=recording(90, 20), c=recording(30))
+    results = stt.batch_transcribe([a, b, c], batched=True, batch_size=2, language="en", vad="energy")
+
+    assert results[a] == {"error": "Transcription error: corrupt segment"}
+    assert results[b] == {"error": "Transcription error: corrupt segment"}
+    # b's second segment is skipped; c still goes through in a pack of its own
+    assert results[c]["text"] == "s30"
+    assert [len(clips) for _, clips in FakePipeline.packs] == [2, 1]
+    assert list(results) == [a, b, c]
+
+
+def test_language_detection_failure_is_reported_per_file(stt, archive):
+    def detect_language(audio):
+        if np.abs(audio).max() > 0.5:
+            raise RuntimeError("no speech model")
+        return "de", 0.8, []
+
+    stt.model.detect_language = detect_language
+    a, b = archive(a=recording(60), b=recording(20))
+    results = stt.batch_transcribe([a, b], batched=True, batch_size=4, vad="energy")
+
+    assert results[a] == {"error": "Language detection error: no speech model"}
+    assert results[b]["text"] == "s20"
+    assert results[b]["language"] == "de" and results[b]["language_probability"] == 0.8
+
+
+def test_outputs_outside_every_segment_fail_the_pack(stt, archive, monkeypatch):
+    import faster_whisper
+
+    class StrayPipeline(FakePipeline):
+        def transcribe(self, audio, clip_timestamps, **options):
+            # Past the end of the only clip: attributing it anywhere would be a guess
+            return iter([SimpleNamespace(start=len(audio) / RATE - 1, text=" stray")]), None
+
+    monkeypatch.setattr(faster_whisper, "BatchedInferencePipeline", StrayPipeline)
+    a, = archive(a=recording(10))
+    results = stt.batch_transcribe([a], batched=True, language="en", vad="energy")
+    assert "matches no segment" in results[a]["error"]
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from streaming_asr import StreamingTranscriber
+
+RATE = 16000
+
+
+def chunk(seconds=0.5):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+class ScriptedWhisper:
+    """Stands in for WhisperModel.transcribe, returning one scripted hypothesis per decode"""
+
+    def __init__(self, hypotheses):
+        self.hypotheses = list(hypotheses)
+        self.calls = 0
+
+    def transcribe(self, audio, **options):
+        words = self.hypotheses[min(self.calls, len(self.hypotheses) - 1)]
+        self.calls += 1
+        segment = SimpleNamespace(words=[SimpleNamespace(start=s, end=e, word=w) for s, e, w in words])
+        return [segment], SimpleNamespace(language="en")
+
+
+class TranscriptWhisper:
+    """A stable recognizer: every word whose audio is fully inside the window (times in stream seconds)"""
+
+    def __init__(self, words):
+        self.words = words
+        self.transcriber = None
+
+    def transcribe(self, audio, **options):
+        start = self.transcriber._window_start
+        end = start + len(audio) / RATE
+        words = [SimpleNamespace(start=s - start, end=e - start, word=w)
+                 for s, e, w in self.words if s >= start - 0.05 and e <= end]
+        return [SimpleNamespace(words=words)], SimpleNamespace(language="en")
+
+
+def test_words_commit_once_two_hypotheses_agree():
+    model = ScriptedWhisper([
+        [(0.0, 0.4, " hello"), (0.5, 0.9, " word")],
+        [(0.0, 0.4, " hello"), (0.5, 0.9, " world")],
+        [(0.0, 0.4, " hello"), (0.5, 0.9, " world"), (1.0, 1.3, " again")],
+    ])
+    transcriber = StreamingTranscriber(model, sample_rate=RATE, step_seconds=0.5)
+    transcriber.insert_audio(chunk())
+    first, = transcriber.process()
+    assert first["committed"] == ""
+    assert first["tentative"] == "hello word"
+
+    transcriber.insert_audio(chunk())
+    second, = transcriber.process()
+    assert second["committed"] == "hello"
+    assert second["new_committed"] == "hello"
+    assert second["tentative"] == "world"
+
+    transcriber.insert_audio(chunk())
+    third, = transcriber.process()
+    assert third["committed"] == "hello world"
+    assert third["tentative"] == "again"
+
+
+def test_nothing_is_decoded_before_a_full_step():
+    model = ScriptedWhisper([[]])
+    transcriber = StreamingTranscriber(model, sample_rate=RATE, step_seconds=0.5)
+    transcriber.insert_audio(chunk(0.3))
+    assert transcriber.process() == []
+    assert model.calls == 0
+
+
+def test_sentences_are_finalized_and_trimmed_from_the_window():
+    model = TranscriptWhisper([
+        (0.1, 0.5, " Hello"), (0.6, 1.1, " world."),
+        (1.6, 1.9, " How"), (2.0, 2.2, " are"), (2.3, 2.7, " you?"),
+    ])
+    transcriber = StreamingTranscriber(model, sample_rate=RATE, step_seconds=0.5)
+    model.transcriber = transcriber
+    events = list(transcriber.iter_events(chunk() for _ in range(7)))
+
+    finals = [event["text"] for event in events if event["type"] == "final"]
+    assert finals == ["Hello world.", "How are you?"]
+    # Committed text only ever grows within a sentence
+    committed = ""
+    for event in events:
+        if event["type"] == "partial":
+            assert event["committed"].startswith(committed)
+            committed = event["committed"]
+        else:
+            committed = ""
+    # The first sentence's audio left the window once it was final
+    assert transcriber._window_start >= 1.1
+
+
+def test_finish_commits_tentative_words():
+    model = ScriptedWhisper([[(0.0, 0.4, " trailing"), (0.5, 0.8, " words")]])
+    transcriber = StreamingTranscriber(model, sample_rate=RATE, step_seconds=0.5)
+    transcriber.insert_audio(chunk())
+    transcriber.process()
+    events = transcriber.finish()
+    assert events[-1]["type"] == "final"
+    assert events[-1]["text"] == "trailing words"
+
+
+def test_window_without_stable_text_is_bounded():
+    model = ScriptedWhisper([[]])
+    transcriber = StreamingTranscriber(model, sample_rate=RATE, step_seconds=0.5, max_window_seconds=2.0)
+    for _ in range(10):
+        transcriber.insert_audio(chunk())
+        transcriber.process()
+    assert transcriber.stats()["window_seconds"] <= 2.5
+    assert transcriber.stats()["decodes"] == 10
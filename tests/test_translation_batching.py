@@ -0,0 +1,31 @@
+from translation_batching import bucket_by_length, padding_stats
+
+
+def test_every_index_is_batched_once():
+    lengths = [5, 40, 7, 38, 6, 41]
+    batches = bucket_by_length(lengths, max_tokens_per_batch=100)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+
+
+def test_similar_lengths_share_a_batch():
+    lengths = [5, 40, 7, 38, 6, 41]
+    batches = bucket_by_length(lengths, max_tokens_per_batch=130)
+    assert [sorted(batch) for batch in batches] == [[0, 2, 4], [1, 3, 5]]
+
+
+def test_limits_are_respected():
+    lengths = [10] * 10
+    assert all(len(batch) <= 3 for batch in bucket_by_length(lengths, max_batch_size=3))
+    for batch in bucket_by_length(lengths, max_tokens_per_batch=35):
+        assert max(lengths[i] for i in batch) * len(batch) <= 35
+
+
+def test_oversized_item_gets_its_own_batch():
+    assert bucket_by_length([500, 3], max_tokens_per_batch=100) == [[1], [0]]
+
+
+def test_padding_stats():
+    lengths = [2, 4, 4]
+    stats = padding_stats(lengths, [[0, 1], [2]])
+    assert stats == {"batches": 2, "real_tokens": 10, "padded_tokens": 12, "padding_ratio": 2 / 12}
+    assert padding_stats([], [])["padding_ratio"] == 0.0
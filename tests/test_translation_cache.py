@@ -0,0 +1,114 @@
+import pytest
+
+import translation_cache
+from translation_cache import PipelineCache, TranslationCache, make_pipeline_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for the cache: advance it with clock.now += seconds"""
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(translation_cache.time, "time", lambda: Clock.now)
+    return Clock
+
+
+def test_pipeline_cache_evicts_least_recently_used():
+    cache = PipelineCache(max_size=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 0)
+    cache.get("c", lambda: 3)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_pipeline_key_ignores_settings_order():
+    assert make_pipeline_key("eng_Latn", "spa_Latn", a=1, b=2) == make_pipeline_key("eng_Latn", "spa_Latn", b=2, a=1)
+
+
+def test_make_key_normalizes_whitespace_and_separates_settings():
+    key = TranslationCache.make_key("Hello   world", "eng_Latn", "spa_Latn", "m", num_beams=1)
+    assert key == TranslationCache.make_key(" Hello world ", "eng_Latn", "spa_Latn", "m", num_beams=1)
+    assert key != TranslationCache.make_key("Hello world", "eng_Latn", "spa_Latn", "m", num_beams=3)
+
+
+def test_memory_tier_expires_entries(clock):
+    cache = TranslationCache(ttl_seconds=0.05)
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    clock.now += 0.1
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(db_path=path)
+    cache.put("k", "v")
+    cache.close()
+
+    reopened = TranslationCache(db_path=path)
+    assert reopened.get("k") == "v"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_honours_ttl(tmp_path, clock):
+    cache = TranslationCache(ttl_seconds=0.05, db_path=str(tmp_path / "cache.db"))
+    cache.put("k", "v")
+    clock.now += 0.1
+
+    # Expired in memory, then expired (and deleted) on disk rather than re-promoted
+    assert cache.get("k") is None
+    assert cache.get("k") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_promotion_keeps_original_age(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(ttl_seconds=0.2, db_path=path)
+    cache.put("k", "v")
+    cache.close()
+
+    clock.now += 0.1
+    reopened = TranslationCache(ttl_seconds=0.2, db_path=path)
+    assert reopened.get("k") == "v"
+    clock.now += 0.15
+    assert reopened.get("k") is None
+
+
+def test_disk_tier_is_bounded(tmp_path, clock):
+    cache = TranslationCache(ttl_seconds=None, db_path=str(tmp_path / "cache.db"), max_disk_entries=3)
+    for index in range(10):
+        cache.put(f"k{index}", str(index))
+        clock.now += 1
+
+    assert cache.stats()["disk_entries"] == 3
+    cache.clear()
+    assert cache.get("k9") == "9"
+    assert cache.get("k0") is None
+
+
+def test_pipeline_cache_keeps_one_instance_under_concurrent_misses():
+    import threading
+
+    cache = PipelineCache(max_size=4)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def build():
+        # Every thread misses before any of them stores its pipeline
+        barrier.wait()
+        return object()
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", build))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["misses"] == 4
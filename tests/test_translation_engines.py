@@ -0,0 +1,187 @@
+import pytest
+
+from deadlines import Deadline
+
+
+class ExpiresAfterChecks(Deadline):
+    """Deadline that passes after a fixed number of expired() polls instead of wall time"""
+
+    def __init__(self, checks: int):
+        super().__init__(3600)
+        self.checks = checks
+
+    def expired(self) -> bool:
+        self.checks -= 1
+        if self.checks < 0:
+            self.exceeded = True
+        return self.exceeded
+
+
+def assert_timed_out(result):
+    assert result["success"] is False
+    assert result["timed_out"] is True
+    assert "translated_text" not in result
+
+
+@pytest.mark.parametrize("engine", ["transformers", "continuous"])
+def test_pytorch_engines_report_undecoded_requests_as_timeouts(make_translator, engine):
+    translator = make_translator(engine)
+    # The translator's own check passes; the engine sees the deadline expire before any text
+    result = translator.translate_fast("hello world", "en", "fr", use_cache=False, deadline=ExpiresAfterChecks(1))
+    assert_timed_out(result)
+
+
+def test_continuous_engine_drops_expired_arrivals(tiny_nllb):
+    from translation_engines import ContinuousBatchingEngine
+
+    engine = ContinuousBatchingEngine(tiny_nllb[0], "cpu")
+    deadline = Deadline(0)
+    assert engine.translate_batch(["hello world", "a dog"], "eng_Latn", "fra_Latn", deadline=deadline) == [None, None]
+    assert engine.translate_multi_target("a dog", "eng_Latn", ["fra_Latn", "deu_Latn"], deadline=deadline) == [None, None]
+    assert deadline.cut_short
+    assert engine.batcher.stats()["expired"] == 4
+
+
+@pytest.fixture
+def ctranslate2_engine(tiny_nllb, tmp_path):
+    pytest.importorskip("ctranslate2")
+    from translation_engines import CTranslate2Engine
+
+    return CTranslate2Engine(tiny_nllb[0], "cpu", compute_type="float32", cache_dir=str(tmp_path / "ct2"))
+
+
+def test_ctranslate2_engine_drops_chunks_after_the_deadline(ctranslate2_engine):
+    deadline = ExpiresAfterChecks(1)
+    translations = ctranslate2_engine.translate_batch(["hello world", "a dog"], "eng_Latn", "fra_Latn",
+                                                      max_length=32, batch_size=1, deadline=deadline)
+    assert translations[0]
+    assert translations[1] is None
+    assert deadline.cut_short
+
+    deadline = Deadline(0)
+    assert ctranslate2_engine.translate_multi_target("a dog", "eng_Latn", ["fra_Latn", "deu_Latn"],
+                                                     deadline=deadline) == [None, None]
+    assert deadline.cut_short
+
+
+def test_ctranslate2_translator_reports_undecoded_requests_as_timeouts(make_translator, tmp_path):
+    pytest.importorskip("ctranslate2")
+    translator = make_translator("ctranslate2", engine_options={"compute_type": "float32",
+                                                              "cache_dir": str(tmp_path / "ct2")})
+    assert_timed_out(translator.translate_fast("hello world", "en", "fr", max_length=32, use_cache=False,
+                                               deadline=ExpiresAfterChecks(1)))
+    multi = translator.translate_multi("hello world", "en", ["fr", "de"], max_length=32, use_cache=False,
+                                       deadline=ExpiresAfterChecks(1))
+    assert multi["success"] is False
+    assert multi["translations"] == {} and multi["partial"] == []
+    assert set(multi["errors"]) == {"fr", "de"}
+
+
+def test_onnxruntime_engine_drops_chunks_after_the_deadline():
+    from translation_engines import OnnxRuntimeEngine
+
+    # The drop path never touches the graphs, so no exported model is needed
+    engine = OnnxRuntimeEngine.__new__(OnnxRuntimeEngine)
+    deadline = Deadline(0)
+    assert engine.translate_batch(["hello world", "a dog", "the cat"], "eng_Latn", "fra_Latn",
+                                  batch_size=2, deadline=deadline) == [None, None, None]
+    assert engine.translate_multi_target("a dog", "eng_Latn", ["fra_Latn", "deu_Latn"],
+                                         deadline=deadline) == [None, None]
+    assert deadline.cut_short
+
+
+def test_partial_output_with_text_stays_a_success(make_translator):
+    translator = make_translator("transformers")
+    result = translator.translate_fast("hello world", "en", "fr", use_cache=False, deadline=ExpiresAfterChecks(4))
+    assert result["success"] is True
+    assert result["partial"] is True and result["timed_out"] is True
+    assert result["translated_text"]
+
+
+def test_ctranslate2_falls_back_to_transformers_when_missing(tiny_nllb, monkeypatch, capsys):
+    import sys
+
+    from translation_engines import TransformersEngine, create_engine
+
+    # A None entry makes "import ctranslate2" raise ImportError
+    monkeypatch.setitem(sys.modules, "ctranslate2", None)
+    engine = create_engine("ctranslate2", tiny_nllb[0], "cpu", {"compute_type": "int8", "inter_threads": 2})
+    assert type(engine) is TransformersEngine
+    assert "ctranslate2 is not installed" in capsys.readouterr().out
+
+
+def test_server_defaults_to_the_transformers_engine(monkeypatch):
+    import importlib.util
+    import os
+
+    monkeypatch.delenv("TRANSLATION_ENGINE", raising=False)
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Video_Conferencing_server", "config.py")
+    spec = importlib.util.spec_from_file_location("server_config", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    assert config.Config.TRANSLATION_ENGINE == "transformers"
+
+
+@pytest.mark.parametrize("num_beams", [1, 3])
+@pytest.mark.parametrize("decoding", [None, {"max_new_tokens": 9}])
+def test_multi_target_fan_out_matches_single_target_calls(tiny_nllb, num_beams, decoding):
+    from translation_engines import TransformersEngine
+
+    engine = TransformersEngine(tiny_nllb[0], "cpu")
+    targets = ["fra_Latn", "deu_Latn", "spa_Latn", "hin_Deva"]
+    for text in ["the cat sat on a mat", "hello world"]:
+        shared = engine.translate_multi_target(text, "eng_Latn", targets, max_length=16, num_beams=num_beams,
+                                               decoding=decoding)
+        separate = [engine.translate_batch([text], "eng_Latn", target, max_length=16, num_beams=num_beams,
+                                           decoding=decoding)[0]
+                    for target in targets]
+        assert shared == separate
+        # Targets decode differently from the same encoder output
+        assert len(set(shared)) > 1
+
+
+def test_create_engine_rejects_unknown_names(tiny_nllb):
+    from translation_engines import create_engine
+
+    with pytest.raises(ValueError):
+        create_engine("marian", tiny_nllb[0], "cpu")
+
+
+def test_ctranslate2_rejects_unknown_compute_types(tiny_nllb, tmp_path):
+    pytest.importorskip("ctranslate2")
+    from translation_engines import CTranslate2Engine
+
+    with pytest.raises(ValueError):
+        CTranslate2Engine(tiny_nllb[0], "cpu", compute_type="int4", cache_dir=str(tmp_path))
+
+
+def test_ctranslate2_converts_once_and_reuses_the_cache(tiny_nllb, tmp_path, monkeypatch):
+    ctranslate2 = pytest.importorskip("ctranslate2")
+    from translation_engines import CTranslate2Engine
+
+    cache_dir = str(tmp_path / "ct2")
+    model_dir = CTranslate2Engine.convert_model(tiny_nllb[0], "int8", cache_dir)
+    assert model_dir.endswith("-int8")
+
+    def convert(*args, **kwargs):
+        raise AssertionError("converted model should be reused")
+
+    monkeypatch.setattr(ctranslate2.converters.TransformersConverter, "convert", convert)
+    assert CTranslate2Engine.convert_model(tiny_nllb[0], "int8", cache_dir) == model_dir
+
+
+@pytest.mark.parametrize("num_beams", [1, 3])
+@pytest.mark.parametrize("decoding", [None, {"max_new_tokens": 5}])
+def test_ctranslate2_matches_the_transformers_engine(ctranslate2_engine, tiny_nllb, num_beams, decoding):
+    from translation_engines import TransformersEngine
+
+    texts = ["hello world", "the cat sat on a mat", "a dog"]
+    reference = TransformersEngine(tiny_nllb[0], "cpu")
+    options = {"max_length": 16, "num_beams": num_beams, "decoding": decoding}
+    expected = reference.translate_batch(texts, "eng_Latn", "fra_Latn", **options)
+    # Same weights in float32, same length limits
+    assert ctranslate2_engine.translate_batch(texts, "eng_Latn", "fra_Latn", batch_size=2, **options) == expected
+    assert ctranslate2_engine.translate_multi_target("a dog", "eng_Latn", ["fra_Latn", "deu_Latn"], **options) == [
+        reference.translate_batch(["a dog"], "eng_Latn", target, **options)[0] for target in ("fra_Latn", "deu_Latn")
+    ]
@@ -0,0 +1,77 @@
+import pytest
+
+import translation_metrics
+from translation_metrics import RollingLatency, TranslationMetrics, to_prometheus
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_metrics.time, "time", lambda: now[0])
+    return now
+
+
+def test_rolling_latency_percentiles_cover_the_window():
+    latency = RollingLatency(window=100)
+    for ms in range(1, 201):
+        latency.add(ms / 1000)
+    summary = latency.summary()
+    # The count is lifetime; percentiles only see the last 100 samples (101..200 ms)
+    assert summary["count"] == 200
+    assert summary["p50_ms"] == pytest.approx(151)
+    assert summary["p95_ms"] == pytest.approx(195)
+    assert summary["p99_ms"] == pytest.approx(199)
+    assert summary["mean_ms"] == pytest.approx(150.5)
+    assert RollingLatency().summary()["p95_ms"] == 0.0
+
+
+def test_snapshot_reports_counts_rates_and_timings(clock):
+    metrics = TranslationMetrics()
+    metrics.set_timing("model_load", 2.5)
+    metrics.record("translate", 0.2)
+    metrics.record_generation(10, 30, 0.5)
+    metrics.record_generation(5, 10, 0.5)
+    metrics.record_request(True)
+    metrics.record_request(False)
+    metrics.record_timeout()
+    clock[0] += 60
+
+    snapshot = metrics.snapshot()
+    assert snapshot["uptime_seconds"] == 60
+    assert (snapshot["requests"], snapshot["errors"], snapshot["timeouts"]) == (2, 1, 1)
+    assert snapshot["stages"]["translate"]["count"] == 1
+    assert snapshot["stages"]["translate"]["p50_ms"] == pytest.approx(200)
+    assert snapshot["tokens"] == {"input_total": 15, "output_total": 40, "output_per_second": 40.0}
+    assert snapshot["timings"] == {"model_load": 2.5}
+
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 0 and snapshot["stages"] == {}
+    assert snapshot["tokens"]["output_per_second"] == 0.0
+    assert snapshot["timings"] == {"model_load": 2.5}
+
+
+def test_time_records_the_block_even_when_it_raises():
+    metrics = TranslationMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.time("tts"):
+            raise RuntimeError("synthesis failed")
+    assert metrics.snapshot()["stages"]["tts"]["count"] == 1
+
+
+def test_to_prometheus_flattens_numeric_leaves():
+    text = to_prometheus({
+        "requests": 3,
+        "cached": True,
+        "engine": "ctranslate2",
+        "stages": {"translate.fast": {"p95_ms": 12.5}},
+        "languages": {"en->fr": 2},
+    })
+    assert text.splitlines() == [
+        "babel_requests 3",
+        "babel_cached 1",
+        "babel_stages_translate_fast_p95_ms 12.5",
+        "babel_languages_en__fr 2",
+    ]
+    assert text.endswith("\n")
+    assert to_prometheus({"requests": 1}, prefix="server") == "server_requests 1\n"
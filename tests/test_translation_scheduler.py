@@ -0,0 +1,60 @@
+import asyncio
+
+from deadlines import Deadline
+from translation_scheduler import TranslationScheduler
+
+
+class RecordingTranslator:
+    """Stands in for UniversalTranslator.translate_many and records each batch"""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def translate_many(self, texts, source_lang, target_lang, max_length, deadline=None, profile=None):
+        self.calls.append((list(texts), source_lang, target_lang, profile))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [{"success": True, "translated_text": f"{target_lang}:{text}"} for text in texts]
+
+
+async def translate_all(scheduler, requests):
+    try:
+        return await asyncio.gather(*(scheduler.translate_async(*request) for request in requests))
+    finally:
+        await scheduler.close()
+
+
+def test_concurrent_requests_share_one_batch_per_pair():
+    translator = RecordingTranslator()
+    scheduler = TranslationScheduler(translator, max_batch_size=8, max_wait_ms=50)
+    results = asyncio.run(translate_all(scheduler, [
+        ("one", "en", "es"), ("two", "EN", "es"), ("three", "en", "hi"),
+    ]))
+    assert [result["translated_text"] for result in results] == ["es:one", "es:two", "hi:three"]
+    assert sorted(call[0] for call in translator.calls) == [["one", "two"], ["three"]]
+    assert scheduler.stats()["batches"] == 1
+    assert scheduler.stats()["requests"] == 3
+
+
+def test_batch_size_is_capped():
+    translator = RecordingTranslator()
+    scheduler = TranslationScheduler(translator, max_batch_size=2, max_wait_ms=50)
+    asyncio.run(translate_all(scheduler, [(str(i), "en", "es") for i in range(5)]))
+    assert all(len(call[0]) <= 2 for call in translator.calls)
+    assert sum(len(call[0]) for call in translator.calls) == 5
+
+
+def test_expired_requests_are_not_translated():
+    translator = RecordingTranslator()
+    scheduler = TranslationScheduler(translator, max_wait_ms=1)
+    result, = asyncio.run(translate_all(scheduler, [("late", "en", "es", 256, Deadline(0))]))
+    assert result["timed_out"]
+    assert translator.calls == []
+    assert scheduler.stats()["expired"] == 1
+
+
+def test_translator_errors_reach_every_caller():
+    scheduler = TranslationScheduler(RecordingTranslator(fail=True), max_wait_ms=20)
+    results = asyncio.run(translate_all(scheduler, [("a", "en", "es"), ("b", "en", "es")]))
+    assert [result["error"] for result in results] == ["model crashed", "model crashed"]
@@ -0,0 +1,31 @@
+import pytest
+
+import Final_Optimized_Model
+
+
+def test_language_pairs_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("BABEL_LANGUAGE_PAIRS", " EN:es , fr:DE,bogus,")
+    assert Final_Optimized_Model._load_language_pairs() == [("en", "es"), ("fr", "de")]
+
+
+def test_warm_up_builds_one_pipeline_per_configured_pair(make_translator):
+    translator = make_translator(warmup_pairs=[("en", "fr"), ("fr", "en"), ("en", "de")])
+    stats = translator.get_cache_stats()
+    assert stats["size"] == 3 and stats["misses"] == 3
+
+    # The first real request reuses the warmed pipeline
+    assert translator.translate_fast("hello world", "en", "fr", use_cache=False)["success"]
+    stats = translator.get_cache_stats()
+    assert stats["size"] == 3 and stats["hits"] == 1
+    assert translator.get_metrics()["pipeline_cache"]["hits"] == 1
+
+
+def test_backend_translator_warms_the_configured_pairs_by_default(tiny_nllb, monkeypatch):
+    from Backend import text_to_text
+
+    monkeypatch.setattr(text_to_text, "DEFAULT_LANGUAGE_PAIRS", [("en", "fr"), ("fr", "en")])
+    translator = text_to_text.UniversalTranslator(model_size=tiny_nllb[0], device="cpu")
+    assert translator.get_cache_stats()["size"] == 2
+
+    skipped = text_to_text.UniversalTranslator(model_size=tiny_nllb[0], device="cpu", warmup_pairs=[])
+    assert skipped.get_cache_stats()["size"] == 0
@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vad import EnergyVAD, StreamingVAD, create_vad, split_speech
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=0.1):
+    t = np.arange(int(seconds * RATE), dtype=np.float32) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def energy_vad(**options):
+    return StreamingVAD(EnergyVAD(0.01, sample_rate=RATE), sample_rate=RATE, **options)
+
+
+def test_energy_detector_separates_speech_from_silence_and_hiss():
+    detector = EnergyVAD(0.01, sample_rate=RATE)
+    frame = detector.frame_size
+    assert detector(silence(1)[:frame]) == 0.0
+    assert detector(tone(1)[:frame]) == 1.0
+    # Quiet white noise is above the silence level but crosses zero constantly
+    hiss = np.random.default_rng(0).normal(0, 0.015, frame).astype(np.float32)
+    assert detector(hiss) == 0.0
+
+
+def test_one_utterance_becomes_one_segment():
+    audio = np.concatenate([silence(1), tone(1), silence(1)])
+    segment, = split_speech(audio, energy_vad())
+    # Pre-roll before the onset, hangover tail after it
+    assert 0.7 <= segment.start <= 1.0
+    assert 2.0 <= segment.end <= 2.3
+    assert len(segment.audio) == int(round(segment.duration * RATE))
+
+
+def test_short_clicks_are_ignored():
+    audio = np.concatenate([silence(0.5), tone(0.1), silence(1)])
+    vad = energy_vad()
+    assert split_speech(audio, vad) == []
+    assert vad.stats()["silence_ratio"] == 1.0
+
+
+def test_chunked_feeding_matches_whole_recording():
+    audio = np.concatenate([silence(0.5), tone(0.8), silence(0.6), tone(0.7), silence(1)])
+    whole = [(s.start, s.end) for s in split_speech(audio, energy_vad())]
+
+    vad = energy_vad()
+    chunked = []
+    for start in range(0, len(audio), 1234):
+        chunked.extend(vad.feed(audio[start:start + 1234]))
+    chunked.extend(vad.flush())
+    assert [(s.start, s.end) for s in chunked] == whole
+    assert len(whole) == 2
+
+
+def test_long_speech_is_cut_at_max_segment_length():
+    vad = energy_vad(max_segment_seconds=2.0)
+    segments = split_speech(tone(5), vad)
+    assert len(segments) >= 3
+    assert all(segment.duration <= 2.0 + 1e-6 for segment in segments)
+    # Forced cuts lose no audio (beyond the last partial frame)
+    assert sum(len(segment.audio) for segment in segments) == len(tone(5)) // vad.frame_size * vad.frame_size
+
+
+def test_create_vad_validates_backend():
+    with pytest.raises(ValueError):
+        create_vad("webrtc", energy_threshold=0.01)
+    detector = create_vad("energy", RATE, energy_threshold=0.05)
+    assert detector.name == "energy" and detector.threshold == 0.05
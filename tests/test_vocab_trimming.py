@@ -0,0 +1,80 @@
+import io
+import json
+import os
+
+import pytest
+
+pytest.importorskip("sentencepiece")
+pytest.importorskip("google.protobuf")
+transformers = pytest.importorskip("transformers")
+
+from vocab_trimming import collect_token_ids, trim_tokenizer
+
+CORPUS = ["hello world", "the cat sat on the mat", "a dog and a cat", "hola mundo",
+          "el gato se sentó", "un perro y un gato", "good morning", "buenos días"]
+
+
+@pytest.fixture(scope="module")
+def nllb_tokenizer(tmp_path_factory):
+    """NLLB tokenizer (fast, with its SentencePiece model) over a tiny trained Unigram vocabulary"""
+    import sentencepiece
+
+    model = io.BytesIO()
+    sentencepiece.SentencePieceTrainer.train(sentence_iterator=iter(CORPUS * 20), model_writer=model,
+                                             vocab_size=40, model_type="unigram", character_coverage=1.0)
+    path = str(tmp_path_factory.mktemp("spm") / "sentencepiece.bpe.model")
+    with open(path, "wb") as f:
+        f.write(model.getvalue())
+    tokenizer = transformers.NllbTokenizerFast(vocab_file=path)
+    if json.loads(tokenizer.backend_tokenizer.to_str())["model"]["type"] != "Unigram":
+        pytest.skip("this transformers version converts SentencePiece models to BPE")
+    return tokenizer
+
+
+@pytest.fixture
+def trimmed(nllb_tokenizer, tmp_path):
+    languages = ["eng_Latn", "spa_Latn"]
+    # Only the English half of the corpus: Spanish-only pieces are dropped
+    kept_ids = sorted(collect_token_ids(nllb_tokenizer, CORPUS[:3], languages))
+    output_dir = str(tmp_path / "trimmed")
+    trim_tokenizer(nllb_tokenizer, kept_ids, languages, output_dir)
+    new_id = {old: new for new, old in enumerate(kept_ids)}
+    return transformers.AutoTokenizer.from_pretrained(output_dir), new_id, output_dir
+
+
+def test_trimmed_ids_round_trip(nllb_tokenizer, trimmed):
+    tokenizer, new_id, _ = trimmed
+    assert len(tokenizer) == len(new_id) < len(nllb_tokenizer)
+    for text in CORPUS[:3]:
+        nllb_tokenizer.src_lang = tokenizer.src_lang = "eng_Latn"
+        original = nllb_tokenizer(text)["input_ids"]
+        ids = tokenizer(text)["input_ids"]
+        assert ids == [new_id[i] for i in original]
+        assert tokenizer.decode(ids, skip_special_tokens=True) == text
+
+
+def test_language_codes_are_remapped(nllb_tokenizer, trimmed):
+    tokenizer, new_id, _ = trimmed
+    for code in ("eng_Latn", "spa_Latn"):
+        assert tokenizer.convert_tokens_to_ids(code) == new_id[nllb_tokenizer.convert_tokens_to_ids(code)]
+    tokenizer.src_lang = "spa_Latn"
+    assert tokenizer("a cat")["input_ids"][0] == tokenizer.convert_tokens_to_ids("spa_Latn")
+    # Languages that were not configured are gone
+    assert tokenizer.convert_tokens_to_ids("fra_Latn") == tokenizer.unk_token_id
+
+
+def test_trimmed_directory_is_fast_only(trimmed):
+    _, _, output_dir = trimmed
+    assert os.path.exists(os.path.join(output_dir, "tokenizer.json"))
+    assert not os.path.exists(os.path.join(output_dir, "sentencepiece.bpe.model"))
+    assert not os.path.exists(os.path.join(output_dir, "added_tokens.json"))
+
+
+def test_non_unigram_tokenizers_are_rejected(tmp_path):
+    from tokenizers import Tokenizer, models
+
+    bpe = Tokenizer(models.BPE({"<unk>": 0, "a": 1, "b": 2, "ab": 3}, [("a", "b")], unk_token="<unk>"))
+    tokenizer = transformers.PreTrainedTokenizerFast(tokenizer_object=bpe, unk_token="<unk>")
+    with pytest.raises(ValueError, match="Unigram"):
+        trim_tokenizer(tokenizer, [0, 1, 2, 3], [], str(tmp_path / "bpe"))
+    assert not os.path.exists(tmp_path / "bpe")
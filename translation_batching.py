@@ -0,0 +1,49 @@
+from typing import Dict, List, Sequence
+
+
+def bucket_by_length(lengths: Sequence[int], max_tokens_per_batch: int = 4096,
+                     max_batch_size: int = 64) -> List[List[int]]:
+    """
+    Group item indices into batches of similar length to minimise padding
+
+    Items are sorted by length and packed greedily, so each batch's padded
+    size (longest item x batch size) stays within max_tokens_per_batch.
+    An item longer than the budget still gets a batch of its own.
+
+    Args:
+        lengths: Token length of each item
+        max_tokens_per_batch: Budget for padded tokens in one batch
+        max_batch_size: Hard cap on items per batch
+
+    Returns:
+        List of batches, each a list of indices into lengths
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current: List[int] = []
+    current_max = 0
+
+    for index in order:
+        length = max(1, lengths[index])
+        padded_size = max(current_max, length) * (len(current) + 1)
+        if current and (padded_size > max_tokens_per_batch or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_max = [], 0
+        current.append(index)
+        current_max = max(current_max, length)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_stats(lengths: Sequence[int], batches: List[List[int]]) -> Dict:
+    """Report how many real vs padded tokens a batching plan produces"""
+    real_tokens = sum(lengths)
+    padded_tokens = sum(max(lengths[i] for i in batch) * len(batch) for batch in batches if batch)
+    return {
+        "batches": len(batches),
+        "real_tokens": real_tokens,
+        "padded_tokens": padded_tokens,
+        "padding_ratio": (padded_tokens - real_tokens) / padded_tokens if padded_tokens else 0.0,
+    }
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def make_pipeline_key(src_nllb: str, tgt_nllb: str, **settings) -> Tuple:
+    """Build a hashable cache key from a language pair and decoding settings"""
+    return (src_nllb, tgt_nllb, tuple(sorted(settings.items())))
+
+
+class PipelineCache:
+    def __init__(self, max_size: int = 32):
+        """
+        Bounded LRU cache of translation pipelines
+
+        Args:
+            max_size: Maximum number of pipelines kept alive at once
+        """
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached entry for key, building it with factory on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock so a slow construction doesn't block hits
+        value = factory()
+
+        with self._lock:
+            if key in self._entries:
+                # Another thread built it first; keep a single instance
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: Unicode NFC and collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationCache:
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 3600,
+                 db_path: Optional[str] = None, max_disk_entries: int = 100000):
+        """
+        Two-tier translation memo cache
+
+        Args:
+            max_entries: Maximum entries kept in the in-memory LRU tier
+            ttl_seconds: Lifetime of entries in both tiers, counted from when they were
+                first stored (None = no expiry)
+            db_path: Optional SQLite file for a persistent tier that survives restarts
+            max_disk_entries: Maximum rows in the persistent tier; the oldest are pruned
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_disk_entries = max(1, max_disk_entries)
+        # Pruning scans the table, so it runs once per this many writes rather than on each one
+        self._prune_interval = max(1, self.max_disk_entries // 100)
+        self._writes_since_prune = 0
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            # Access is serialized by self._lock, so sharing across threads is safe
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS translations_created_at ON translations (created_at)"
+            )
+            self._prune_disk(time.time())
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, src_nllb: str, tgt_nllb: str, model_id: str, **settings) -> str:
+        """Build a stable key from normalized text, language pair, model and decoding settings"""
+        payload = json.dumps(
+            [normalize_text(text), src_nllb, tgt_nllb, model_id, sorted(settings.items())],
+            ensure_ascii=False
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return len(key) + len(value.encode("utf-8"))
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a translation, checking memory first and then disk"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                self._remove_memory(key)
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at, now):
+                        # Promote to the memory tier, keeping the original age
+                        self._put_memory(key, value, created_at)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM translations WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.expirations += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """Store a translation in both tiers"""
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self._prune_interval:
+                    self._prune_disk(now)
+                self._db.commit()
+
+    def _prune_disk(self, now: float):
+        """Delete expired rows and the oldest rows beyond max_disk_entries (caller commits)"""
+        self._writes_since_prune = 0
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM translations WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._db.execute(
+            "DELETE FROM translations WHERE key IN ("
+            "SELECT key FROM translations ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    def _put_memory(self, key: str, value: str, created_at: float):
+        if key in self._memory:
+            self._remove_memory(key)
+        self._memory[key] = (value, created_at)
+        self._memory_bytes += self._entry_size(key, value)
+        while len(self._memory) > self.max_entries:
+            old_key, (old_value, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= self._entry_size(old_key, old_value)
+
+    def _remove_memory(self, key: str):
+        value, _ = self._memory.pop(key)
+        self._memory_bytes -= self._entry_size(key, value)
+
+    def clear(self, persistent: bool = False):
+        """Clear the memory tier, and optionally the persistent tier"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if persistent and self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+    def close(self):
+        """Close the persistent tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict:
+        """Get hit-rate and size statistics for both tiers"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            disk_entries = 0
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            disk_bytes = os.path.getsize(self.db_path) if self._db is not None else 0
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
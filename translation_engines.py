@@ -0,0 +1,713 @@
+import os
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+from transformers import AutoTokenizer, StoppingCriteria, StoppingCriteriaList
+
+from translation_cache import PipelineCache, make_pipeline_key
+from model_registry import get_registry
+from deadlines import Deadline, deadline_expired
+
+# Converted CTranslate2 models are written here once and reused on later starts
+CT2_MODELS_DIR = os.getenv("BABEL_CT2_DIR", "./ct2_models")
+
+_tokenizer_locks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_tokenizer_locks_guard = threading.Lock()
+
+
+def tokenizer_lock(tokenizer) -> threading.Lock:
+    """
+    Lock serializing src_lang + encode on one tokenizer
+
+    NLLB tokenizers carry the source language as state and are shared
+    process-wide, so every engine (and the continuous batcher) using the
+    same tokenizer must take the same lock while encoding.
+    """
+    with _tokenizer_locks_guard:
+        lock = _tokenizer_locks.get(tokenizer)
+        if lock is None:
+            lock = _tokenizer_locks[tokenizer] = threading.Lock()
+        return lock
+
+
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """Ends generate() at the next step once the request deadline has passed"""
+
+    def __init__(self, deadline: Deadline, finished_token_ids: List[int]):
+        self.deadline = deadline
+        # Last tokens of rows that already ended (EOS, then padding)
+        self.finished_token_ids = finished_token_ids
+
+    def __call__(self, input_ids, scores, **kwargs):
+        import torch
+
+        expired = self.deadline.expired()
+        if expired:
+            last_tokens = input_ids[:, -1]
+            finished = torch.zeros_like(last_tokens, dtype=torch.bool)
+            for token_id in self.finished_token_ids:
+                finished |= last_tokens == token_id
+            if not bool(finished.all()):
+                # A row was still decoding: its output is a cut-off hypothesis
+                self.deadline.cut_short = True
+        # Beam search then finalizes the best hypotheses built so far
+        return torch.full((input_ids.shape[0],), expired, dtype=torch.bool, device=input_ids.device)
+
+
+def _greedy_max_length(max_length: int, decoding: Optional[Dict]) -> int:
+    """Total decoder length for the greedy engines, which apply only max_new_tokens"""
+    max_new_tokens = (decoding or {}).get("max_new_tokens")
+    if max_new_tokens is not None:
+        # Decoder start and target language tokens come first
+        max_length = min(max_length, max_new_tokens + 2)
+    return max_length
+
+
+class TranslationEngine:
+    """
+    Interface every translation backend implements
+
+    An engine owns its tokenizer and weights and translates a batch of
+    texts for one NLLB language pair. UniversalTranslator handles language
+    codes, caching and segmentation on top of it.
+    """
+    name = "base"
+
+    def __init__(self, model_size: str, device: str, tokenizer_path: Optional[str] = None):
+        self.model_size = model_size
+        self.device = device
+        tokenizer_path = tokenizer_path or model_size
+        # Tokenizers are shared process-wide like the models themselves
+        self.tokenizer = get_registry().get(
+            ("tokenizer", tokenizer_path),
+            lambda: AutoTokenizer.from_pretrained(tokenizer_path)
+        )
+        self._tokenizer_lock = tokenizer_lock(self.tokenizer)
+        # Identifies the exact weights/precision for translation cache keys
+        self.model_id = f"{model_size}:{self.name}"
+
+    def translate_batch(self, texts: List[str], src_nllb: str, tgt_nllb: str,
+                        max_length: int = 256, num_beams: int = 3, batch_size: int = 16,
+                        deadline: Optional[Deadline] = None, decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """
+        Translate texts from src_nllb to tgt_nllb, returning one string per input
+
+        When deadline passes, decoding stops early and the outputs are the
+        partial hypotheses reached so far; engines set deadline.cut_short
+        only when some output was actually cut off. A text the engine
+        dropped before decoding any of it comes back as None.
+
+        decoding holds further generate() settings from a DecodingProfile
+        (max_new_tokens, length_penalty, early_stopping, no_repeat_ngram_size,
+        repetition_penalty); engines apply the ones they support.
+        """
+        raise NotImplementedError
+
+    def translate_multi_target(self, text: str, src_nllb: str, tgt_nllbs: List[str],
+                               max_length: int = 256, num_beams: int = 3, deadline: Optional[Deadline] = None,
+                               decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """
+        Translate one text into several target languages, one string per target
+
+        deadline and decoding behave as in translate_batch. Engines override
+        this to share the source encoding across targets; the default simply
+        translates once per target.
+        """
+        return [self.translate_batch([text], src_nllb, tgt_nllb, max_length, num_beams,
+                                     deadline=deadline, decoding=decoding)[0]
+                for tgt_nllb in tgt_nllbs]
+
+    def get_info(self) -> Dict:
+        """Describe the engine for performance reporting"""
+        return {"engine": self.name, "model": self.model_size, "device": self.device}
+
+
+class TransformersEngine(TranslationEngine):
+    name = "transformers"
+
+    def __init__(self, model_size: str, device: str, precision: str = "float32",
+                 pipeline_cache_size: int = 32, compile: bool = False):
+        """
+        PyTorch/transformers backend
+
+        Args:
+            model_size: Hugging Face checkpoint name
+            device: "cpu" or "cuda"
+            precision: CPU weight precision ("float32", "int8", "bf16"); CUDA always uses float16
+            pipeline_cache_size: Maximum number of cached translation pipelines
+            compile: Compile encoder and decoder with torch.compile (SDPA attention,
+                bucketed shapes, persistent compile cache) and warm the common
+                shapes at load time. Meant for long-running servers.
+        """
+        # Imported here so engines that don't need torch can run without it
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+        from quantization import load_cpu_model, resolve_precision
+
+        super().__init__(model_size, device)
+
+        self.precision = "float16" if device == "cuda" else resolve_precision(precision)
+        if compile and self.precision == "int8":
+            # Dynamically quantized Linear layers don't lower through inductor
+            print("⚠️  torch.compile skipped for int8 weights; use float32 or bf16 to compile")
+            compile = False
+        self.compiled = compile
+        # SDPA attention gives inductor fused attention kernels to work with
+        load_options = {"attn_implementation": "sdpa"} if compile else {}
+
+        # Faster loading with appropriate precision
+        if device == "cuda":
+            loader = lambda: AutoModelForSeq2SeqLM.from_pretrained(
+                model_size,
+                torch_dtype=torch.float16,
+                device_map="auto",
+                **load_options
+            )
+        else:
+            # int8/bf16 shrink the CPU footprint; quantized weights are cached on disk
+            loader = lambda: load_cpu_model(model_size, self.precision, **load_options)
+        if compile:
+            loader = self._compiled_loader(loader)
+        self.model = get_registry().get(
+            (self.name, model_size, device, self.precision) + (("compiled",) if compile else ()),
+            loader
+        )
+        self.model_id = f"{model_size}:{self.precision}"
+
+        # Pipelines are cheap to reuse but slow to build, so keep one per pair/settings
+        self.pipeline_cache = PipelineCache(max_size=pipeline_cache_size)
+
+    def _compiled_loader(self, loader):
+        """Wrap a model loader so the model is compiled and its common shapes warmed once"""
+        def load():
+            from compiled_model import compile_model, enable_compile_cache, warm_up_compiled
+
+            enable_compile_cache()
+            model = compile_model(loader(), self.tokenizer.pad_token_id)
+            warm_up_compiled(model, self.tokenizer)
+            return model
+        return load
+
+    def _get_pipeline(self, src_nllb: str, tgt_nllb: str, num_beams: int):
+        """
+        Get a cached translation pipeline for a language pair and beam count
+
+        The length cap is passed per call rather than baked in, so a call
+        with max_new_tokens never sees a competing max_length.
+        """
+        from transformers import pipeline
+
+        key = make_pipeline_key(src_nllb, tgt_nllb, num_beams=num_beams)
+        return self.pipeline_cache.get(key, lambda: pipeline(
+            'translation',
+            model=self.model,
+            tokenizer=self.tokenizer,
+            src_lang=src_nllb,
+            tgt_lang=tgt_nllb,
+            num_beams=num_beams,
+            device=0 if self.device == "cuda" else -1
+        ))
+
+    def translate_batch(self, texts: List[str], src_nllb: str, tgt_nllb: str,
+                        max_length: int = 256, num_beams: int = 3, batch_size: int = 16,
+                        deadline: Optional[Deadline] = None, decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        translator = self._get_pipeline(src_nllb, tgt_nllb, num_beams=num_beams)
+        outputs = translator(list(texts), batch_size=batch_size,
+                             **self._generate_kwargs(max_length, deadline, decoding))
+        return [output['translation_text'] for output in outputs]
+
+    def _generate_kwargs(self, max_length: int, deadline: Optional[Deadline], decoding: Optional[Dict]) -> Dict:
+        """generate() settings for one call: one length cap, and a stopping criterion for the deadline"""
+        generate_kwargs = dict(decoding or {})
+        if "max_new_tokens" not in generate_kwargs:
+            generate_kwargs["max_length"] = max_length
+            # Pipelines default max_new_tokens to 256, which would take precedence over max_length
+            generate_kwargs["max_new_tokens"] = None
+        if deadline is not None:
+            finished_token_ids = [token_id for token_id in (self.tokenizer.eos_token_id, self.tokenizer.pad_token_id)
+                                  if token_id is not None]
+            generate_kwargs["stopping_criteria"] = StoppingCriteriaList(
+                [DeadlineStoppingCriteria(deadline, finished_token_ids)]
+            )
+        return generate_kwargs
+
+    def translate_multi_target(self, text: str, src_nllb: str, tgt_nllbs: List[str],
+                               max_length: int = 256, num_beams: int = 3, deadline: Optional[Deadline] = None,
+                               decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """Encode the source once and decode every target as one batch over the shared encoder output"""
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_nllb
+            inputs = self.tokenizer(text, truncation=True, max_length=max_length, return_tensors="pt")
+        inputs = inputs.to(self.model.device)
+        count = len(tgt_nllbs)
+
+        with torch.inference_mode():
+            encoder_outputs = self.model.get_encoder()(**inputs)
+            # expand() is a view: the encoder states are shared, not copied, across targets
+            shared_states = BaseModelOutput(
+                last_hidden_state=encoder_outputs.last_hidden_state.expand(count, -1, -1)
+            )
+            # Each row starts with the decoder start token followed by its target language code
+            decoder_input_ids = torch.tensor(
+                [[self.model.config.decoder_start_token_id, self.tokenizer.convert_tokens_to_ids(tgt)]
+                 for tgt in tgt_nllbs],
+                device=self.model.device
+            )
+            generate_kwargs = self._generate_kwargs(max_length, deadline, decoding)
+            if generate_kwargs.get("max_new_tokens"):
+                # The language code is already part of decoder_input_ids here, whereas
+                # single-target calls generate it (forced BOS) within the same budget
+                generate_kwargs["max_new_tokens"] = max(1, generate_kwargs["max_new_tokens"] - 1)
+            generated = self.model.generate(
+                encoder_outputs=shared_states,
+                attention_mask=inputs["attention_mask"].expand(count, -1),
+                decoder_input_ids=decoder_input_ids,
+                num_beams=num_beams,
+                **generate_kwargs
+            )
+        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+    def get_info(self) -> Dict:
+        info = super().get_info()
+        info["precision"] = self.precision
+        info["compiled"] = self.compiled
+        info["pipeline_cache"] = self.pipeline_cache.stats()
+        return info
+
+
+class ContinuousBatchingEngine(TransformersEngine):
+    name = "continuous"
+
+    def __init__(self, model_size: str, device: str, precision: str = "float32",
+                 pipeline_cache_size: int = 32, compile: bool = False, max_running: int = 16):
+        """
+        PyTorch backend with an iteration-level decode loop
+
+        Concurrent translate_batch calls (e.g. translate_fast from several
+        server threads) join one running batch at the next decoding step
+        instead of waiting for each other. Decoding is greedy.
+
+        Args:
+            model_size: Hugging Face checkpoint name
+            device: "cpu" or "cuda"
+            precision: CPU weight precision ("float32", "int8", "bf16")
+            pipeline_cache_size: Maximum number of cached translation pipelines
+            compile: Compile encoder and decoder with torch.compile
+            max_running: Maximum sequences decoded together
+        """
+        from continuous_batching import ContinuousBatcher
+
+        super().__init__(model_size, device, precision=precision, pipeline_cache_size=pipeline_cache_size,
+                         compile=compile)
+        self.batcher = ContinuousBatcher(self.model, self.tokenizer, max_running=max_running,
+                                         tokenizer_lock=self._tokenizer_lock)
+        # Greedy output differs from beam search, so it gets its own cache entries
+        self.model_id = f"{model_size}:{self.precision}:greedy"
+
+    def translate_batch(self, texts: List[str], src_nllb: str, tgt_nllb: str,
+                        max_length: int = 256, num_beams: int = 3, batch_size: int = 16,
+                        deadline: Optional[Deadline] = None, decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """Greedy; of the decoding settings only max_new_tokens applies"""
+        return self.batcher.translate(texts, src_nllb, tgt_nllb, _greedy_max_length(max_length, decoding),
+                                      deadline=deadline)
+
+    def translate_multi_target(self, text: str, src_nllb: str, tgt_nllbs: List[str],
+                               max_length: int = 256, num_beams: int = 3, deadline: Optional[Deadline] = None,
+                               decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """Every target joins the running batch at once"""
+        max_length = _greedy_max_length(max_length, decoding)
+        futures = [self.batcher.submit(text, src_nllb, tgt_nllb, max_length, deadline) for tgt_nllb in tgt_nllbs]
+        return [future.result() for future in futures]
+
+    def get_info(self) -> Dict:
+        info = super().get_info()
+        info["decoding"] = "greedy"
+        info["continuous_batching"] = self.batcher.stats()
+        return info
+
+
+class CTranslate2Engine(TranslationEngine):
+    name = "ctranslate2"
+
+    COMPUTE_TYPES = ("int8", "int8_float32", "int8_float16", "int8_bfloat16",
+                     "float16", "bfloat16", "float32", "default", "auto")
+
+    def __init__(self, model_size: str, device: str, compute_type: str = "int8",
+                 inter_threads: int = 1, intra_threads: int = 0, max_batch_size: int = 32,
+                 cache_dir: str = CT2_MODELS_DIR):
+        """
+        CTranslate2 backend (same runtime faster_whisper uses)
+
+        Args:
+            model_size: Hugging Face checkpoint name, converted on first use
+            device: "cpu" or "cuda"
+            compute_type: e.g. "int8", "int8_float32", "float16"
+            inter_threads: Number of batches translated in parallel
+            intra_threads: Threads per batch (0 lets CTranslate2 decide)
+            max_batch_size: Maximum examples per internal batch
+            cache_dir: Directory holding converted models
+        """
+        try:
+            import ctranslate2
+        except ImportError:
+            raise ImportError("CTranslate2 engine requires: pip install ctranslate2")
+
+        if compute_type not in self.COMPUTE_TYPES:
+            raise ValueError(f"Unsupported compute type: {compute_type}. Use one of {self.COMPUTE_TYPES}")
+
+        super().__init__(model_size, device)
+        self.compute_type = compute_type
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+        self.max_batch_size = max_batch_size
+        self.model_id = f"{model_size}:{self.name}:{compute_type}"
+
+        model_dir = self.convert_model(model_size, compute_type, cache_dir)
+        self.translator = get_registry().get(
+            (self.name, model_dir, device, compute_type, inter_threads, intra_threads),
+            lambda: ctranslate2.Translator(
+                model_dir,
+                device=device,
+                compute_type=compute_type,
+                inter_threads=inter_threads,
+                intra_threads=intra_threads
+            )
+        )
+
+    @staticmethod
+    def convert_model(model_size: str, compute_type: str = "int8",
+                      cache_dir: str = CT2_MODELS_DIR) -> str:
+        """Convert a Hugging Face checkpoint to CTranslate2 format once and return its directory"""
+        import ctranslate2
+
+        # Store weights already quantized so loading doesn't convert them again
+        quantization = compute_type if compute_type not in ("default", "auto") else None
+        safe_name = model_size.replace("/", "--")
+        output_dir = os.path.join(cache_dir, f"{safe_name}-{quantization or 'float32'}")
+        if os.path.exists(os.path.join(output_dir, "model.bin")):
+            return output_dir
+
+        print(f"⚙️  Converting {model_size} to CTranslate2 ({quantization or 'float32'}), one-time cost...")
+        converter = ctranslate2.converters.TransformersConverter(model_size)
+        converter.convert(output_dir, quantization=quantization, force=True)
+        print(f"💾 CTranslate2 model saved: {output_dir}")
+        return output_dir
+
+    def translate_batch(self, texts: List[str], src_nllb: str, tgt_nllb: str,
+                        max_length: int = 256, num_beams: int = 3, batch_size: int = 16,
+                        deadline: Optional[Deadline] = None, decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """
+        CTranslate2 cannot interrupt a running beam search, so the deadline is
+        checked between chunks of batch_size texts; chunks that would start
+        after it passed come back empty.
+        """
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_nllb
+            source_tokens = [
+                self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text)) for text in texts
+            ]
+
+        if deadline is None:
+            return self._translate_tokens(source_tokens, [tgt_nllb] * len(source_tokens),
+                                          max_length, num_beams, batch_size, decoding)
+        translations = []
+        for start in range(0, len(source_tokens), batch_size):
+            chunk = source_tokens[start:start + batch_size]
+            if deadline.expired():
+                deadline.cut_short = True
+                translations.extend(None for _ in chunk)
+            else:
+                translations.extend(self._translate_tokens(chunk, [tgt_nllb] * len(chunk),
+                                                           max_length, num_beams, batch_size, decoding))
+        return translations
+
+    def translate_multi_target(self, text: str, src_nllb: str, tgt_nllbs: List[str],
+                               max_length: int = 256, num_beams: int = 3, deadline: Optional[Deadline] = None,
+                               decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """
+        Tokenize once and decode every target prefix in a single batched call
+
+        CTranslate2 has no way to reuse one encoder output across batch rows,
+        so the source is still encoded once per target; the saving over
+        separate calls is the shared tokenization and a single batch. As in
+        translate_batch, a deadline that passed before the call drops every
+        target (None).
+        """
+        if deadline_expired(deadline):
+            deadline.cut_short = True
+            return [None for _ in tgt_nllbs]
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_nllb
+            source_tokens = self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text))
+        return self._translate_tokens([source_tokens] * len(tgt_nllbs), tgt_nllbs,
+                                      max_length, num_beams, len(tgt_nllbs), decoding)
+
+    def _translate_tokens(self, source_tokens: List[List[str]], tgt_nllbs: List[str],
+                          max_length: int, num_beams: int, batch_size: int,
+                          decoding: Optional[Dict] = None) -> List[str]:
+        decoding = decoding or {}
+        max_new_tokens = decoding.get("max_new_tokens")
+        options = {
+            "length_penalty": decoding.get("length_penalty", 1.0),
+            "repetition_penalty": decoding.get("repetition_penalty", 1.0),
+            "no_repeat_ngram_size": decoding.get("no_repeat_ngram_size", 0),
+        }
+        results = self.translator.translate_batch(
+            source_tokens,
+            target_prefix=[[tgt_nllb] for tgt_nllb in tgt_nllbs],
+            beam_size=num_beams,
+            # Counts the target language prefix but, unlike max_length, not the decoder start token
+            max_decoding_length=min(max_length - 1, max_new_tokens) if max_new_tokens else max_length - 1,
+            max_batch_size=min(batch_size, self.max_batch_size),
+            **options
+        )
+
+        translations = []
+        for result in results:
+            # First token is the forced target language code
+            target_tokens = result.hypotheses[0][1:]
+            translations.append(self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(target_tokens), skip_special_tokens=True
+            ))
+        return translations
+
+    def get_info(self) -> Dict:
+        info = super().get_info()
+        info.update({
+            "compute_type": self.compute_type,
+            "inter_threads": self.inter_threads,
+            "intra_threads": self.intra_threads,
+        })
+        return info
+
+
+class OnnxRuntimeEngine(TranslationEngine):
+    name = "onnxruntime"
+
+    def __init__(self, model_size: str, device: str, model_dir: Optional[str] = None,
+                 quantized: bool = True, intra_threads: int = 0, export_if_missing: bool = True):
+        """
+        ONNX Runtime backend that runs without torch
+
+        Decoding is greedy: the past key/values stay inside ONNX Runtime as
+        OrtValues and are re-bound as the next step's inputs through IO
+        binding, so they are never copied back to numpy between steps.
+        Beam search would have to reorder that cache every step, so
+        num_beams is ignored here.
+
+        Args:
+            model_size: Hugging Face checkpoint name the graphs were exported from
+            device: "cpu" or "cuda"
+            model_dir: Directory produced by onnx_export.py (derived from model_size by default)
+            quantized: Use the int8-quantized export when model_dir is not given
+            intra_threads: Threads per session (0 lets ONNX Runtime decide)
+            export_if_missing: Export the graphs on first use (needs torch and optimum)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("ONNX Runtime engine requires: pip install onnxruntime")
+        from onnx_export import export_model, is_exported, onnx_model_dir
+
+        model_dir = model_dir or onnx_model_dir(model_size, quantized)
+        if not is_exported(model_dir):
+            if not export_if_missing:
+                raise FileNotFoundError(f"No ONNX export in {model_dir}. Run: python onnx_export.py --model {model_size}")
+            export_model(model_size, model_dir, quantize=quantized)
+
+        # The export directory carries its own tokenizer, so no hub download is needed
+        super().__init__(model_size, device, tokenizer_path=model_dir)
+        self.model_dir = model_dir
+        self.quantized = quantized
+        self.precision = "int8" if quantized else "float32"
+        self.model_id = f"{model_size}:{self.name}:{self.precision}"
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_threads:
+            options.intra_op_num_threads = intra_threads
+        providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if device == "cuda" else ["CPUExecutionProvider"]
+        self.io_device = "cuda" if device == "cuda" else "cpu"
+
+        def load_sessions():
+            return tuple(
+                ort.InferenceSession(os.path.join(model_dir, name), options, providers=providers)
+                for name in ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+            )
+
+        self.encoder, self.decoder, self.decoder_with_past = get_registry().get(
+            (self.name, model_dir, device, intra_threads), load_sessions
+        )
+        self._decoder_inputs = {i.name for i in self.decoder.get_inputs()}
+        self._with_past_inputs = {i.name for i in self.decoder_with_past.get_inputs()}
+        self._with_past_outputs = [o.name for o in self.decoder_with_past.get_outputs()]
+
+        self.decoder_start_token_id = self.tokenizer.eos_token_id
+        self.eos_token_id = self.tokenizer.eos_token_id
+        self.pad_token_id = self.tokenizer.pad_token_id
+
+    def translate_batch(self, texts: List[str], src_nllb: str, tgt_nllb: str,
+                        max_length: int = 256, num_beams: int = 3, batch_size: int = 16,
+                        deadline: Optional[Deadline] = None, decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """Greedy; of the decoding settings only max_new_tokens applies"""
+        max_length = _greedy_max_length(max_length, decoding)
+        translations = []
+        for start in range(0, len(texts), batch_size):
+            translations.extend(self._translate_chunk(texts[start:start + batch_size], src_nllb, tgt_nllb,
+                                                      max_length, deadline))
+        return translations
+
+    def translate_multi_target(self, text: str, src_nllb: str, tgt_nllbs: List[str],
+                               max_length: int = 256, num_beams: int = 3, deadline: Optional[Deadline] = None,
+                               decoding: Optional[Dict] = None) -> List[Optional[str]]:
+        """Run the encoder once and greedy-decode all targets as one batch"""
+        import numpy as np
+
+        if deadline_expired(deadline):
+            deadline.cut_short = True
+            return [None for _ in tgt_nllbs]
+        encoder_hidden_states, attention_mask = self._encode([text], src_nllb, max_length)
+        count = len(tgt_nllbs)
+        return self._greedy_decode(
+            np.repeat(encoder_hidden_states, count, axis=0),
+            np.repeat(attention_mask, count, axis=0),
+            [self.tokenizer.convert_tokens_to_ids(tgt) for tgt in tgt_nllbs],
+            _greedy_max_length(max_length, decoding),
+            deadline
+        )
+
+    def _translate_chunk(self, texts: List[str], src_nllb: str, tgt_nllb: str, max_length: int,
+                         deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+        """Greedy decode one padded batch"""
+        if deadline_expired(deadline):
+            deadline.cut_short = True
+            return [None for _ in texts]
+        encoder_hidden_states, attention_mask = self._encode(texts, src_nllb, max_length)
+        tgt_token_id = self.tokenizer.convert_tokens_to_ids(tgt_nllb)
+        return self._greedy_decode(encoder_hidden_states, attention_mask,
+                                   [tgt_token_id] * len(texts), max_length, deadline)
+
+    def _encode(self, texts: List[str], src_nllb: str, max_length: int):
+        """Tokenize and run the encoder graph; returns (hidden states, attention mask)"""
+        import numpy as np
+
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_nllb
+            encoded = self.tokenizer(list(texts), padding=True, truncation=True,
+                                     max_length=max_length, return_tensors="np")
+        input_ids = encoded["input_ids"].astype(np.int64)
+        attention_mask = encoded["attention_mask"].astype(np.int64)
+        encoder_hidden_states = self.encoder.run(
+            None, {"input_ids": input_ids, "attention_mask": attention_mask}
+        )[0]
+        return encoder_hidden_states, attention_mask
+
+    def _greedy_decode(self, encoder_hidden_states, attention_mask, tgt_token_ids: List[int],
+                       max_length: int, deadline: Optional[Deadline] = None) -> List[str]:
+        """Greedy decode with one forced target language token per row (stops early at deadline)"""
+        import numpy as np
+
+        batch = len(tgt_token_ids)
+        # First step sees the decoder start token and the forced target language token
+        decoder_input_ids = np.array(
+            [[self.decoder_start_token_id, tgt_token_id] for tgt_token_id in tgt_token_ids], dtype=np.int64
+        )
+        feeds = {
+            "input_ids": decoder_input_ids,
+            "encoder_attention_mask": attention_mask,
+            "encoder_hidden_states": encoder_hidden_states,
+        }
+        outputs = self.decoder.run(None, {k: v for k, v in feeds.items() if k in self._decoder_inputs})
+        output_names = [o.name for o in self.decoder.get_outputs()]
+        logits = outputs[0]
+        # present.* outputs become past_key_values.* inputs; encoder entries never change
+        past = {
+            name.replace("present", "past_key_values"): self._to_ortvalue(value)
+            for name, value in zip(output_names[1:], outputs[1:])
+        }
+
+        generated = [[] for _ in range(batch)]
+        finished = np.zeros(batch, dtype=bool)
+        # Encoder-side inputs are constant across steps, so convert them once
+        constant_inputs = {
+            "encoder_attention_mask": self._to_ortvalue(attention_mask),
+            "encoder_hidden_states": self._to_ortvalue(encoder_hidden_states),
+        }
+
+        for _ in range(max_length - 2):
+            next_tokens = logits[:, -1, :].argmax(axis=-1)
+            next_tokens = np.where(finished, self.pad_token_id, next_tokens)
+            for i, token in enumerate(next_tokens):
+                if not finished[i]:
+                    if token == self.eos_token_id:
+                        finished[i] = True
+                    else:
+                        generated[i].append(int(token))
+            if finished.all():
+                break
+            if deadline_expired(deadline):
+                deadline.cut_short = True
+                break
+
+            binding = self.decoder_with_past.io_binding()
+            binding.bind_ortvalue_input("input_ids", self._to_ortvalue(next_tokens.reshape(batch, 1).astype(np.int64)))
+            for name, value in constant_inputs.items():
+                if name in self._with_past_inputs:
+                    binding.bind_ortvalue_input(name, value)
+            for name, value in past.items():
+                if name in self._with_past_inputs:
+                    binding.bind_ortvalue_input(name, value)
+            for name in self._with_past_outputs:
+                binding.bind_output(name, self.io_device)
+            self.decoder_with_past.run_with_iobinding(binding)
+
+            step_outputs = binding.get_outputs()
+            logits = step_outputs[0].numpy()
+            # Only the decoder self-attention cache grows; keep everything as OrtValues
+            for name, value in zip(self._with_past_outputs[1:], step_outputs[1:]):
+                past[name.replace("present", "past_key_values")] = value
+
+        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+    def _to_ortvalue(self, array):
+        """Wrap a numpy array as an OrtValue on the session device"""
+        import onnxruntime as ort
+
+        return ort.OrtValue.ortvalue_from_numpy(array, self.io_device, 0)
+
+    def get_info(self) -> Dict:
+        info = super().get_info()
+        info.update({"model_dir": self.model_dir, "quantized": self.quantized, "decoding": "greedy"})
+        return info
+
+
+ENGINES = {
+    TransformersEngine.name: TransformersEngine,
+    ContinuousBatchingEngine.name: ContinuousBatchingEngine,
+    CTranslate2Engine.name: CTranslate2Engine,
+    OnnxRuntimeEngine.name: OnnxRuntimeEngine,
+}
+
+
+def create_engine(name: str, model_size: str, device: str, options: Optional[Dict] = None) -> TranslationEngine:
+    """
+    Build a translation engine by name with engine-specific options
+
+    ctranslate2 is an optional dependency: without it the CTranslate2 engine
+    falls back to the Transformers engine (with its default options) and
+    prints a warning instead of failing.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown translation engine: {name}. Available: {', '.join(ENGINES)}")
+    if name == CTranslate2Engine.name:
+        try:
+            import ctranslate2
+        except ImportError:
+            print(f"⚠️  ctranslate2 is not installed; using the {TransformersEngine.name} engine instead "
+                  "(pip install ctranslate2)")
+            return TransformersEngine(model_size, device)
+    return ENGINES[name](model_size, device, **(options or {}))
@@ -0,0 +1,151 @@
+"""
+Live latency, throughput and cache metrics for the translator and TTS
+
+Counters are cheap to update on the hot path; percentiles and rates are
+derived only when a snapshot is taken (CLI `perf` command, /metrics route).
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Tuple
+
+
+def _percentile(ordered, fraction: float) -> float:
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class RollingLatency:
+    def __init__(self, window: int = 1000):
+        """Latency samples for one stage; percentiles cover the last `window` samples"""
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_seconds = 0.0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total_seconds += seconds
+
+    def summary(self) -> Dict:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "count": self.count,
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": _percentile(ordered, 0.50) * 1000,
+            "p95_ms": _percentile(ordered, 0.95) * 1000,
+            "p99_ms": _percentile(ordered, 0.99) * 1000,
+        }
+
+
+class TranslationMetrics:
+    def __init__(self, window: int = 1000):
+        """
+        Low-overhead counters for the translate and TTS paths
+
+        Recording appends to bounded deques under a lock; percentiles are
+        only computed when a snapshot is requested.
+
+        Args:
+            window: Samples kept per stage for rolling percentiles and throughput
+        """
+        self.window = window
+        self.stages: Dict[str, RollingLatency] = {}
+        # (input tokens, output tokens, seconds) per model call
+        self.generations: Deque[Tuple[int, int, float]] = deque(maxlen=window)
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.timings: Dict[str, float] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        """Add one latency sample for a stage"""
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = RollingLatency(self.window)
+            stats.add(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Record the duration of a with-block as a stage sample"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start_time)
+
+    def record_generation(self, input_tokens: int, output_tokens: int, seconds: float):
+        """Token counts and duration of one model call"""
+        with self._lock:
+            self.generations.append((input_tokens, output_tokens, seconds))
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def record_request(self, success: bool):
+        with self._lock:
+            self.requests += 1
+            if not success:
+                self.errors += 1
+
+    def record_timeout(self):
+        """A request whose generation was cut off by its deadline"""
+        with self._lock:
+            self.timeouts += 1
+
+    def reset(self):
+        """Drop latency and token samples (e.g. after warm-up); one-off timings are kept"""
+        with self._lock:
+            self.stages.clear()
+            self.generations.clear()
+            self.input_tokens = self.output_tokens = 0
+            self.requests = self.errors = self.timeouts = 0
+
+    def set_timing(self, name: str, seconds: float):
+        """One-off durations such as model load and warm-up"""
+        self.timings[name] = seconds
+
+    def snapshot(self) -> Dict:
+        """Current metrics as a plain dict"""
+        with self._lock:
+            stages = {name: stats.summary() for name, stats in self.stages.items()}
+            recent_output = sum(output for _, output, _ in self.generations)
+            recent_seconds = sum(seconds for _, _, seconds in self.generations)
+            return {
+                "uptime_seconds": time.time() - self.started_at,
+                "requests": self.requests,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "stages": stages,
+                "tokens": {
+                    "input_total": self.input_tokens,
+                    "output_total": self.output_tokens,
+                    "output_per_second": recent_output / recent_seconds if recent_seconds > 0 else 0.0,
+                },
+                "timings": dict(self.timings),
+            }
+
+
+def to_prometheus(metrics: Dict, prefix: str = "babel") -> str:
+    """Flatten a metrics dict into Prometheus text format (numeric leaves only)"""
+    lines = []
+
+    def walk(value, name: str):
+        if isinstance(value, bool):
+            lines.append(f"{name} {int(value)}")
+        elif isinstance(value, (int, float)):
+            lines.append(f"{name} {value}")
+        elif isinstance(value, dict):
+            for key, child in value.items():
+                safe_key = "".join(char if char.isalnum() else "_" for char in str(key)).strip("_")
+                walk(child, f"{name}_{safe_key}" if safe_key else name)
+
+    walk(metrics, prefix)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from deadlines import Deadline, deadline_expired, timeout_result
+
+
+class _PendingRequest:
+    __slots__ = ("text", "source_lang", "target_lang", "max_length", "profile", "deadline", "future",
+                 "enqueued_at")
+
+    def __init__(self, text: str, source_lang: str, target_lang: str, max_length: int,
+                 profile: Optional[str], deadline: Optional[Deadline], future: asyncio.Future):
+        self.text = text
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.max_length = max_length
+        self.profile = profile
+        self.deadline = deadline
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class TranslationScheduler:
+    def __init__(self, translator, max_batch_size: int = 16, max_wait_ms: float = 5.0,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Dynamic micro-batching in front of a UniversalTranslator
+
+        Requests are collected for up to max_wait_ms (or until max_batch_size
+        arrive), grouped by language pair and decoding profile and translated
+        with one batched call per group. Each caller awaits only its own result. Requests whose
+        deadline passes while queued are answered with a timeout error instead
+        of being translated.
+
+        Args:
+            translator: UniversalTranslator instance
+            max_batch_size: Maximum requests collected into one batch
+            max_wait_ms: How long the first request waits for others to join
+            executor: Thread pool running the model (a single worker by default,
+                so batches never compete for the same model)
+        """
+        self.translator = translator
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.requests = 0
+        self.total_queue_wait = 0.0
+        self.expired = 0
+
+    def start(self):
+        """Start the batching loop on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Stop the batching loop; requests still queued are cancelled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.cancel()
+
+    async def translate_async(self, text: str, source_lang: str, target_lang: str,
+                              max_length: int = 256, deadline: Optional[Deadline] = None,
+                              profile: Optional[str] = None) -> Dict:
+        """Queue a translation and wait for its result (same dict as translate_fast)"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(text, source_lang, target_lang, max_length, profile, deadline,
+                                              future))
+        return await future
+
+    def _drop_expired(self, requests: List[_PendingRequest]) -> List[_PendingRequest]:
+        """Answer requests that are already past their deadline; return the rest"""
+        live = []
+        for request in requests:
+            if deadline_expired(request.deadline):
+                self.expired += 1
+                if not request.future.done():
+                    request.future.set_result(timeout_result())
+            else:
+                live.append(request)
+        return live
+
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        """Wait for one request, then gather more until the window closes or the batch is full"""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            started_at = time.perf_counter()
+            self.batches += 1
+            self.requests += len(batch)
+            self.total_queue_wait += sum(started_at - r.enqueued_at for r in batch)
+
+            groups: Dict[Tuple[str, str, int, Optional[str]], List[_PendingRequest]] = {}
+            for request in batch:
+                key = (request.source_lang.lower(), request.target_lang.lower(), request.max_length, request.profile)
+                groups.setdefault(key, []).append(request)
+
+            for (source_lang, target_lang, max_length, profile), requests in groups.items():
+                # Earlier groups may have used up the time of requests still waiting here
+                requests = self._drop_expired(requests)
+                if not requests:
+                    continue
+                # Generation stops at the latest deadline, so no request is cut before its own
+                deadline = Deadline.latest(r.deadline for r in requests)
+                try:
+                    results = await loop.run_in_executor(
+                        self.executor, lambda: self.translator.translate_many(
+                            [r.text for r in requests], source_lang, target_lang, max_length,
+                            deadline=deadline, profile=profile
+                        )
+                    )
+                except Exception as e:
+                    results = [{"success": False, "error": str(e)} for _ in requests]
+                for request, result in zip(requests, results):
+                    if not request.future.done():
+                        request.future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Batching counters for monitoring"""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "avg_queue_wait_ms": self.total_queue_wait / self.requests * 1000 if self.requests else 0.0,
+            "expired": self.expired,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
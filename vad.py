@@ -0,0 +1,338 @@
+"""
+Streaming voice activity detection and endpointing in front of Whisper
+
+Audio is scored frame by frame (Silero VAD through ONNX Runtime when it is
+available, otherwise RMS energy plus zero-crossing rate). StreamingVAD turns
+the scores into speech segments: a segment starts after min_speech_ms of
+voiced frames (plus pre_roll_ms of lead-in), and ends once hangover_ms of
+silence follows it. Segments longer than max_segment_seconds are cut at the
+quietest recent frame rather than mid-word. Only these segments need to go
+to the recognizer; silence never costs model time.
+"""
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+VAD_BACKENDS = ("auto", "silero", "energy")
+
+
+@dataclass
+class SpeechSegment:
+    start: float
+    end: float
+    audio: np.ndarray
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class EnergyVAD:
+    def __init__(self, threshold: float, max_zero_crossing_rate: float = 0.25,
+                 sample_rate: int = 16000, frame_ms: int = 30):
+        """
+        Dependency-free frame classifier: loud enough and not noise-like
+
+        Voiced speech has energy above the silence threshold and a low
+        zero-crossing rate; hiss and fan noise cross zero far more often. A
+        frame well above the threshold counts as speech whatever its ZCR, so
+        loud fricatives are not clipped.
+
+        Args:
+            threshold: RMS level below which a frame is silence (callers pass Config.SILENCE_THRESHOLD)
+            max_zero_crossing_rate: Crossings per sample above which a quiet frame is treated as noise
+            sample_rate: Rate of the scored audio
+            frame_ms: Frame length
+        """
+        self.threshold = threshold
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.name = "energy"
+
+    def reset(self):
+        pass
+
+    def __call__(self, frame: np.ndarray) -> float:
+        """Speech probability of one frame (0.0 or 1.0)"""
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        if rms < self.threshold:
+            return 0.0
+        zero_crossing_rate = np.count_nonzero(np.diff(np.signbit(frame))) / len(frame)
+        if zero_crossing_rate <= self.max_zero_crossing_rate or rms >= 3 * self.threshold:
+            return 1.0
+        return 0.0
+
+
+class SileroVAD:
+    def __init__(self, model_path: Optional[str] = None, sample_rate: int = 16000):
+        """
+        Silero VAD run through ONNX Runtime (512-sample frames at 16 kHz)
+
+        Handles both published ONNX layouts: v4 (h/c state inputs) and v5
+        (single state input, 64 samples of context prepended to each frame).
+
+        Args:
+            model_path: silero_vad.onnx (None = BABEL_SILERO_VAD, then the copy bundled with faster-whisper)
+            sample_rate: 16000 (8000 is supported by the model but not used here)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("Silero VAD requires: pip install onnxruntime")
+
+        model_path = model_path or os.getenv("BABEL_SILERO_VAD") or self._bundled_model()
+        if not model_path or not os.path.exists(model_path):
+            raise FileNotFoundError(f"Silero VAD model not found: {model_path}")
+
+        options = ort.SessionOptions()
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.v5 = "state" in self.input_names
+        self.sample_rate = sample_rate
+        self.frame_size = 512
+        self.name = "silero"
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self.reset()
+
+    @staticmethod
+    def _bundled_model() -> Optional[str]:
+        try:
+            from faster_whisper.utils import get_assets_path
+        except ImportError:
+            return None
+        for name in ("silero_vad_v5.onnx", "silero_vad.onnx"):
+            path = os.path.join(get_assets_path(), name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def reset(self):
+        """Clear the recurrent state (call between unrelated streams)"""
+        if self.v5:
+            self._state = np.zeros((2, 1, 128), dtype=np.float32)
+            self._context = np.zeros(64, dtype=np.float32)
+        else:
+            self._h = np.zeros((2, 1, 64), dtype=np.float32)
+            self._c = np.zeros((2, 1, 64), dtype=np.float32)
+
+    def __call__(self, frame: np.ndarray) -> float:
+        """Speech probability of one frame"""
+        if self.v5:
+            window = np.concatenate([self._context, frame])[np.newaxis, :]
+            output, self._state = self.session.run(None, {"input": window, "state": self._state, "sr": self._sr})
+            self._context = frame[-64:].copy()
+        else:
+            output, self._h, self._c = self.session.run(
+                None, {"input": frame[np.newaxis, :], "sr": self._sr, "h": self._h, "c": self._c}
+            )
+        return float(output.reshape(-1)[0])
+
+
+def create_vad(backend: str = "auto", sample_rate: int = 16000, *, energy_threshold: float):
+    """
+    Frame classifier for StreamingVAD
+
+    Args:
+        backend: "silero", "energy", or "auto" (Silero when onnxruntime and the model are available)
+        sample_rate: Rate of the scored audio
+        energy_threshold: RMS silence level of the energy fallback
+    """
+    if backend not in VAD_BACKENDS:
+        raise ValueError(f"Unknown VAD backend: {backend}. Available: {', '.join(VAD_BACKENDS)}")
+    if backend in ("auto", "silero"):
+        try:
+            return SileroVAD(sample_rate=sample_rate)
+        except (ImportError, FileNotFoundError) as e:
+            if backend == "silero":
+                raise
+            print(f"⚠️  Silero VAD unavailable ({e}); using energy/ZCR detection")
+    return EnergyVAD(energy_threshold, sample_rate=sample_rate)
+
+
+class StreamingVAD:
+    def __init__(self, detector, sample_rate: int = 16000, threshold: float = 0.5,
+                 min_speech_ms: int = 250, hangover_ms: int = 400, pre_roll_ms: int = 200,
+                 max_segment_seconds: float = 15.0):
+        """
+        Speech start/end detection over a live stream
+
+        Args:
+            detector: Frame classifier (EnergyVAD or SileroVAD, see create_vad)
+            sample_rate: Rate of the fed audio
+            threshold: Speech probability at which a frame counts as voiced
+            min_speech_ms: Voiced audio needed to open a segment (shorter clicks are ignored)
+            hangover_ms: Silence that must follow speech before the segment is closed
+            pre_roll_ms: Audio kept before the detected start so onsets are not clipped
+            max_segment_seconds: Longest segment; longer speech is cut at the quietest recent frame
+        """
+        self.detector = detector
+        self.sample_rate = sample_rate
+        self.frame_size = self.detector.frame_size
+        self.threshold = threshold
+        # Hysteresis: once speaking, a frame must fall clearly below threshold to count as silence
+        self.end_threshold = max(threshold - 0.15, 0.01)
+        frame_seconds = self.frame_size / sample_rate
+        self.min_speech_frames = max(1, int(min_speech_ms / 1000 / frame_seconds))
+        self.hangover_frames = max(1, int(hangover_ms / 1000 / frame_seconds))
+        self.pre_roll_frames = int(pre_roll_ms / 1000 / frame_seconds)
+        self.max_segment_frames = int(max_segment_seconds / frame_seconds)
+
+        # Segment audio is collected in one preallocated array
+        self._segment = np.zeros((self.max_segment_frames + self.pre_roll_frames + 1) * self.frame_size,
+                                 dtype=np.float32)
+        self._remainder = np.zeros(self.frame_size, dtype=np.float32)
+        self._remainder_length = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new stream"""
+        self.detector.reset()
+        self._remainder_length = 0
+        self._frames_seen = 0
+        # Recent (frame index, samples, probability) before a segment opens: pre-roll and onset candidates
+        self._recent = deque(maxlen=self.pre_roll_frames + self.min_speech_frames)
+        self._voiced_run = 0
+        self._in_speech = False
+        self._segment_frames = 0
+        self._segment_start_frame = 0
+        self._silence_run = 0
+        self._last_voiced_frame = 0
+        # (probability, frame offset in segment) of the quietest frame so far, for forced cuts
+        self._quietest = (1.0, 0)
+        self.speech_samples = 0
+        self.segments = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self._frames_seen * self.frame_size / self.sample_rate
+
+    def feed(self, samples: np.ndarray) -> List[SpeechSegment]:
+        """Score new audio; returns the segments it completed"""
+        completed = []
+        offset = 0
+        if self._remainder_length:
+            needed = self.frame_size - self._remainder_length
+            take = min(needed, len(samples))
+            self._remainder[self._remainder_length:self._remainder_length + take] = samples[:take]
+            self._remainder_length += take
+            offset = take
+            if self._remainder_length < self.frame_size:
+                return completed
+            self._process_frame(self._remainder, completed)
+            self._remainder_length = 0
+
+        while offset + self.frame_size <= len(samples):
+            self._process_frame(samples[offset:offset + self.frame_size], completed)
+            offset += self.frame_size
+
+        left = len(samples) - offset
+        if left:
+            self._remainder[:left] = samples[offset:]
+            self._remainder_length = left
+        return completed
+
+    def flush(self) -> List[SpeechSegment]:
+        """End of stream: close an open segment"""
+        completed = []
+        if self._in_speech:
+            completed.append(self._close(self._segment_frames))
+        self._remainder_length = 0
+        return completed
+
+    def _process_frame(self, frame: np.ndarray, completed: List[SpeechSegment]):
+        probability = self.detector(frame)
+        index = self._frames_seen
+        self._frames_seen += 1
+
+        if not self._in_speech:
+            self._recent.append((index, frame.copy(), probability))
+            self._voiced_run = self._voiced_run + 1 if probability >= self.threshold else 0
+            if self._voiced_run >= self.min_speech_frames:
+                self._open(index)
+            return
+
+        self._append(frame)
+        if probability >= self.end_threshold:
+            self._silence_run = 0
+            self._last_voiced_frame = self._segment_frames
+        else:
+            self._silence_run += 1
+        # Remember the quietest point of the second half as the place for a forced cut
+        if self._segment_frames > self.max_segment_frames // 2 and probability <= self._quietest[0]:
+            self._quietest = (probability, self._segment_frames)
+
+        if self._silence_run >= self.hangover_frames:
+            # Keep a little trailing silence so the last word is not clipped
+            completed.append(self._close(min(self._last_voiced_frame + self.pre_roll_frames,
+                                             self._segment_frames)))
+        elif self._segment_frames >= self.max_segment_frames:
+            cut = self._quietest[1] or self._segment_frames
+            completed.append(self._close(cut, keep_open=True))
+
+    def _open(self, index: int):
+        """Start a segment at the voiced run, with pre-roll taken from the recent frames"""
+        first_voiced = index - self.min_speech_frames + 1
+        start = max(first_voiced - self.pre_roll_frames, self._recent[0][0])
+        self._in_speech = True
+        self._segment_frames = 0
+        self._segment_start_frame = start
+        self._silence_run = 0
+        self._quietest = (1.0, 0)
+        for frame_index, samples, _ in self._recent:
+            if frame_index >= start:
+                self._append(samples)
+        self._last_voiced_frame = self._segment_frames
+        self._recent.clear()
+        self._voiced_run = 0
+
+    def _append(self, frame: np.ndarray):
+        position = self._segment_frames * self.frame_size
+        self._segment[position:position + self.frame_size] = frame
+        self._segment_frames += 1
+
+    def _close(self, frames: int, keep_open: bool = False) -> SpeechSegment:
+        """Emit the first frames of the open segment; keep_open carries the rest into a new segment"""
+        samples = frames * self.frame_size
+        start = self._segment_start_frame * self.frame_size / self.sample_rate
+        segment = SpeechSegment(start, start + samples / self.sample_rate, self._segment[:samples].copy())
+        self.speech_samples += samples
+        self.segments += 1
+
+        rest = self._segment_frames - frames
+        if keep_open:
+            # Forced cut: the speech continues, so the tail opens the next segment
+            self._segment[:rest * self.frame_size] = self._segment[samples:self._segment_frames * self.frame_size]
+            self._segment_frames = rest
+            self._segment_start_frame += frames
+            self._last_voiced_frame = max(self._last_voiced_frame - frames, 0)
+            self._quietest = (1.0, 0)
+        else:
+            self._in_speech = False
+            self._segment_frames = 0
+            self._silence_run = 0
+        return segment
+
+    def stats(self) -> Dict:
+        """How much of the stream was speech, i.e. how much model time the VAD saved"""
+        total = self.total_seconds
+        speech = self.speech_samples / self.sample_rate
+        return {
+            "backend": self.detector.name,
+            "segments": self.segments,
+            "total_seconds": total,
+            "speech_seconds": speech,
+            "silence_ratio": 1 - speech / total if total else 0.0,
+        }
+
+
+def split_speech(audio: np.ndarray, vad: StreamingVAD) -> List[SpeechSegment]:
+    """Voiced segments of a complete recording (resets the VAD first)"""
+    vad.reset()
+    segments = vad.feed(audio)
+    segments.extend(vad.flush())
+    return segments
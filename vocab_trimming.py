@@ -0,0 +1,290 @@
+"""
+Trim the NLLB vocabulary and embeddings down to the languages we serve
+
+NLLB shares a ~256k-token vocabulary across 200 languages. Its embedding
+and output-projection matrices dominate memory and per-step softmax cost.
+This tool scans a local corpus with the original tokenizer, keeps the
+tokens that corpus uses (plus special tokens, the configured language
+codes and every single-character piece seen in the corpus), and saves a
+slimmed checkpoint. UniversalTranslator loads it like any other model
+directory:
+
+    UniversalTranslator(model_size="./trimmed_models/nllb-200-distilled-600M-trimmed")
+
+Usage:
+    python vocab_trimming.py --corpus corpus/*.txt benchmarks/data/translation_test_set.jsonl
+    python vocab_trimming.py --corpus corpus.txt --languages eng_Latn spa_Latn hin_Deva
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+TRIMMED_MODELS_DIR = os.getenv("BABEL_TRIMMED_DIR", "./trimmed_models")
+
+# Text fields read from JSONL corpus files (e.g. the benchmark test set)
+JSONL_TEXT_FIELDS = ("text", "reference", "translation", "source", "target")
+
+
+def default_languages() -> List[str]:
+    """NLLB codes UniversalTranslator serves"""
+    from Final_Optimized_Model import UniversalTranslator
+
+    # The language map doesn't depend on instance state
+    return sorted(set(UniversalTranslator._create_language_map(None).values()))
+
+
+def read_corpus(paths: Iterable[str]) -> Iterable[str]:
+    """Yield text lines from .txt files and text fields from .jsonl files"""
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if path.endswith(".jsonl"):
+                        row = json.loads(line)
+                        for field in JSONL_TEXT_FIELDS:
+                            if isinstance(row.get(field), str):
+                                yield row[field]
+                    else:
+                        yield line
+
+
+def collect_token_ids(tokenizer, texts: Iterable[str], languages: List[str]) -> Set[int]:
+    """Token ids needed for the corpus, the special tokens and the configured language codes"""
+    # Language codes are additional special tokens; only the configured ones stay
+    language_codes = set(getattr(tokenizer, "additional_special_tokens", None) or []) - set(languages)
+    keep = {token_id for token, token_id in zip(tokenizer.all_special_tokens, tokenizer.all_special_ids)
+            if token not in language_codes}
+    keep.update(tokenizer.convert_tokens_to_ids(languages))
+    vocab = tokenizer.get_vocab()
+    characters = set()
+
+    for text in texts:
+        keep.update(tokenizer(text, add_special_tokens=False)["input_ids"])
+        characters.update(text)
+
+    # Single-character pieces let unseen words still be spelled out instead of becoming <unk>
+    for char in characters:
+        for piece in (char, "▁" + char):
+            if piece in vocab:
+                keep.add(vocab[piece])
+
+    keep.discard(tokenizer.unk_token_id)
+    keep.add(tokenizer.unk_token_id)
+    return keep
+
+
+def trim_tokenizer(tokenizer, kept_ids: List[int], languages: List[str], output_dir: str):
+    """
+    Save a fast tokenizer whose token ids match the trimmed model
+
+    Only Unigram (SentencePiece) vocabularies such as NLLB's can be trimmed:
+    dropping pieces leaves the remaining ones usable, whereas BPE merges and
+    WordPiece prefixes would point at removed tokens. The result is
+    fast-only; the slow SentencePiece model still has the full vocabulary
+    and is not written.
+    """
+    spec = json.loads(tokenizer.backend_tokenizer.to_str()) if getattr(tokenizer, "is_fast", False) else None
+    model_type = spec["model"].get("type") if spec else "slow (SentencePiece only)"
+    if model_type != "Unigram":
+        raise ValueError(f"Vocabulary trimming needs a fast Unigram tokenizer (like NLLB's); got {model_type}")
+
+    # legacy_format=False skips sentencepiece.bpe.model and added_tokens.json, which keep the old ids
+    tokenizer.save_pretrained(output_dir, legacy_format=False)
+    new_id = {old: new for new, old in enumerate(kept_ids)}
+    unk_id = new_id[tokenizer.unk_token_id]
+
+    vocab = spec["model"]["vocab"]
+    spec["model"]["vocab"] = [vocab[old] for old in kept_ids if old < len(vocab)]
+    if spec["model"].get("unk_id") is not None:
+        spec["model"]["unk_id"] = new_id[spec["model"]["unk_id"]]
+    # Language codes are added tokens past the piece vocabulary; they move down with it
+    spec["added_tokens"] = [
+        dict(token, id=new_id[token["id"]]) for token in spec.get("added_tokens", [])
+        if token["id"] in new_id
+    ]
+
+    post_processor = spec.get("post_processor") or {}
+    for token in (post_processor.get("special_tokens") or {}).values():
+        token["ids"] = [new_id.get(i, unk_id) for i in token["ids"]]
+
+    with open(os.path.join(output_dir, "tokenizer.json"), 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False)
+
+    # Only the configured language codes remain special tokens
+    for name in ("tokenizer_config.json", "special_tokens_map.json"):
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        for key in ("additional_special_tokens", "extra_special_tokens"):
+            if isinstance(config.get(key), list):
+                config[key] = [
+                    token for token in config[key]
+                    if (token if isinstance(token, str) else token.get("content")) in languages
+                ]
+        if "added_tokens_decoder" in config:
+            config["added_tokens_decoder"] = {
+                str(new_id[int(old)]): token for old, token in config["added_tokens_decoder"].items()
+                if int(old) in new_id
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+
+
+def trim_model(model, kept_ids: List[int]):
+    """Slice every vocabulary-sized embedding, projection and bias down to kept_ids (in place)"""
+    import torch
+
+    old_size = model.get_input_embeddings().weight.shape[0]
+    index = torch.tensor(kept_ids, dtype=torch.long)
+    new_id = {old: new for new, old in enumerate(kept_ids)}
+    # Tied matrices share one tensor; slice it once so they stay tied
+    sliced: Dict[int, torch.nn.Parameter] = {}
+
+    def slice_param(param):
+        key = id(param)
+        if key not in sliced:
+            sliced[key] = torch.nn.Parameter(param.data.index_select(0, index).clone(),
+                                             requires_grad=False)
+        return sliced[key]
+
+    for module in model.modules():
+        if isinstance(module, torch.nn.Embedding) and module.num_embeddings == old_size:
+            module.weight = slice_param(module.weight)
+            module.num_embeddings = len(kept_ids)
+            if module.padding_idx is not None:
+                module.padding_idx = new_id.get(module.padding_idx)
+        elif isinstance(module, torch.nn.Linear) and module.out_features == old_size:
+            module.weight = slice_param(module.weight)
+            if module.bias is not None:
+                module.bias = slice_param(module.bias)
+            module.out_features = len(kept_ids)
+
+    if hasattr(model, "final_logits_bias"):
+        model.final_logits_bias = model.final_logits_bias[:, index].clone()
+
+    model.config.vocab_size = len(kept_ids)
+    for config in (model.config, model.generation_config):
+        for attr in ("pad_token_id", "bos_token_id", "eos_token_id", "decoder_start_token_id",
+                     "forced_bos_token_id", "forced_eos_token_id"):
+            value = getattr(config, attr, None)
+            if isinstance(value, int):
+                setattr(config, attr, new_id.get(value))
+    return model
+
+
+def parameter_bytes(model) -> int:
+    """Bytes held by unique parameters and buffers"""
+    seen = set()
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        if id(tensor) not in seen:
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def time_decoding(model, tokenizer, texts: List[str], src_lang: str, tgt_lang: str) -> float:
+    """Seconds to greedily translate texts one at a time"""
+    import torch
+
+    tokenizer.src_lang = src_lang
+    bos_id = tokenizer.convert_tokens_to_ids(tgt_lang)
+    start_time = time.perf_counter()
+    with torch.inference_mode():
+        for text in texts:
+            inputs = tokenizer(text, return_tensors="pt")
+            model.generate(**inputs, forced_bos_token_id=bos_id, num_beams=1, max_length=128)
+    return time.perf_counter() - start_time
+
+
+def trim_checkpoint(model_size: str, corpus: List[str], languages: Optional[List[str]] = None,
+                    output_dir: Optional[str] = None, benchmark: bool = True) -> Dict:
+    """
+    Build and save a trimmed checkpoint
+
+    Args:
+        model_size: Source checkpoint name or path
+        corpus: Corpus file paths or glob patterns (.txt lines or .jsonl)
+        languages: NLLB language codes to keep (defaults to UniversalTranslator's languages)
+        output_dir: Destination (derived from the model name by default)
+        benchmark: Time greedy decoding before and after trimming
+
+    Returns:
+        Report with vocabulary sizes, memory saving and decode speedup
+    """
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    languages = languages or default_languages()
+    output_dir = output_dir or os.path.join(TRIMMED_MODELS_DIR, model_size.replace("/", "--") + "-trimmed")
+
+    print(f"📚 Scanning corpus for {len(languages)} languages...")
+    tokenizer = AutoTokenizer.from_pretrained(model_size)
+    texts = list(read_corpus(corpus))
+    kept_ids = sorted(collect_token_ids(tokenizer, texts, languages))
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_size).eval()
+    old_vocab = model.get_input_embeddings().weight.shape[0]
+    old_bytes = parameter_bytes(model)
+    sample = texts[:20]
+    before_s = time_decoding(model, tokenizer, sample, languages[0], languages[-1]) if benchmark else None
+
+    print(f"✂️  Keeping {len(kept_ids)} of {old_vocab} tokens...")
+    trim_model(model, kept_ids)
+    os.makedirs(output_dir, exist_ok=True)
+    model.save_pretrained(output_dir)
+    trim_tokenizer(tokenizer, kept_ids, languages, output_dir)
+
+    report = {
+        "output_dir": output_dir,
+        "languages": languages,
+        "corpus_lines": len(texts),
+        "old_vocab_size": old_vocab,
+        "new_vocab_size": len(kept_ids),
+        "old_mb": old_bytes / (1024 * 1024),
+        "new_mb": parameter_bytes(model) / (1024 * 1024),
+    }
+    report["memory_saved_mb"] = report["old_mb"] - report["new_mb"]
+
+    if benchmark and sample:
+        trimmed_tokenizer = AutoTokenizer.from_pretrained(output_dir)
+        after_s = time_decoding(model, trimmed_tokenizer, sample, languages[0], languages[-1])
+        report["decode_before_s"] = before_s
+        report["decode_after_s"] = after_s
+        report["decode_speedup"] = before_s / after_s if after_s else None
+
+    with open(os.path.join(output_dir, "trim_report.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim NLLB vocabulary to a language set")
+    parser.add_argument("--model", default="facebook/nllb-200-distilled-600M")
+    parser.add_argument("--corpus", nargs="+", required=True, help="Corpus files or glob patterns")
+    parser.add_argument("--languages", nargs="+", help="NLLB codes to keep (default: all served languages)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--no-benchmark", action="store_true", help="Skip decode timing")
+    args = parser.parse_args()
+
+    report = trim_checkpoint(args.model, args.corpus, args.languages, args.output,
+                             benchmark=not args.no_benchmark)
+
+    print(f"\n✅ Trimmed checkpoint saved: {report['output_dir']}")
+    print(f"   Vocabulary: {report['old_vocab_size']} → {report['new_vocab_size']} tokens")
+    print(f"   Weights: {report['old_mb']:.0f} MB → {report['new_mb']:.0f} MB "
+          f"(saved {report['memory_saved_mb']:.0f} MB)")
+    if report.get("decode_speedup"):
+        print(f"   Decode: {report['decode_before_s']:.2f}s → {report['decode_after_s']:.2f}s "
+              f"({report['decode_speedup']:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()